@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2021 eightballer
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Make the agent packages importable outside of an agent."""
+
+import os
+import sys
+import types
+
+AGENT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "src", "storj_agent"
+)
+
+
+def register_packages() -> None:
+    """
+    Register the `packages` namespace the agent loader would.
+
+    The agent packages import each other as `packages.<author>.<type>.<name>`,
+    the namespace the agent sets up when it loads them. Benchmarks import the
+    packages directly, so the namespace is mapped to the agent directory, and
+    to its vendor directory for the fetchai packages.
+    """
+    if "packages" in sys.modules:
+        return
+    for name, path in (
+        ("packages", None),
+        ("packages.eightballer", AGENT_DIR),
+        ("packages.fetchai", os.path.join(AGENT_DIR, "vendor", "fetchai")),
+    ):
+        module = types.ModuleType(name)
+        module.__path__ = [] if path is None else [os.path.normpath(path)]  # type: ignore
+        sys.modules[name] = module
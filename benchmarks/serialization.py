@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2021 eightballer
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Encode/decode benchmark of the serializers of the bundled protocols.
+
+Covers `file_storage` and the vendored `default`, `signing` and
+`state_update` protocols, for payloads from 1 KB up to 1 GB. For every
+protocol, size and operation it reports:
+
+- the throughput, from the median of repeated runs,
+- the peak memory allocated during one run, also as a multiple of the
+  payload, i.e. the number of copies of the payload alive at once,
+- the number of memory blocks still allocated by the result.
+
+Results can be saved as JSON and compared with a previous run, the script
+exiting with an error if any case got slower or hungrier than the
+tolerance allows:
+
+    python benchmarks/serialization.py --sizes 1K 1M 16M --save baseline.json
+    python benchmarks/serialization.py --sizes 1K 1M 16M --compare baseline.json
+
+The payload of `state_update` is a dict of currency amounts, one entry per
+32 bytes of the requested size, which gets slow beyond a few MB.
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from aea.helpers.transaction.base import SignedMessage  # noqa: E402
+from aea.protocols.base import Message  # noqa: E402
+
+from packages.eightballer.protocols.file_storage.message import (  # noqa: E402
+    FileStorageMessage,
+)
+from packages.eightballer.protocols.file_storage.serialization import (  # noqa: E402
+    FileStorageSerializer,
+)
+from packages.fetchai.protocols.default.message import DefaultMessage  # noqa: E402
+from packages.fetchai.protocols.default.serialization import (  # noqa: E402
+    DefaultSerializer,
+)
+from packages.fetchai.protocols.signing.message import SigningMessage  # noqa: E402
+from packages.fetchai.protocols.signing.serialization import (  # noqa: E402
+    SigningSerializer,
+)
+from packages.fetchai.protocols.state_update.message import (  # noqa: E402
+    StateUpdateMessage,
+)
+from packages.fetchai.protocols.state_update.serialization import (  # noqa: E402
+    StateUpdateSerializer,
+)
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+DEFAULT_SIZES = ["1K", "64K", "1M", "16M"]
+MIN_DURATION = 0.2
+MIN_REPEAT = 3
+
+
+def parse_size(size: str) -> int:
+    """Parse a size such as `64K`, `16M` or `1G` into bytes."""
+    unit = size[-1].upper()
+    if unit in UNITS:
+        return int(float(size[:-1]) * UNITS[unit])
+    return int(size)
+
+
+def file_storage_message(size: int) -> Message:
+    """Get a FILE_UPLOAD message with a payload of `size` bytes."""
+    return FileStorageMessage(
+        performative=FileStorageMessage.Performative.FILE_UPLOAD,
+        content=b"\xab" * size,
+        key="0" * 32,
+        filename="benchmark.bin",
+        fingerprint="0" * 32,
+    )
+
+
+def default_message(size: int) -> Message:
+    """Get a BYTES message with a payload of `size` bytes."""
+    return DefaultMessage(
+        performative=DefaultMessage.Performative.BYTES, content=b"\xab" * size
+    )
+
+
+def signing_message(size: int) -> Message:
+    """
+    Get a SIGNED_MESSAGE message with a signature of `size` characters.
+
+    The performatives carrying terms are left out, building terms needs the
+    ledger plugins installed.
+    """
+    return SigningMessage(
+        performative=SigningMessage.Performative.SIGNED_MESSAGE,
+        signed_message=SignedMessage("fetchai", "a" * size),
+    )
+
+
+def state_update_message(size: int) -> Message:
+    """Get an APPLY message with one amount per 32 bytes of `size`."""
+    entries = max(size // 32, 1)
+    return StateUpdateMessage(
+        performative=StateUpdateMessage.Performative.APPLY,
+        amount_by_currency_id={f"{i:016d}": i for i in range(entries)},
+        quantities_by_good_id={},
+    )
+
+
+PROTOCOLS = {
+    "file_storage": (file_storage_message, FileStorageSerializer),
+    "default": (default_message, DefaultSerializer),
+    "signing": (signing_message, SigningSerializer),
+    "state_update": (state_update_message, StateUpdateSerializer),
+}  # type: Dict[str, Tuple[Callable[[int], Message], type]]
+
+
+def time_call(func: Callable[[], Any]) -> float:
+    """Get the median duration of `func`, repeated for at least MIN_DURATION."""
+    func()
+    durations = []  # type: List[float]
+    while len(durations) < MIN_REPEAT or sum(durations) < MIN_DURATION:
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+def memory_call(func: Callable[[], Any]) -> Tuple[int, int]:
+    """Get the peak memory allocated by `func` and the blocks its result holds."""
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+    del result
+    return peak, blocks
+
+
+def run_case(protocol: str, size: int) -> List[Dict[str, Any]]:
+    """Benchmark the encoding and decoding of one protocol at one size."""
+    make_message, serializer = PROTOCOLS[protocol]
+    message = make_message(size)
+    encoded = serializer.encode(message)
+    results = []
+    for operation, func in (
+        ("encode", lambda: serializer.encode(message)),
+        ("decode", lambda: serializer.decode(encoded)),
+    ):
+        seconds = time_call(func)
+        peak, blocks = memory_call(func)
+        results.append(
+            {
+                "protocol": protocol,
+                "size": size,
+                "operation": operation,
+                "seconds": seconds,
+                "mb_per_s": size / (1024 ** 2) / seconds,
+                "peak_bytes": peak,
+                "copies": peak / size,
+                "blocks": blocks,
+            }
+        )
+    return results
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Get the regressions of `results` against `baseline`."""
+    previous = {(r["protocol"], r["size"], r["operation"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        case = (result["protocol"], result["size"], result["operation"])
+        before = previous.get(case)
+        if before is None:
+            continue
+        name = "{} {} {}".format(*case)
+        if result["mb_per_s"] < before["mb_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {before['mb_per_s']:.1f} -> {result['mb_per_s']:.1f} MB/s"
+            )
+        if result["peak_bytes"] > before["peak_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {before['peak_bytes']} -> {result['peak_bytes']} peak bytes"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the serializers of the bundled protocols."
+    )
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--protocols", nargs="+", choices=sorted(PROTOCOLS), default=list(PROTOCOLS)
+    )
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'protocol':<13} {'size':>6} {'op':<7} {'MB/s':>9} "
+        f"{'peak MB':>9} {'copies':>7} {'blocks':>7}"
+    )
+    results = []
+    for protocol in args.protocols:
+        for size_name in args.sizes:
+            for result in run_case(protocol, parse_size(size_name)):
+                results.append(result)
+                print(
+                    f"{protocol:<13} {size_name:>6} {result['operation']:<7} "
+                    f"{result['mb_per_s']:>9.1f} "
+                    f"{result['peak_bytes'] / 1024 ** 2:>9.2f} "
+                    f"{result['copies']:>7.2f} {result['blocks']:>7}"
+                )
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, "r") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2021 eightballer
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Compare the generic and the low copy paths of FileStorageSerializer.
+
+For FILE_UPLOAD messages of growing size, prints the time per MB to encode
+and decode, and the peak memory allocated while doing so as a multiple of
+the payload, which counts the copies of the payload alive at the same time.
+
+    python benchmarks/serializer_fast_path.py [--sizes 1 16 64] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.protocols.file_storage import wire  # noqa: E402
+from packages.eightballer.protocols.file_storage.message import (  # noqa: E402
+    FileStorageMessage,
+)
+from packages.eightballer.protocols.file_storage.serialization import (  # noqa: E402
+    FileStorageSerializer,
+)
+
+MB = 1024 * 1024
+
+
+def measure(func: Callable[[], object], repeat: int) -> Tuple[float, int]:
+    """Get the best time of `repeat` calls and the peak memory of one call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'MB':>4} {'path':>8} {'op':>7} {'ms/MB':>8} {'copies':>7}")
+    for size in args.sizes:
+        msg = FileStorageMessage(
+            performative=FileStorageMessage.Performative.FILE_UPLOAD,
+            content=os.urandom(size * MB),
+            key="0" * 32,
+            filename="benchmark.bin",
+            fingerprint="0" * 32,
+        )
+        for path, enabled in (("generic", False), ("fast", True)):
+            wire.ENABLED = enabled
+            encoded = FileStorageSerializer.encode(msg)
+            for op, func in (
+                ("encode", lambda: FileStorageSerializer.encode(msg)),
+                ("decode", lambda: FileStorageSerializer.decode(encoded)),
+            ):
+                seconds, peak = measure(func, args.repeat)
+                print(
+                    f"{size:>4} {path:>8} {op:>7} {seconds * 1000 / size:>8.3f}"
+                    f" {peak / (size * MB):>7.2f}"
+                )
+    wire.ENABLED = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2021 eightballer
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+End-to-end upload benchmark, from the behaviour to a local S3 stand-in.
+
+Generates a tree of synthetic files, then runs the uploader behaviour
+and the sync connection on an asyncio loop the way the agent would: each
+tick the behaviour scans and hashes the directory and puts envelopes in the
+outbox, the envelopes are sent to `StorjSyncConnection`, and the replies
+coming back are handed to the `FileStorageHandler` of the skill until every
+file is acknowledged. Failed uploads are retried by the behaviour as in the
+agent. The connection replies with receipts as set in `connection.yaml`,
+`--connection-arg reply_with_receipt=false` benchmarks the `file_download`
+replies instead.
+
+The S3 stand-in is a moto server started on a local port, or any S3
+compatible endpoint, such as a MinIO server, given with `--endpoint`.
+
+Reports the files/s and MB/s of the whole run and the latency percentiles
+of each stage:
+
+- tick: one call to the behaviour `act`, scanning and collecting hashes,
+- discovery: from the start of the run to the envelope entering the outbox,
+- outbox: from the outbox to the connection,
+- upload: from the connection to the reply, queueing included,
+- dedup, put, presign, batch: the stages timed by the connection itself,
+  only sent with receipts,
+- total: from the start of the run to the reply,
+- small: the total of the files of at most `--small-size` bytes, whose tail
+  latency the `schedule_policy` of the skill is meant to keep low.
+
+    python benchmarks/upload_pipeline.py --files 1000 --size 64K \\
+        --distribution lognormal --skill-arg batch_max_files=64
+
+The skill and connection arguments default to those of `skill.yaml` and
+`connection.yaml`, `--skill-arg` and `--connection-arg` override them, the
+nested connection settings with dotted names such as `dedup.enabled`.
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import time
+import types
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import AGENT_DIR, register_packages  # noqa: E402
+
+register_packages()
+
+from aea.configurations.base import ConnectionConfig  # noqa: E402
+from aea.identity.base import Identity  # noqa: E402
+from aea.mail.base import Envelope  # noqa: E402
+
+from packages.eightballer.connections.storj_file_transfer.connection import (  # noqa: E402
+    CONNECTION_ID,
+    StorjSyncConnection,
+)
+from packages.eightballer.protocols.file_storage.keys import object_key  # noqa: E402
+from packages.eightballer.protocols.file_storage.message import (  # noqa: E402
+    FileStorageMessage,
+)
+from packages.eightballer.skills.storj_file_uploader.behaviours import (  # noqa: E402
+    StorjFileUploadBehaviour,
+)
+from packages.eightballer.skills.storj_file_uploader.handlers import (  # noqa: E402
+    FileStorageHandler,
+)
+from packages.eightballer.skills.storj_file_uploader.registry import (  # noqa: E402
+    url_key,
+)
+from packages.eightballer.skills.storj_file_uploader.strategy import (  # noqa: E402
+    Strategy,
+)
+
+UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+PERCENTILES = (50, 90, 99)
+SKILL_DIR = os.path.join(AGENT_DIR, "skills", "storj_file_uploader")
+CONNECTION_DIR = os.path.join(AGENT_DIR, "connections", "storj_file_transfer")
+CLIENT_STAGES = ("dedup", "put", "presign", "batch")
+
+
+def parse_size(size: str) -> int:
+    """Parse a size such as `64K`, `16M` or `1G` into bytes."""
+    unit = size[-1].upper()
+    if unit in UNITS:
+        return int(float(size[:-1]) * UNITS[unit])
+    return int(size)
+
+
+def file_sizes(
+    count: int, size: int, distribution: str, seed: int, max_size: int
+) -> List[int]:
+    """
+    Draw the sizes of the synthetic files.
+
+    :param count: the number of files.
+    :param size: the size of every file when `fixed`, the mean when
+        `uniform`, and the median when `lognormal`.
+    :param distribution: one of `DISTRIBUTIONS`.
+    :param seed: the seed of the draw, the same seed giving the same sizes.
+    :param max_size: the largest size drawn.
+    :return: the sizes, in bytes.
+    """
+    rng = random.Random(seed)
+    if distribution == "fixed":
+        sizes = [size] * count
+    elif distribution == "uniform":
+        sizes = [rng.randint(1, 2 * size) for _ in range(count)]
+    else:
+        sizes = [int(rng.lognormvariate(math.log(size), 1.0)) for _ in range(count)]
+    return [max(1, min(value, max_size)) for value in sizes]
+
+
+def make_tree(directory: str, sizes: List[int], depth: int, fanout: int) -> None:
+    """
+    Write one file of random content per size in a tree under `directory`.
+
+    :param directory: the root of the tree.
+    :param sizes: the sizes of the files.
+    :param depth: the number of levels of subdirectories, the files being
+        spread over the deepest level.
+    :param fanout: the number of subdirectories of each directory.
+    """
+    for index, size in enumerate(sizes):
+        parts = [f"dir_{index // fanout ** level % fanout}" for level in range(depth)]
+        path = os.path.join(directory, *parts)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, f"file_{index:07d}.bin"), "wb") as file:
+            file.write(os.urandom(size))
+
+
+def free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def load_args(path: str, *keys: str) -> Dict[str, Any]:
+    """Get the mapping at `keys` in a yaml configuration file."""
+    with open(path, "r") as file:
+        value = yaml.safe_load(file)
+    for key in keys:
+        value = value[key]
+    return dict(value)
+
+
+def override(args: Dict[str, Any], overrides: List[str]) -> Dict[str, Any]:
+    """Apply `name=value` overrides, the dotted names setting nested values."""
+    for item in overrides:
+        name, value = item.split("=", 1)
+        target = args
+        *parents, leaf = name.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = yaml.safe_load(value)
+    return args
+
+
+class Outbox:
+    """Outbox of the benchmark, recording when each envelope was put."""
+
+    def __init__(self) -> None:
+        """Initialize the outbox."""
+        self.envelopes = []  # type: List[Tuple[Envelope, float]]
+
+    def put(self, envelope: Envelope) -> None:
+        """Put an envelope."""
+        self.envelopes.append((envelope, time.perf_counter()))
+
+    def drain(self) -> List[Tuple[Envelope, float]]:
+        """Get and remove the envelopes put so far."""
+        envelopes, self.envelopes = self.envelopes, []
+        return envelopes
+
+
+class Pipeline:
+    """The uploader skill and the sync connection wired together."""
+
+    def __init__(
+        self,
+        work_dir: str,
+        upload_dir: str,
+        endpoint: str,
+        skill_args: Dict[str, Any],
+        connection_args: List[str],
+        small_size: int = 64 * 1024,
+    ) -> None:
+        """
+        Initialize the pipeline.
+
+        :param work_dir: the directory of the indexes and ledgers.
+        :param upload_dir: the directory of the files to upload.
+        :param endpoint: the url of the S3 endpoint.
+        :param skill_args: the behaviour arguments.
+        :param connection_args: the `name=value` overrides of the connection configuration.
+        :param small_size: the size of the largest files timed as small.
+        """
+        logger = logging.getLogger("benchmark")
+        self.outbox = Outbox()
+        context = types.SimpleNamespace(logger=logger, outbox=self.outbox)
+        strategy_args = load_args(
+            os.path.join(SKILL_DIR, "skill.yaml"), "models", "strategy", "args"
+        )
+        strategy_args["ledger_path"] = os.path.join(work_dir, "uploaded_files.log")
+        context.strategy = Strategy(
+            name="strategy", skill_context=context, **strategy_args
+        )
+        behaviour_args = {
+            **load_args(
+                os.path.join(SKILL_DIR, "skill.yaml"),
+                "behaviours",
+                "file_reader",
+                "args",
+            ),
+            "upload_roots": [{"path": upload_dir, "recursive": True}],
+            "scan_index_path": os.path.join(work_dir, "scan_index.log"),
+            **skill_args,
+        }
+        self.tick_interval = behaviour_args.pop("tick_interval")
+        self.behaviour = StorjFileUploadBehaviour(
+            name="file_reader", skill_context=context, **behaviour_args
+        )
+        self.handler = FileStorageHandler(name="scaffold", skill_context=context)
+        config = load_args(os.path.join(CONNECTION_DIR, "connection.yaml"), "config")
+        config["storj_creds"]["endpoint_url"] = endpoint
+        config["target_skill_id"] = "eightballer/storj_file_uploader:0.1.0"
+        config["dedup"]["index_path"] = os.path.join(work_dir, "remote_index.log")
+        config["packing"]["index_path"] = os.path.join(work_dir, "pack_index.log")
+        config["metrics"]["textfile"] = os.path.join(work_dir, "metrics.prom")
+        config["rate_limit"]["control_path"] = os.path.join(work_dir, "rate_limit.json")
+        config = override(config, connection_args)
+        self.connection = StorjSyncConnection(
+            configuration=ConnectionConfig(connection_id=CONNECTION_ID, **config),
+            data_dir=work_dir,
+            identity=Identity("benchmark", address="benchmark", public_key="benchmark"),
+        )
+        self.small_size = small_size
+        self.stages = {}  # type: Dict[str, List[float]]
+        self._started = 0.0
+        self._sent = {}  # type: Dict[str, Tuple[float, float]]
+        self.acknowledged = 0
+        self.bytes = 0
+
+    def _record(self, stage: str, duration: float) -> None:
+        self.stages.setdefault(stage, []).append(duration)
+
+    async def run(self, file_count: int, timeout: float) -> float:
+        """
+        Upload the files and wait for their receipts.
+
+        :param file_count: the number of files to wait for.
+        :param timeout: the longest time to wait, in seconds.
+        :return: the duration of the run, in seconds.
+        """
+        await self.connection.connect()
+        receiver = asyncio.ensure_future(self._receive())
+        self.behaviour.setup()
+        self.handler.setup()
+        started = self._started = time.perf_counter()
+        try:
+            while self.acknowledged < file_count:
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError(
+                        f"{self.acknowledged} of {file_count} files uploaded "
+                        f"after {timeout} seconds"
+                    )
+                tick_started = time.perf_counter()
+                self.behaviour.act()
+                self._record("tick", time.perf_counter() - tick_started)
+                for envelope, queued_at in self.outbox.drain():
+                    await self._send(envelope, queued_at, started)
+                await asyncio.sleep(self.tick_interval)
+            return time.perf_counter() - started
+        finally:
+            receiver.cancel()
+            self.behaviour.teardown()
+            self.handler.teardown()
+            self.behaviour.context.strategy.teardown()
+            await self.connection.disconnect()
+
+    async def _send(self, envelope: Envelope, queued_at: float, started: float) -> None:
+        message = envelope.message
+        sent_at = time.perf_counter()
+        if message.performative == FileStorageMessage.Performative.FILE_UPLOAD_BATCH:
+            keys = tuple(map(object_key, message.keys, message.filenames))
+        elif message.performative in (
+            FileStorageMessage.Performative.UPLOAD_CHUNK,
+            FileStorageMessage.Performative.UPLOAD_COMMIT,
+        ):
+            keys = ()
+        else:
+            keys = (object_key(message.key, message.filename),)
+        for key in keys:
+            self._sent[key] = (queued_at, sent_at)
+            self._record("discovery", queued_at - started)
+            self._record("outbox", sent_at - queued_at)
+        await self.connection.send(envelope)
+
+    async def _receive(self) -> None:
+        while True:
+            envelope = await self.connection.receive()
+            if envelope is None:
+                return
+            received_at = time.perf_counter()
+            message = envelope.message
+            self.handler.handle(message)
+            if message.performative == FileStorageMessage.Performative.UPLOAD_RECEIPT:
+                entries = [(message.key, message.size)]
+            elif (
+                message.performative
+                == FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT
+            ):
+                entries = [
+                    (key, size)
+                    for key, size, error in zip(
+                        message.keys, message.sizes, message.errors
+                    )
+                    if not error
+                ]
+            elif message.performative == FileStorageMessage.Performative.FILE_DOWNLOAD:
+                entries = [(url_key(message.access_url), len(message.content))]
+            else:
+                continue
+            timings = message.timings if message.is_set("timings") else {}
+            for stage in CLIENT_STAGES:
+                if stage in timings:
+                    self._record(stage, timings[stage])
+            for key, size in entries:
+                _, sent_at = self._sent.pop(key, (received_at, received_at))
+                self._record("upload", received_at - sent_at)
+                self._record("total", received_at - self._started)
+                if size <= self.small_size:
+                    self._record("small", received_at - self._started)
+                self.acknowledged += 1
+                self.bytes += size
+
+
+def percentiles(durations: List[float]) -> List[float]:
+    """Get the `PERCENTILES` and the maximum of durations, in milliseconds."""
+    if len(durations) == 1:
+        cuts = durations * 99
+    else:
+        cuts = statistics.quantiles(durations, n=100, method="inclusive")
+    return [cuts[p - 1] * 1000 for p in PERCENTILES] + [max(durations) * 1000]
+
+
+def report(pipeline: Pipeline, duration: float, total_bytes: int) -> None:
+    """Print the throughput of the run and the latencies of its stages."""
+    print(
+        f"{pipeline.acknowledged} files, {total_bytes / 1024 ** 2:.1f} MB "
+        f"in {duration:.2f} s: {pipeline.acknowledged / duration:.1f} files/s, "
+        f"{total_bytes / 1024 ** 2 / duration:.1f} MB/s"
+    )
+    header = " ".join(f"{'p' + str(p) + ' ms':>10}" for p in PERCENTILES)
+    print(f"{'stage':<10} {'count':>7} {header} {'max ms':>10}")
+    for stage, durations in pipeline.stages.items():
+        values = " ".join(f"{value:>10.2f}" for value in percentiles(durations))
+        print(f"{stage:<10} {len(durations):>7} {values}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the upload pipeline against a local S3 endpoint."
+    )
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--size", default="64K")
+    parser.add_argument("--max-size", default="256M")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=0)
+    parser.add_argument("--fanout", type=int, default=10)
+    parser.add_argument("--small-size", default="64K")
+    parser.add_argument("--tick-interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--endpoint", help="use this S3 endpoint instead of moto")
+    parser.add_argument("--access-key", default="benchmark")
+    parser.add_argument("--secret-key", default="benchmark")
+    parser.add_argument("--skill-arg", action="append", default=[])
+    parser.add_argument("--connection-arg", action="append", default=[])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    server = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        from moto.server import ThreadedMotoServer
+
+        port = free_port()
+        server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+        server.start()
+        endpoint = f"http://127.0.0.1:{port}"
+
+    sizes = file_sizes(
+        args.files,
+        parse_size(args.size),
+        args.distribution,
+        args.seed,
+        parse_size(args.max_size),
+    )
+    try:
+        with tempfile.TemporaryDirectory(prefix="upload_pipeline") as work_dir:
+            upload_dir = os.path.join(work_dir, "upload_dir")
+            make_tree(upload_dir, sizes, args.depth, args.fanout)
+            skill_args = override({"tick_interval": args.tick_interval}, args.skill_arg)
+            connection_args = [
+                f"storj_creds.aws_access_key_id={args.access_key}",
+                f"storj_creds.aws_secret_access_key={args.secret_key}",
+                *args.connection_arg,
+            ]
+            pipeline = Pipeline(
+                work_dir,
+                upload_dir,
+                endpoint,
+                skill_args,
+                connection_args,
+                parse_size(args.small_size),
+            )
+            duration = asyncio.get_event_loop().run_until_complete(
+                pipeline.run(len(sizes), args.timeout)
+            )
+            report(pipeline, duration, sum(sizes))
+    finally:
+        if server is not None:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
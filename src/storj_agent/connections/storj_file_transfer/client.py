@@ -0,0 +1,638 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Blocking Storj client shared by the sync and async connections."""
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import boto3
+from aea.mail.base import Envelope
+from botocore.config import Config
+from packages.eightballer.connections.storj_file_transfer.dedup import (
+    FINGERPRINT_METADATA,
+    RemoteIndex,
+)
+from packages.eightballer.connections.storj_file_transfer.multipart import (
+    DEFAULT_MULTIPART_CONFIG,
+    MultipartUploader,
+    PartReader,
+)
+from packages.eightballer.connections.storj_file_transfer.packing import (
+    DEFAULT_PACKING_CONFIG,
+    PackedFile,
+    PackIndex,
+    build_pack,
+    pack_key,
+)
+from packages.eightballer.connections.storj_file_transfer.presign import PresignCache
+from packages.eightballer.connections.storj_file_transfer.ratelimit import RateLimiter
+from packages.eightballer.connections.storj_file_transfer.streaming import (
+    DEFAULT_IDLE_TIMEOUT,
+    StreamingUploads,
+)
+from packages.eightballer.protocols.file_storage.keys import object_key
+from packages.eightballer.protocols.file_storage.message import FileStorageMessage
+from packages.eightballer.protocols.file_storage.metrics import (
+    FAILURES,
+    RETRIES,
+    STAGE_SECONDS,
+    UPLOADED_BYTES,
+    UPLOADS,
+)
+
+BUCKET_NAME = "bucketto"
+DEFAULT_BATCH_CONCURRENCY = 16
+
+BatchEntry = Tuple[str, str, int, str, str, str]
+
+
+def count_retry(request: Any, **kwargs: Any) -> None:
+    """Count the requests the s3 client sends again after a failed attempt."""
+    if request.context.get("retries", {}).get("attempt", 1) > 1:
+        RETRIES.inc(kind="request")
+
+
+class StorjClient:
+    """Translate file_storage envelopes into calls to the Storj S3 gateway."""
+
+    SUPPORTED_PERFORMATIVES = frozenset(
+        {
+            FileStorageMessage.Performative.FILE_UPLOAD,
+            FileStorageMessage.Performative.FILE_UPLOAD_REF,
+            FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+            FileStorageMessage.Performative.UPLOAD_BEGIN,
+            FileStorageMessage.Performative.UPLOAD_CHUNK,
+            FileStorageMessage.Performative.UPLOAD_COMMIT,
+            FileStorageMessage.Performative.REQUEST_URL,
+        }
+    )
+
+    def __init__(
+        self, config: Dict[str, Any], max_workers: int, logger: logging.Logger
+    ) -> None:
+        """
+        Initialize the client.
+
+        :param config: the connection configuration.
+        :param max_workers: the number of threads calling the client concurrently.
+        :param logger: the connection logger.
+        """
+        self.storj_creds = config["storj_creds"]
+        self.multipart_config = {
+            **DEFAULT_MULTIPART_CONFIG,
+            **config.get("multipart", {}),
+        }
+        self.presign_config = config.get("presign", {})
+        self.rate_limit_config = config.get("rate_limit", {})
+        self.dedup_config = config.get("dedup", {})
+        self.packing_config = {
+            **DEFAULT_PACKING_CONFIG,
+            **config.get("packing", {}),
+        }
+        self.reply_with_receipt = config.get("reply_with_receipt", True)
+        self.batch_concurrency = config.get(
+            "batch_concurrency", DEFAULT_BATCH_CONCURRENCY
+        )
+        self.stream_idle_timeout = config.get(
+            "stream_idle_timeout", DEFAULT_IDLE_TIMEOUT
+        )
+        self.max_workers = max_workers
+        self.logger = logger
+        self.bucket_name = BUCKET_NAME
+
+    def connect(self) -> None:
+        """Create the s3 client and make sure the bucket exists."""
+        self.s3 = boto3.client(
+            "s3",
+            aws_access_key_id=self.storj_creds["aws_access_key_id"],
+            aws_secret_access_key=self.storj_creds["aws_secret_access_key"],
+            endpoint_url=self.storj_creds["endpoint_url"],
+            config=Config(
+                max_pool_connections=self.max_workers
+                + self.multipart_config["concurrency"]
+                + self.batch_concurrency
+            ),
+        )
+        self.s3.meta.events.register("before-send.s3", count_retry)
+        self.rate_limiter = RateLimiter(self.rate_limit_config, logger=self.logger)
+        self.s3.meta.events.register("before-send.s3", self.rate_limiter.throttle)
+        self._batch_pool = ThreadPoolExecutor(
+            max_workers=self.batch_concurrency, thread_name_prefix="batch"
+        )
+        self.multipart = MultipartUploader(
+            self.s3, self.multipart_config, logger=self.logger
+        )
+        self.presign = PresignCache(self.s3, self.bucket_name, self.presign_config)
+        self.remote_index = RemoteIndex(
+            self.s3, self.bucket_name, self.dedup_config, logger=self.logger
+        )
+        self.pack_index = PackIndex(self.packing_config["index_path"])
+        self.streams = StreamingUploads(
+            self.s3,
+            self.bucket_name,
+            self.multipart,
+            self.remote_index,
+            logger=self.logger,
+            idle_timeout=self.stream_idle_timeout,
+        )
+
+        try:
+            self.logger.info(f"creating bucket {self.bucket_name}...")
+            self.s3.create_bucket(Bucket=self.bucket_name)
+        except self.s3.exceptions.BucketAlreadyExists:
+            self.logger.info("bucket already exists")
+
+    def handle(self, envelope: Envelope) -> Optional[Envelope]:
+        """
+        Handle an envelope of one of the `SUPPORTED_PERFORMATIVES`.
+
+        A failed upload is answered with an error reply, so that the skill
+        can upload the file again, see `_error_reply`.
+
+        :param envelope: the envelope to handle.
+        :return: the reply envelope to send back to the skill, if any.
+        """
+        try:
+            return self._dispatch(envelope)
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.error(f"{envelope.message.performative} failed: {e}")
+            FAILURES.inc(stage="upload")
+            return self._error_reply(envelope, str(e) or type(e).__name__)
+
+    def _dispatch(self, envelope: Envelope) -> Optional[Envelope]:
+        """Handle an envelope by the method of its performative."""
+        performative = envelope.message.performative
+        if performative == FileStorageMessage.Performative.FILE_UPLOAD:
+            return self.upload(envelope)
+        if performative == FileStorageMessage.Performative.FILE_UPLOAD_REF:
+            return self.upload_ref(envelope)
+        if performative == FileStorageMessage.Performative.FILE_UPLOAD_BATCH:
+            return self.upload_batch(envelope)
+        if performative == FileStorageMessage.Performative.REQUEST_URL:
+            return self.request_url(envelope)
+        return self.stream(envelope)
+
+    def stream(self, envelope: Envelope) -> Optional[Envelope]:
+        """
+        Handle an UPLOAD_BEGIN, UPLOAD_CHUNK or UPLOAD_COMMIT envelope.
+
+        :param envelope: the envelope of the stream.
+        :return: the reply envelope once the streamed file is stored, None before.
+        """
+        message = envelope.message
+        if message.performative == FileStorageMessage.Performative.UPLOAD_BEGIN:
+            stored = self.streams.begin(
+                message.key,
+                object_key(message.key, message.filename),
+                message.size,
+                message.fingerprint,
+            )
+        elif message.performative == FileStorageMessage.Performative.UPLOAD_CHUNK:
+            stored = self.streams.chunk(
+                message.key, message.offset, message.content, message.chunk_fingerprint
+            )
+        else:
+            stored = self.streams.commit(message.key, message.chunk_count)
+        if stored is None:
+            return None
+        self.logger.info(f"Stream of {stored.key} stored.")
+        return self._reply(
+            envelope, stored.key, b"", stored.size, stored.etag, stored.timings
+        )
+
+    def request_url(self, envelope: Envelope) -> Envelope:
+        """
+        Get a valid presigned url of an uploaded object.
+
+        The url of a packed file is the url of its pack, and the reply carries
+        the byte range of the file in it.
+
+        :param envelope: the REQUEST_URL envelope.
+        :return: the PRESIGNED_URL envelope to send back to the skill.
+        """
+        key = envelope.message.key
+        packed = self.pack_index.get(key)
+        started = time.perf_counter()
+        url, expires_at = self.presign.url(key if packed is None else packed.pack_key)
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage="presign")
+        msg = FileStorageMessage(
+            performative=FileStorageMessage.Performative.PRESIGNED_URL,
+            key=key,
+            access_url=url,
+            expires_at=expires_at,
+            byte_range="" if packed is None else packed.byte_range,
+        )
+        msg.sender = envelope.to
+        msg.to = envelope.sender
+        return Envelope(to=msg.to, sender=msg.sender, message=msg)
+
+    def upload(self, envelope: Envelope) -> Envelope:
+        """
+        Upload the content of a FILE_UPLOAD envelope.
+
+        :param envelope: the envelope to upload.
+        :return: the reply envelope to send back to the skill.
+        """
+        self.logger.info(f"Message got! {envelope.message.content[:100]}")
+        key = object_key(envelope.message.key, envelope.message.filename)
+        content = envelope.message.content
+        timings = {}  # type: Dict[str, float]
+        etag = self._put(
+            key,
+            len(content),
+            envelope.message.fingerprint,
+            lambda offset, length: content[offset : offset + length],
+            content,
+            timings,
+        )
+        return self._reply(envelope, key, content, len(content), etag, timings)
+
+    def upload_ref(self, envelope: Envelope) -> Envelope:
+        """
+        Upload the byte range of a local file referenced by a FILE_UPLOAD_REF envelope.
+
+        :param envelope: the envelope to upload.
+        :return: the reply envelope to send back to the skill.
+        """
+        message = envelope.message
+        self.logger.info(
+            f"Reference got! {message.path} [{message.offset}:{message.offset + message.length}]"
+        )
+        key = object_key(message.key, message.filename)
+        timings = {}  # type: Dict[str, float]
+        etag = self._put_path(
+            key,
+            message.path,
+            message.fingerprint,
+            timings,
+            message.offset,
+            message.length,
+        )
+        return self._reply(envelope, key, b"", message.length, etag, timings)
+
+    def upload_batch(self, envelope: Envelope) -> Envelope:
+        """
+        Upload the files of a FILE_UPLOAD_BATCH envelope.
+
+        Each entry holds either its content or, if its path is set, a
+        reference to a whole local file. Entries are uploaded concurrently on
+        the batch pool and a failed entry does not fail the others, its error
+        is reported in the receipt instead.
+
+        With `packing` enabled the entries are packed in a single archive
+        object instead, see `_upload_pack`.
+
+        :param envelope: the envelope to upload.
+        :return: the UPLOAD_BATCH_RECEIPT envelope to send back to the skill.
+        """
+        message = envelope.message
+        self.logger.info(f"Batch got! {len(message.keys)} files")
+        started = time.perf_counter()
+        entries = zip(
+            message.keys,
+            message.filenames,
+            message.contents,
+            message.paths,
+            message.fingerprints,
+        )
+        if self.packing_config["enabled"]:
+            results = self._upload_pack(list(entries))
+        else:
+            results = list(
+                self._batch_pool.map(lambda e: self._upload_entry(*e), entries)
+            )
+        keys, urls, sizes, etags, errors, ranges = (
+            zip(*results) if results else ((),) * 6
+        )
+        msg = FileStorageMessage(
+            performative=FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT,
+            keys=tuple(keys),
+            access_urls=tuple(urls),
+            sizes=tuple(sizes),
+            etags=tuple(etags),
+            errors=tuple(errors),
+            ranges=tuple(ranges),
+            timings={"batch": time.perf_counter() - started},
+        )
+        STAGE_SECONDS.observe(msg.timings["batch"], stage="batch")
+        msg.sender = envelope.to
+        msg.to = envelope.sender
+        return Envelope(to=msg.to, sender=msg.sender, message=msg)
+
+    def _upload_pack(
+        self, entries: List[Tuple[str, str, bytes, str, str]]
+    ) -> List[BatchEntry]:
+        """
+        Upload the entries of a batch packed in one archive object.
+
+        The files are stored in an uncompressed tar archive uploaded once,
+        each file getting the url of the archive and the byte range of its
+        content in it. Files packed before are not packed again, their
+        location comes from the pack index. Empty files, which have no byte
+        range, are uploaded on their own.
+
+        :param entries: the key, filename, content, path and fingerprint of each entry.
+        :return: the receipt entry of each batch entry.
+        """
+        results = [None] * len(entries)  # type: List[Optional[BatchEntry]]
+        to_pack = []  # type: List[Tuple[int, str, bytes]]
+        for index, (key, filename, content, path, fingerprint) in enumerate(entries):
+            name = object_key(key, filename)
+            packed = self.pack_index.get(name)
+            if packed is not None:
+                results[index] = self._packed_entry(name, packed, "")
+                continue
+            try:
+                if path:
+                    with open(path, "rb") as file:
+                        content = file.read()
+            except OSError as e:
+                self.logger.error(f"upload of {name} failed: {e}")
+                FAILURES.inc(stage="upload")
+                results[index] = (name, "", 0, "", str(e), "")
+                continue
+            if not content:
+                results[index] = self._upload_entry(
+                    key, filename, content, "", fingerprint
+                )
+                continue
+            to_pack.append((index, name, content))
+        if to_pack:
+            data, ranges = build_pack([(name, content) for _, name, content in to_pack])
+            key = pack_key([name for _, name, _ in to_pack])
+            try:
+                etag = self._put(
+                    key,
+                    len(data),
+                    hashlib.md5(data).hexdigest(),
+                    lambda offset, length: data[offset : offset + length],
+                    data,
+                    {},
+                ).strip('"')
+            except Exception as e:  # pylint: disable=broad-except
+                self.logger.error(f"upload of pack {key} failed: {e}")
+                FAILURES.inc(len(to_pack), stage="upload")
+                for index, name, _ in to_pack:
+                    results[index] = (name, "", 0, "", str(e) or type(e).__name__, "")
+            else:
+                self.logger.info(f"packed {len(to_pack)} files in {key}")
+                for (index, name, _), (offset, length) in zip(to_pack, ranges):
+                    packed = PackedFile(key, offset, length)
+                    self.pack_index.add(name, packed)
+                    results[index] = self._packed_entry(name, packed, etag)
+        return cast(List[BatchEntry], results)
+
+    def _packed_entry(self, name: str, packed: PackedFile, etag: str) -> BatchEntry:
+        """Get the receipt entry of a packed file."""
+        url, _ = self.presign.url(packed.pack_key)
+        return name, url, packed.length, etag, "", packed.byte_range
+
+    def _upload_entry(
+        self, key: str, filename: str, content: bytes, path: str, fingerprint: str
+    ) -> BatchEntry:
+        """
+        Upload one entry of a batch.
+
+        :param key: the key of the file.
+        :param filename: the name of the file.
+        :param content: the content of the file, ignored if `path` is set.
+        :param path: the path of the file to upload, if any.
+        :param fingerprint: the fingerprint of the content of the file.
+        :return: the object key, url, size, ETag, error and byte range of the entry.
+        """
+        object_name = object_key(key, filename)
+        timings = {}  # type: Dict[str, float]
+        try:
+            if path:
+                size = os.stat(path).st_size
+                etag = self._put_path(object_name, path, fingerprint, timings)
+            else:
+                size = len(content)
+                etag = self._put(
+                    object_name,
+                    size,
+                    fingerprint,
+                    lambda offset, length: content[offset : offset + length],
+                    content,
+                    timings,
+                )
+            started = time.perf_counter()
+            url, _ = self.presign.sign(object_name)
+            STAGE_SECONDS.observe(time.perf_counter() - started, stage="presign")
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.error(f"upload of {object_name} failed: {e}")
+            FAILURES.inc(stage="upload")
+            return object_name, "", 0, "", str(e) or type(e).__name__, ""
+        return object_name, url, size, etag.strip('"'), "", ""
+
+    def _put_path(
+        self,
+        key: str,
+        path: str,
+        fingerprint: str,
+        timings: Dict[str, float],
+        offset: int = 0,
+        length: Optional[int] = None,
+    ) -> str:
+        """
+        Upload a byte range of a local file.
+
+        The file is streamed from disk: whole files are handed to the client
+        as file objects and multipart uploads read each part at its offset, so
+        at most one part per worker is held in memory.
+
+        :param key: the object key.
+        :param path: the path of the file.
+        :param fingerprint: the fingerprint of the range content.
+        :param timings: the dict the stage durations are added to.
+        :param offset: the start of the range.
+        :param length: the length of the range, up to the end of the file if None.
+        :return: the ETag of the uploaded object.
+        """
+        with open(path, "rb") as file:
+            file_size = os.fstat(file.fileno()).st_size
+            if length is None:
+                length = file_size - offset
+            if file_size < offset + length:
+                raise ValueError(
+                    f"{path} is shorter than the referenced range, it changed since it was hashed."
+                )
+            whole_file = offset == 0 and length == file_size
+            return self._put(
+                key,
+                length,
+                fingerprint,
+                lambda part_offset, part_length: os.pread(
+                    file.fileno(), part_length, offset + part_offset
+                ),
+                file if whole_file else None,
+                timings,
+            )
+
+    def _put(
+        self,
+        key: str,
+        size: int,
+        fingerprint: str,
+        read_part: PartReader,
+        body: Optional[Any],
+        timings: Dict[str, float],
+    ) -> str:
+        """
+        Upload an object, in parts if it is large enough.
+
+        Nothing is sent if the remote index finds the same content already
+        stored under the key.
+
+        :param key: the object key.
+        :param size: the size of the object in bytes.
+        :param fingerprint: the fingerprint of the object content.
+        :param read_part: callable returning the bytes of (offset, length).
+        :param body: the body for a single put, read with `read_part` if None.
+        :param timings: the dict the stage durations are added to.
+        :return: the ETag of the uploaded object.
+        """
+        started = time.perf_counter()
+        etag = self.remote_index.find(key, size, fingerprint)
+        timings["dedup"] = time.perf_counter() - started
+        STAGE_SECONDS.observe(timings["dedup"], stage="dedup")
+        if etag is not None:
+            self.logger.info(f"{key} is already stored, skipping upload")
+            UPLOADS.inc(result="skipped")
+            return etag
+        started = time.perf_counter()
+        metadata = {FINGERPRINT_METADATA: fingerprint}
+        if self.multipart.should_use(size):
+            etag = self.multipart.upload(
+                self.bucket_name, key, size, read_part, metadata
+            )
+        else:
+            if body is None:
+                body = read_part(0, size)
+            etag = self.s3.put_object(
+                Body=body, Bucket=self.bucket_name, Key=key, Metadata=metadata
+            )["ETag"]
+        timings["put"] = time.perf_counter() - started
+        STAGE_SECONDS.observe(timings["put"], stage="put")
+        UPLOADS.inc(result="stored")
+        UPLOADED_BYTES.inc(size)
+        self.remote_index.add(key, size, etag)
+        return etag
+
+    def close(self) -> None:
+        """Release the resources of the client."""
+        self._batch_pool.shutdown(wait=True)
+        self.streams.close()
+        self.remote_index.close()
+        self.pack_index.close()
+
+    def _error_reply(self, envelope: Envelope, error: str) -> Envelope:
+        """
+        Build the reply of an envelope which could not be handled.
+
+        A batch gets an UPLOAD_BATCH_RECEIPT whose every entry carries the
+        error, anything else an ERROR whose `error_data` holds the key of the
+        file under "key": the object key of uploads, the key of the message
+        for the chunks and commit of a stream and for url requests.
+
+        :param envelope: the envelope which failed.
+        :param error: the error message.
+        :return: the reply envelope.
+        """
+        message = envelope.message
+        if message.performative == FileStorageMessage.Performative.FILE_UPLOAD_BATCH:
+            keys = tuple(map(object_key, message.keys, message.filenames))
+            msg = FileStorageMessage(
+                performative=FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT,
+                keys=keys,
+                access_urls=("",) * len(keys),
+                sizes=(0,) * len(keys),
+                etags=("",) * len(keys),
+                errors=(error,) * len(keys),
+                ranges=("",) * len(keys),
+                timings={},
+            )
+        else:
+            if message.performative in (
+                FileStorageMessage.Performative.FILE_UPLOAD,
+                FileStorageMessage.Performative.FILE_UPLOAD_REF,
+                FileStorageMessage.Performative.UPLOAD_BEGIN,
+            ):
+                key = object_key(message.key, message.filename)
+            else:
+                key = message.key
+            msg = FileStorageMessage(
+                performative=FileStorageMessage.Performative.ERROR,
+                error_code=FileStorageMessage.ErrorCode.UPLOAD_FAILED,
+                error_msg=error,
+                error_data={"key": key.encode("utf-8")},
+            )
+        msg.sender = envelope.to
+        msg.to = envelope.sender
+        return Envelope(to=msg.to, sender=msg.sender, message=msg)
+
+    def _reply(
+        self,
+        envelope: Envelope,
+        key: str,
+        content: bytes,
+        size: int,
+        etag: str,
+        timings: Dict[str, float],
+    ) -> Envelope:
+        """
+        Presign the uploaded object and build the reply.
+
+        With `reply_with_receipt` the reply is an UPLOAD_RECEIPT which carries
+        the url and the upload metadata but none of the file bytes, otherwise
+        it is a FILE_DOWNLOAD echoing `content`.
+
+        :param envelope: the envelope which was uploaded.
+        :param key: the object key.
+        :param content: the content echoed in a FILE_DOWNLOAD reply.
+        :param size: the size of the object in bytes.
+        :param etag: the ETag of the object.
+        :param timings: the durations of the upload stages, in seconds.
+        :return: the reply envelope.
+        """
+        started = time.perf_counter()
+        url, _ = self.presign.sign(key)
+        timings = {**timings, "presign": time.perf_counter() - started}
+        STAGE_SECONDS.observe(timings["presign"], stage="presign")
+        if self.reply_with_receipt:
+            msg = FileStorageMessage(
+                performative=FileStorageMessage.Performative.UPLOAD_RECEIPT,
+                access_url=url,
+                key=key,
+                size=size,
+                etag=etag.strip('"'),
+                timings=timings,
+            )
+        else:
+            msg = FileStorageMessage(
+                performative=FileStorageMessage.Performative.FILE_DOWNLOAD,
+                content=content,
+                access_url=url,
+            )
+        msg.sender = envelope.to
+        msg.to = envelope.sender
+        return Envelope(to=msg.to, sender=msg.sender, message=msg)
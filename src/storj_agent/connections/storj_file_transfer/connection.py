@@ -17,11 +17,14 @@
 #
 # ------------------------------------------------------------------------------
 """Scaffold connection and channel."""
-from typing import Any, Optional
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional, Set
 
-import boto3
 from aea.configurations.base import PublicId
-from aea.connections.base import BaseSyncConnection
+from aea.connections.base import (BaseSyncConnection, Connection,
+                                  ConnectionStates)
 from aea.mail.base import Envelope
 
 """
@@ -32,8 +35,10 @@ Sync (inherited from BaseSyncConnection) or Async (inherited from Connection) co
 
 CONNECTION_ID = PublicId.from_str("eightballer/storj_file_transfer:0.1.0")
 
-from packages.eightballer.protocols.file_storage.message import \
-    FileStorageMessage
+from packages.eightballer.connections.storj_file_transfer.client import \
+    StorjClient
+from packages.eightballer.protocols.file_storage.metrics import (
+    FAILURES, QUEUE_WAIT_SECONDS, MetricsExporter)
 
 
 class StorjSyncConnection(BaseSyncConnection):
@@ -64,6 +69,12 @@ class StorjSyncConnection(BaseSyncConnection):
 
         self.storj_creds = kwargs.get("configuration").config["storj_creds"]
         self.target_skill = kwargs.get("configuration").config["target_skill_id"]
+        self.upload_workers = kwargs.get("configuration").config.get(
+            "upload_workers", self.MAX_WORKER_THREADS
+        )
+        self.upload_queue_size = kwargs.get("configuration").config.get(
+            "upload_queue_size", 0
+        )
         super().__init__(*args, **kwargs)
 
     def main(self) -> None:
@@ -92,47 +103,62 @@ class StorjSyncConnection(BaseSyncConnection):
         """
         pass
 
-    def on_send(self, envelope: Envelope) -> None:
+    async def connect(self) -> None:
+        """Connect to the gateway."""
+        self._upload_slots = asyncio.BoundedSemaphore(
+            self.upload_workers + self.upload_queue_size
+        )
+        await super().connect()
+
+    async def send(self, envelope: Envelope) -> None:
         """
         Send an envelope.
 
+        Waits while `upload_workers + upload_queue_size` uploads are already
+        queued or in flight, so a full queue holds back the sender.
+
         :param envelope: the envelope to send.
         """
-        if envelope.message.performative == FileStorageMessage.Performative.FILE_UPLOAD:
+        self._ensure_connected()
+        queued_at = time.perf_counter()
+        await self._upload_slots.acquire()
+        try:
+            self.on_send(envelope, queued_at)
+        except BaseException:
+            self._upload_slots.release()
+            raise
+
+    def on_send(self, envelope: Envelope, queued_at: float) -> None:
+        """
+        Send an envelope.
+
+        Called by `send` once an upload slot is free for the envelope.
+
+        :param envelope: the envelope to send.
+        :param queued_at: the time the envelope was sent, for the queue wait.
+        """
+        if envelope.message.performative in StorjClient.SUPPORTED_PERFORMATIVES:
             self.logger.info(f"Envelope got! {envelope}")
-            self._upload(envelope)
+            future = self._upload_pool.submit(self._upload, envelope, queued_at)
+            future.add_done_callback(self._upload_done)
         else:
             self.logger.error(
                 f"Unsupported performative! {envelope.message.performative}"
             )
             raise NotImplementedError
 
-    def _upload(self, envelope: Envelope) -> None:
-        self.logger.info(f"Message got! {envelope.message.content[:100]}")
-        extension = envelope.message.filename.rsplit(".", 1)[1]
+    def _upload_done(self, future: Future) -> None:
+        """Release the slot of a finished upload and log its failure, if any."""
+        self._loop.call_soon_threadsafe(self._upload_slots.release)
+        if future.exception() is not None:
+            FAILURES.inc(stage="upload")
+            self.logger.error("upload failed", exc_info=future.exception())
 
-        self.s3.put_object(
-            Body=envelope.message.content.decode("utf-8"),
-            Bucket=self.bucket_name,
-            Key=envelope.message.key + "." + extension,
-        )
-        url = self.s3.generate_presigned_url(
-            ClientMethod="get_object",
-            Params={
-                "Bucket": self.bucket_name,
-                "Key": envelope.message.key + "." + extension,
-            },
-            ExpiresIn=604800,
-        )
-        msg = FileStorageMessage(
-            performative=FileStorageMessage.Performative.FILE_DOWNLOAD,
-            content=envelope.message.content,
-            access_url=url,
-        )
-        msg.sender = envelope.to
-        msg.to = envelope.sender
-        file_download_envolope = Envelope(to=msg.to, sender=msg.sender, message=msg)
-        self.put_envelope(file_download_envolope)
+    def _upload(self, envelope: Envelope, queued_at: float) -> None:
+        QUEUE_WAIT_SECONDS.observe(time.perf_counter() - queued_at)
+        reply = self.client.handle(envelope)
+        if reply is not None:
+            self.put_envelope(reply)
 
     def on_connect(self) -> None:
         """
@@ -140,19 +166,15 @@ class StorjSyncConnection(BaseSyncConnection):
 
         Connection status set automatically.
         """
-        self.s3 = boto3.client(
-            "s3",
-            aws_access_key_id=self.storj_creds["aws_access_key_id"],
-            aws_secret_access_key=self.storj_creds["aws_secret_access_key"],
-            endpoint_url=self.storj_creds["endpoint_url"],
+        self.client = StorjClient(
+            self.configuration.config, self.upload_workers, self.logger
         )
-
-        self.bucket_name = "bucketto"
-        try:
-            self.logger.info(f"creating bucket {self.bucket_name}...")
-            self.s3.create_bucket(Bucket="bucketto")
-        except self.s3.exceptions.BucketAlreadyExists:
-            self.logger.info("bucket already exists")
+        self._upload_pool = ThreadPoolExecutor(
+            max_workers=self.upload_workers, thread_name_prefix="upload"
+        )
+        self.client.connect()
+        self._metrics = MetricsExporter(self.configuration.config.get("metrics"))
+        self._metrics.start()
 
     def on_disconnect(self) -> None:
         """
@@ -160,4 +182,112 @@ class StorjSyncConnection(BaseSyncConnection):
 
         Connection status set automatically.
         """
-        pass
+        self._upload_pool.shutdown(wait=True)
+        self.client.close()
+        self._metrics.stop()
+
+
+class StorjAsyncConnection(Connection):
+    """
+    Asyncio connection to the Storj S3 gateway.
+
+    Same upload and reply semantics as `StorjSyncConnection`, but
+    envelopes are handled as tasks on the agent loop, the blocking boto3
+    calls being offloaded to a pool of `upload_workers` threads. Select it by
+    setting `class_name: StorjAsyncConnection` in `connection.yaml`.
+    """
+
+    MAX_WORKER_THREADS = 64
+
+    connection_id = CONNECTION_ID
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # pragma: no cover
+        """
+        Initialize the connection.
+
+        :param args: arguments passed to component base
+        :param kwargs: keyword arguments passed to component base
+        """
+        super().__init__(*args, **kwargs)
+        self.upload_workers = self.configuration.config.get(
+            "upload_workers", self.MAX_WORKER_THREADS
+        )
+        self.upload_queue_size = self.configuration.config.get("upload_queue_size", 0)
+        self._tasks = set()  # type: Set[asyncio.Task]
+
+    async def connect(self) -> None:
+        """Connect to the gateway."""
+        if self.is_connected:
+            return
+        with self._connect_context():
+            self._incoming_messages_queue = asyncio.Queue()
+            self._upload_slots = asyncio.BoundedSemaphore(
+                self.upload_workers + self.upload_queue_size
+            )
+            self._executor_pool = ThreadPoolExecutor(
+                max_workers=self.upload_workers, thread_name_prefix="upload"
+            )
+            self.client = StorjClient(
+                self.configuration.config, self.upload_workers, self.logger
+            )
+            await self.loop.run_in_executor(self._executor_pool, self.client.connect)
+            self._metrics = MetricsExporter(self.configuration.config.get("metrics"))
+            self._metrics.start()
+
+    async def disconnect(self) -> None:
+        """Wait for the uploads in flight and disconnect."""
+        if self.is_disconnected:
+            return
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+        self._executor_pool.shutdown(wait=False)
+        self.client.close()
+        self._metrics.stop()
+        self._incoming_messages_queue.put_nowait(None)
+        self.state = ConnectionStates.disconnected
+
+    async def send(self, envelope: Envelope) -> None:
+        """
+        Send an envelope.
+
+        Waits while `upload_workers + upload_queue_size` uploads are already
+        queued or in flight.
+
+        :param envelope: the envelope to send.
+        """
+        self._ensure_connected()
+        if envelope.message.performative not in StorjClient.SUPPORTED_PERFORMATIVES:
+            self.logger.error(
+                f"Unsupported performative! {envelope.message.performative}"
+            )
+            raise NotImplementedError
+        self.logger.info(f"Envelope got! {envelope}")
+        queued_at = time.perf_counter()
+        await self._upload_slots.acquire()
+        task = self.loop.create_task(self._upload(envelope, queued_at))
+        task.add_done_callback(self._upload_done)
+        self._tasks.add(task)
+
+    async def _upload(self, envelope: Envelope, queued_at: float) -> None:
+        reply = await self.loop.run_in_executor(
+            self._executor_pool, self._handle, envelope, queued_at
+        )
+        if reply is not None:
+            self._incoming_messages_queue.put_nowait(reply)
+
+    def _upload_done(self, task: asyncio.Task) -> None:
+        """Release the slot of a finished upload and log its failure, if any."""
+        self._tasks.discard(task)
+        self._upload_slots.release()
+        if not task.cancelled() and task.exception() is not None:
+            FAILURES.inc(stage="upload")
+            self.logger.error("upload failed", exc_info=task.exception())
+
+    def _handle(self, envelope: Envelope, queued_at: float) -> Optional[Envelope]:
+        QUEUE_WAIT_SECONDS.observe(time.perf_counter() - queued_at)
+        return self.client.handle(envelope)
+
+    async def receive(self, *args: Any, **kwargs: Any) -> Optional[Envelope]:
+        """Get the reply of a finished upload."""
+        self._ensure_connected()
+        return await self._incoming_messages_queue.get()
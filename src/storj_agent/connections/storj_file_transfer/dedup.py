@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Remote deduplication of content addressed objects."""
+import logging
+import os
+import threading
+import time
+from typing import IO, Any, Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+DEFAULT_DEDUP_CONFIG = {
+    "enabled": True,
+    "index_path": None,
+    "negative_ttl": 300,
+}
+
+FINGERPRINT_METADATA = "fingerprint"
+
+
+class RemoteIndex:
+    """
+    Find out whether an object is already stored before uploading it.
+
+    Object keys are derived from the fingerprint of the file content, so an
+    object found under the key of an upload with the same size and either
+    the same fingerprint metadata or an ETag equal to the fingerprint holds
+    the same bytes and the upload can be skipped.
+
+    Lookups go through a local cache first. Objects known to be stored are
+    kept in an append-only log at `index_path`, one `key size etag` line
+    each, so they are never checked again across restarts. Objects found
+    missing are remembered for `negative_ttl` seconds only, as another agent
+    sharing the bucket may upload them in the meantime. Anything else costs
+    a single HEAD request.
+    """
+
+    def __init__(
+        self,
+        s3: Any,
+        bucket: str,
+        config: Optional[Dict[str, Any]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Initialize the index.
+
+        :param s3: the boto3 s3 client.
+        :param bucket: the bucket name.
+        :param config: overrides of the `DEFAULT_DEDUP_CONFIG` values.
+        :param logger: the logger.
+        """
+        config = {**DEFAULT_DEDUP_CONFIG, **(config or {})}
+        self.s3 = s3
+        self.bucket = bucket
+        self.enabled = bool(config["enabled"])
+        self.negative_ttl = float(config["negative_ttl"])
+        self.logger = logger or logging.getLogger(__name__)
+        self._path = config["index_path"]
+        self._stored = {}  # type: Dict[str, Tuple[int, str]]
+        self._missing = {}  # type: Dict[str, float]
+        self._log = None  # type: Optional[IO[str]]
+        self._lock = threading.Lock()
+        if self._path is not None and os.path.exists(self._path):
+            with open(self._path, "r") as log:
+                for line in log:
+                    fields = line.split()
+                    if len(fields) == 3:
+                        self._stored[fields[0]] = (int(fields[1]), fields[2])
+
+    def __len__(self) -> int:
+        """Get the number of objects known to be stored."""
+        return len(self._stored)
+
+    def find(self, key: str, size: int, fingerprint: str) -> Optional[str]:
+        """
+        Get the ETag of the stored copy of an object, if any.
+
+        :param key: the object key.
+        :param size: the size of the object in bytes.
+        :param fingerprint: the fingerprint of the object content.
+        :return: the ETag of the stored object, or None if it must be uploaded.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            stored = self._stored.get(key)
+            if stored is not None and stored[0] == size:
+                return stored[1]
+            checked_at = self._missing.get(key)
+            if (
+                checked_at is not None
+                and time.monotonic() - checked_at < self.negative_ttl
+            ):
+                return None
+        etag = self._head(key, size, fingerprint)
+        if etag is None:
+            with self._lock:
+                self._missing[key] = time.monotonic()
+            return None
+        self.add(key, size, etag)
+        return etag
+
+    def add(self, key: str, size: int, etag: str) -> None:
+        """
+        Record an object as stored.
+
+        :param key: the object key.
+        :param size: the size of the object in bytes.
+        :param etag: the ETag of the object.
+        """
+        if not self.enabled:
+            return
+        etag = etag.strip('"')
+        with self._lock:
+            self._missing.pop(key, None)
+            if self._stored.get(key) == (size, etag):
+                return
+            self._stored[key] = (size, etag)
+            if self._path is None:
+                return
+            if self._log is None:
+                self._log = open(self._path, "a")
+            self._log.write(f"{key} {size} {etag}\n")
+            self._log.flush()
+
+    def _head(self, key: str, size: int, fingerprint: str) -> Optional[str]:
+        """Check the gateway for a copy of the object with the same content."""
+        try:
+            response = self.s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in (
+                "404",
+                "NoSuchKey",
+                "NotFound",
+            ):
+                return None
+            raise
+        etag = response["ETag"].strip('"')
+        same_content = (
+            response.get("Metadata", {}).get(FINGERPRINT_METADATA) == fingerprint
+            or etag == fingerprint
+        )
+        if response["ContentLength"] != size or not same_content:
+            self.logger.warning(f"{key} is stored with a different content")
+            return None
+        return etag
+
+    def close(self) -> None:
+        """Close the index log."""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
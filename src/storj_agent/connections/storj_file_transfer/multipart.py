@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Multipart upload engine for the S3 compatible gateway."""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from botocore.exceptions import BotoCoreError, ClientError
+from packages.eightballer.protocols.file_storage.metrics import RETRIES
+
+MIB = 1024 * 1024
+MIN_PART_SIZE = 5 * MIB
+MAX_PARTS = 10000
+
+DEFAULT_MULTIPART_CONFIG = {
+    "threshold": 64 * MIB,
+    "part_size": 16 * MIB,
+    "concurrency": 4,
+    "retries": 3,
+    "retry_backoff": 0.5,
+}
+
+PartReader = Callable[[int, int], bytes]
+
+
+class MultipartUploader:
+    """Upload large objects as parts, in parallel, retrying failed parts."""
+
+    def __init__(
+        self,
+        s3: Any,
+        config: Optional[Dict[str, Any]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Initialize the uploader.
+
+        :param s3: the boto3 s3 client.
+        :param config: overrides of the `DEFAULT_MULTIPART_CONFIG` values.
+        :param logger: the logger.
+        """
+        config = {**DEFAULT_MULTIPART_CONFIG, **(config or {})}
+        self.s3 = s3
+        self.threshold = int(config["threshold"])
+        self.part_size = max(int(config["part_size"]), MIN_PART_SIZE)
+        self.concurrency = int(config["concurrency"])
+        self.retries = int(config["retries"])
+        self.retry_backoff = float(config["retry_backoff"])
+        self.logger = logger or logging.getLogger(__name__)
+
+    def should_use(self, size: int) -> bool:
+        """Check whether an object of the given size goes through multipart."""
+        return size >= self.threshold
+
+    def part_size_for(self, size: int) -> int:
+        """Get the part size for an object, growing it to stay within MAX_PARTS."""
+        part_size = self.part_size
+        while part_size * MAX_PARTS < size:
+            part_size *= 2
+        return part_size
+
+    def upload(
+        self,
+        bucket: str,
+        key: str,
+        size: int,
+        read_part: PartReader,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Upload an object in parts.
+
+        The upload is aborted if any part still fails after its retries, so
+        no orphan parts are left behind on the gateway.
+
+        :param bucket: the bucket name.
+        :param key: the object key.
+        :param size: the size of the object in bytes.
+        :param read_part: callable returning the bytes of (offset, length).
+        :param metadata: the user metadata of the object.
+        :return: the ETag of the completed object.
+        """
+        part_size = self.part_size_for(size)
+        upload_id = self.begin(bucket, key, metadata)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="part"
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        self.upload_part,
+                        bucket,
+                        key,
+                        upload_id,
+                        part_number,
+                        offset,
+                        min(part_size, size - offset),
+                        read_part,
+                    )
+                    for part_number, offset in enumerate(
+                        range(0, size, part_size), start=1
+                    )
+                ]
+                parts = [future.result() for future in futures]
+            return self.complete(bucket, key, upload_id, parts)
+        except Exception:
+            self.abort(bucket, key, upload_id)
+            raise
+
+    def begin(
+        self, bucket: str, key: str, metadata: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Start a multipart upload.
+
+        :param bucket: the bucket name.
+        :param key: the object key.
+        :param metadata: the user metadata of the object.
+        :return: the upload id.
+        """
+        return self.s3.create_multipart_upload(
+            Bucket=bucket, Key=key, Metadata=metadata or {}
+        )["UploadId"]
+
+    def complete(
+        self, bucket: str, key: str, upload_id: str, parts: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Complete a multipart upload.
+
+        :param bucket: the bucket name.
+        :param key: the object key.
+        :param upload_id: the upload id.
+        :param parts: the ETag and PartNumber of each part, in order.
+        :return: the ETag of the completed object.
+        """
+        return self.s3.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )["ETag"]
+
+    def abort(self, bucket: str, key: str, upload_id: str) -> None:
+        """Abort a multipart upload, so no orphan parts are left behind."""
+        self.logger.error(f"multipart upload of {key} failed, aborting")
+        self.s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+
+    def upload_part(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        offset: int,
+        length: int,
+        read_part: PartReader,
+    ) -> Dict[str, Any]:
+        """Upload a single part, retrying with exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                response = self.s3.upload_part(
+                    Body=read_part(offset, length),
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                )
+                return {"ETag": response["ETag"], "PartNumber": part_number}
+            except (BotoCoreError, ClientError) as e:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                RETRIES.inc(kind="part")
+                self.logger.warning(
+                    f"part {part_number} of {key} failed ({e}), retry {attempt}/{self.retries}"
+                )
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
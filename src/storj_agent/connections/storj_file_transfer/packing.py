@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Packing of small files into archive objects."""
+import hashlib
+import io
+import json
+import os
+import tarfile
+import threading
+from typing import IO, Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_PACKING_CONFIG = {
+    "enabled": False,
+    "index_path": None,
+}
+
+PACK_PREFIX = "packs/"
+
+
+class PackedFile(NamedTuple):
+    """The location of a file in a pack."""
+
+    pack_key: str
+    offset: int
+    length: int
+
+    @property
+    def byte_range(self) -> str:
+        """Get the HTTP Range header value which selects the file in its pack."""
+        return f"bytes={self.offset}-{self.offset + self.length - 1}"
+
+
+def build_pack(files: List[Tuple[str, bytes]]) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Pack files into an uncompressed tar archive.
+
+    The content of each file is stored contiguously in the archive, so a file
+    can be read back with a single ranged GET without unpacking anything.
+
+    :param files: the (name, content) of each file.
+    :return: the archive and the (offset, length) of each file in it.
+    """
+    buffer = io.BytesIO()
+    ranges = []
+    with tarfile.open(fileobj=buffer, mode="w", format=tarfile.PAX_FORMAT) as tar:
+        for name, content in files:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+            blocks, remainder = divmod(len(content), tarfile.BLOCKSIZE)
+            padded = (blocks + (remainder > 0)) * tarfile.BLOCKSIZE
+            ranges.append((tar.offset - padded, len(content)))
+    return buffer.getvalue(), ranges
+
+
+def pack_key(names: List[str]) -> str:
+    """Get the object key of the pack of the named files."""
+    digest = hashlib.md5("\n".join(names).encode("utf-8")).hexdigest()
+    return f"{PACK_PREFIX}{digest}.tar"
+
+
+class PackIndex:
+    """
+    Map object keys of packed files to their location in a pack.
+
+    The index is backed by an append-only log at `path`, one JSON object per
+    packed file, so the packed files are found again after a restart.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initialize the index.
+
+        :param path: the log file, the index is kept in memory only if None.
+        """
+        self._path = path
+        self._files = {}  # type: Dict[str, PackedFile]
+        self._log = None  # type: Optional[IO[str]]
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        """Replay the log, rewriting it if a line was cut short by a crash."""
+        torn = False
+        with open(self._path, "r") as log:
+            for line in log:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the file is packed again, and the log rewritten so no
+                    # line gets appended to this one
+                    torn = True
+                    continue
+                torn = torn or not line.endswith("\n")
+                self._files[entry["key"]] = PackedFile(
+                    entry["pack"], entry["offset"], entry["length"]
+                )
+        if torn:
+            tmp_path = self._path + ".tmp"
+            with open(tmp_path, "w") as log:
+                log.writelines(
+                    self._dumps(key, packed) for key, packed in self._files.items()
+                )
+            os.replace(tmp_path, self._path)
+
+    def __len__(self) -> int:
+        """Get the number of packed files."""
+        return len(self._files)
+
+    def get(self, key: str) -> Optional[PackedFile]:
+        """Get the location of a packed file, if it was packed."""
+        return self._files.get(key)
+
+    def add(self, key: str, packed: PackedFile) -> None:
+        """
+        Record the location of a packed file.
+
+        :param key: the object key of the file.
+        :param packed: its location.
+        """
+        with self._lock:
+            self._files[key] = packed
+            if self._path is None:
+                return
+            if self._log is None:
+                self._log = open(self._path, "a")
+            self._log.write(self._dumps(key, packed))
+            self._log.flush()
+
+    @staticmethod
+    def _dumps(key: str, packed: PackedFile) -> str:
+        """Get the log line of a packed file."""
+        entry = {
+            "key": key,
+            "pack": packed.pack_key,
+            "offset": packed.offset,
+            "length": packed.length,
+        }
+        return json.dumps(entry) + "\n"
+
+    def close(self) -> None:
+        """Close the index log."""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Cache of the presigned access urls of the uploaded objects."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+PRESIGN_EXPIRY = 604800
+
+DEFAULT_PRESIGN_CONFIG = {
+    "expiry": PRESIGN_EXPIRY,
+    "refresh_margin": 86400,
+    "max_entries": 100000,
+}
+
+
+class PresignCache:
+    """
+    Presigned get urls cached per object key.
+
+    A url is signed when its object is uploaded or first asked for, and handed
+    out again until it comes within `refresh_margin` seconds of its expiry, at which
+    point it is signed anew. Signing is local to the client, so lookups never
+    go to the network. At most `max_entries` keys are kept, least recently
+    used first out.
+    """
+
+    def __init__(
+        self, s3: Any, bucket: str, config: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Initialize the cache.
+
+        :param s3: the boto3 s3 client.
+        :param bucket: the bucket name.
+        :param config: overrides of the `DEFAULT_PRESIGN_CONFIG` values.
+        """
+        config = {**DEFAULT_PRESIGN_CONFIG, **(config or {})}
+        self.s3 = s3
+        self.bucket = bucket
+        self.expiry = int(config["expiry"])
+        self.refresh_margin = min(float(config["refresh_margin"]), self.expiry / 2)
+        self.max_entries = int(config["max_entries"])
+        self._urls = OrderedDict()  # type: OrderedDict[str, Tuple[str, float]]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of cached urls."""
+        return len(self._urls)
+
+    def url(self, key: str, now: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Get a valid presigned url of an object.
+
+        :param key: the object key.
+        :param now: the lookup time, the current time if None.
+        :return: the url and the time it expires at.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            cached = self._urls.get(key)
+            if cached is not None and cached[1] - self.refresh_margin > now:
+                self._urls.move_to_end(key)
+                return cached
+        return self.sign(key, now)
+
+    def sign(self, key: str, now: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Sign a new url of an object and cache it.
+
+        :param key: the object key.
+        :param now: the signing time, the current time if None.
+        :return: the url and the time it expires at.
+        """
+        now = time.time() if now is None else now
+        url = self.s3.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.expiry,
+        )
+        signed = (url, now + self.expiry)
+        with self._lock:
+            self._urls[key] = signed
+            self._urls.move_to_end(key)
+            while len(self._urls) > self.max_entries:
+                self._urls.popitem(last=False)
+        return signed
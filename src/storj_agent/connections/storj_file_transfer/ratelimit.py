@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Token bucket limits of the bandwidth and request rate to the gateway."""
+import io
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from packages.eightballer.protocols.file_storage.metrics import \
+    THROTTLED_SECONDS
+
+DEFAULT_RATE_LIMIT_CONFIG = {
+    "bytes_per_second": 0,
+    "requests_per_second": 0,
+    "burst": 1.0,
+    "control_path": None,
+    "control_interval": 5,
+}
+
+# the bytes bucket holds at least a few of the blocks http.client sends at once
+MIN_BURST_BYTES = 64 * 1024
+
+
+class TokenBucket:
+    """
+    Tokens refilled at `rate` per second, up to `capacity`.
+
+    Takers reserve their tokens before waiting for them, the bucket going
+    into debt, so concurrent takers are served in turn and a take larger
+    than the capacity is still granted.
+    """
+
+    def __init__(self, rate: float = 0, capacity: float = 0) -> None:
+        """
+        Initialize the bucket, full.
+
+        :param rate: the tokens added per second, unlimited if 0.
+        :param capacity: the most tokens held, `rate` if 0.
+        """
+        self._lock = threading.Lock()
+        self._rate = 0.0
+        self._capacity = 0.0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.configure(rate, capacity)
+
+    @property
+    def rate(self) -> float:
+        """Get the tokens added per second, 0 if unlimited."""
+        return self._rate
+
+    def configure(self, rate: float, capacity: float = 0) -> None:
+        """
+        Change the rate and capacity, the tokens held being kept.
+
+        :param rate: the tokens added per second, unlimited if 0.
+        :param capacity: the most tokens held, `rate` if 0.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            was_limited = bool(self._rate)
+            self._rate = float(rate)
+            self._capacity = float(capacity or rate)
+            if not was_limited:
+                self._tokens = self._capacity
+            else:
+                self._tokens = min(self._tokens, self._capacity)
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens of the time elapsed since the last refill."""
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def take(self, amount: float) -> float:
+        """
+        Take tokens, waiting until they are available.
+
+        :param amount: the number of tokens.
+        :return: the seconds waited.
+        """
+        with self._lock:
+            if not self._rate:
+                return 0.0
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class _ThrottledBody(io.RawIOBase):
+    """A request body whose reads take tokens from the bytes bucket."""
+
+    def __init__(self, body: Any, limiter: "RateLimiter") -> None:
+        super().__init__()
+        self._body = body
+        self._limiter = limiter
+
+    def readable(self) -> bool:
+        """Check whether the body can be read, it can."""
+        return True
+
+    def read(self, size: int = -1) -> bytes:  # type: ignore
+        """Read at most `size` bytes, or up to the end if negative, once allowed."""
+        data = self._body.read(-1 if size is None else size)
+        self._limiter.take_bytes(len(data))
+        return data
+
+    def readinto(self, buffer: Any) -> int:
+        """Read into a buffer, once allowed."""
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def seekable(self) -> bool:
+        """Check whether the body can be rewound for a retry."""
+        return getattr(self._body, "seekable", lambda: False)()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move in the body, as botocore does to send it again."""
+        return self._body.seek(offset, whence)
+
+    def tell(self) -> int:
+        """Get the position in the body."""
+        return self._body.tell()
+
+
+class RateLimiter:
+    """
+    Limit the bytes and requests per second sent to the gateway.
+
+    The limiter is registered as a `before-send` handler of the s3 client, so
+    every request, retries and the parts of multipart uploads included, first
+    takes a token from the requests bucket, and its body is read through the
+    bytes bucket as it is sent. Uploads are spread over time that way, rather
+    than sent in bursts at the speed of the link. The buckets hold `burst`
+    seconds worth of tokens.
+
+    The limits can be changed at runtime with `configure`, or by writing them
+    as JSON, such as `{"bytes_per_second": 1048576}`, to `control_path`: the
+    file is checked for changes every `control_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        :param config: overrides of the `DEFAULT_RATE_LIMIT_CONFIG` values.
+        :param logger: the logger.
+        """
+        config = {**DEFAULT_RATE_LIMIT_CONFIG, **(config or {})}
+        self.burst = float(config["burst"])
+        self.control_path = config["control_path"]
+        self.control_interval = float(config["control_interval"])
+        self.logger = logger or logging.getLogger(__name__)
+        self._bytes = TokenBucket()
+        self._requests = TokenBucket()
+        self._control_lock = threading.Lock()
+        self._control_mtime = None  # type: Optional[float]
+        self._next_control_check = 0.0
+        self.configure(config["bytes_per_second"], config["requests_per_second"])
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Get the bytes per second limit, 0 if unlimited."""
+        return self._bytes.rate
+
+    @property
+    def requests_per_second(self) -> float:
+        """Get the requests per second limit, 0 if unlimited."""
+        return self._requests.rate
+
+    def configure(
+        self,
+        bytes_per_second: Optional[float] = None,
+        requests_per_second: Optional[float] = None,
+    ) -> None:
+        """
+        Change the limits, 0 removing a limit and None keeping it as is.
+
+        :param bytes_per_second: the bytes per second.
+        :param requests_per_second: the requests per second.
+        """
+        if bytes_per_second is not None:
+            self._bytes.configure(
+                bytes_per_second, max(bytes_per_second * self.burst, MIN_BURST_BYTES)
+            )
+        if requests_per_second is not None:
+            self._requests.configure(
+                requests_per_second, max(requests_per_second * self.burst, 1)
+            )
+
+    def take_bytes(self, amount: int) -> None:
+        """Wait until `amount` bytes may be sent."""
+        waited = self._bytes.take(amount)
+        if waited:
+            THROTTLED_SECONDS.inc(waited, kind="bytes")
+
+    def throttle(self, request: Any, **kwargs: Any) -> None:
+        """
+        Hold a request back until the limits allow it, `before-send` handler.
+
+        :param request: the prepared request about to be sent.
+        :param kwargs: the other arguments of the event.
+        """
+        self._check_control()
+        waited = self._requests.take(1)
+        if waited:
+            THROTTLED_SECONDS.inc(waited, kind="requests")
+        body = request.body
+        if not self._bytes.rate or not body:
+            return
+        if isinstance(body, (bytes, bytearray)):
+            body = io.BytesIO(body)
+        elif not hasattr(body, "read"):
+            return
+        request.body = _ThrottledBody(body, self)
+
+    def _check_control(self) -> None:
+        """Apply the limits of the control file, if it changed since the last check."""
+        if self.control_path is None or time.monotonic() < self._next_control_check:
+            return
+        with self._control_lock:
+            now = time.monotonic()
+            if now < self._next_control_check:
+                return
+            self._next_control_check = now + self.control_interval
+            try:
+                mtime = os.stat(self.control_path).st_mtime
+                if mtime == self._control_mtime:
+                    return
+                self._control_mtime = mtime
+                with open(self.control_path, "r") as control_file:
+                    limits = json.load(control_file)
+                self.configure(
+                    limits.get("bytes_per_second"), limits.get("requests_per_second")
+                )
+            except FileNotFoundError:
+                return
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                self.logger.warning(f"Could not apply {self.control_path}: {e}")
+                return
+            self.logger.info(
+                f"rate limits set to {self.bytes_per_second} bytes/s, "
+                f"{self.requests_per_second} requests/s"
+            )
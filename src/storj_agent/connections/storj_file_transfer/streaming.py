@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Reassembly of the files streamed to the connection in chunks."""
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, cast
+
+from packages.eightballer.connections.storj_file_transfer.dedup import (
+    FINGERPRINT_METADATA, RemoteIndex)
+from packages.eightballer.connections.storj_file_transfer.multipart import \
+    MultipartUploader
+from packages.eightballer.protocols.file_storage.metrics import (
+    STAGE_SECONDS, UPLOADED_BYTES, UPLOADS)
+
+DEFAULT_IDLE_TIMEOUT = 600
+
+
+class StreamedObject(NamedTuple):
+    """An object whose stream is complete and stored."""
+
+    key: str
+    size: int
+    etag: str
+    timings: Dict[str, float]
+
+
+class UploadSession:
+    """The state of the stream of one file."""
+
+    def __init__(self, key: str) -> None:
+        """
+        Initialize the session.
+
+        :param key: the key of the stream, as sent by the skill.
+        """
+        self.key = key
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.last_seen = time.monotonic()
+        self.object_key = None  # type: Optional[str]
+        self.size = None  # type: Optional[int]
+        self.fingerprint = ""
+        self.chunk_count = None  # type: Optional[int]
+        self.chunks_received = 0
+        self.pending = {}  # type: Dict[int, bytes]
+        self.received = 0
+        self.buffer = bytearray()
+        self.part_size = 0
+        self.next_part = 1
+        self.parts = {}  # type: Dict[int, str]
+        self.parts_in_flight = 0
+        self.upload_id = None  # type: Optional[str]
+        self.stored_etag = None  # type: Optional[str]
+        self.done = False
+        self.aborted = False
+
+    @property
+    def begun(self) -> bool:
+        """Check whether the UPLOAD_BEGIN of the stream was handled."""
+        return self.size is not None
+
+    @property
+    def complete(self) -> bool:
+        """Check whether every byte of the stream was received and sent on."""
+        return (
+            self.begun
+            and self.chunk_count is not None
+            and self.chunks_received >= self.chunk_count
+            and self.received >= self.size
+            and self.parts_in_flight == 0
+        )
+
+
+class StreamingUploads:
+    """
+    Upload the files streamed as UPLOAD_BEGIN, UPLOAD_CHUNK and UPLOAD_COMMIT.
+
+    Envelopes are handled concurrently, so the messages of a stream may come
+    in any order. Chunks are queued by offset until the chunks before them
+    arrive, then appended to a buffer which is sent as a multipart part each
+    time it reaches the part size. Memory per stream is therefore bounded by
+    one part plus the chunks received out of order. Objects smaller than the
+    multipart threshold are buffered whole and sent in a single put.
+
+    The stream completes on whichever message brings its last missing piece,
+    only that message gets a reply.
+
+    A stream is aborted, along with its multipart upload, as soon as one of
+    its messages fails, and the later messages of a finished or aborted
+    stream are dropped until it begins again. Streams which received no
+    message for `idle_timeout` seconds, such as those whose UPLOAD_BEGIN
+    never came, are aborted too.
+    """
+
+    def __init__(
+        self,
+        s3: Any,
+        bucket: str,
+        multipart: MultipartUploader,
+        remote_index: RemoteIndex,
+        logger: Optional[logging.Logger] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        """
+        Initialize the streams.
+
+        :param s3: the boto3 s3 client.
+        :param bucket: the bucket name.
+        :param multipart: the multipart uploader.
+        :param remote_index: the index of the objects already stored.
+        :param logger: the logger.
+        :param idle_timeout: the seconds without message after which a stream is aborted.
+        """
+        self.s3 = s3
+        self.bucket = bucket
+        self.multipart = multipart
+        self.remote_index = remote_index
+        self.logger = logger or logging.getLogger(__name__)
+        self.idle_timeout = idle_timeout
+        self._sessions = {}  # type: Dict[str, UploadSession]
+        self._closed = {}  # type: Dict[str, float]
+        self._next_sweep = time.monotonic() + idle_timeout
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of streams in progress."""
+        return len(self._sessions)
+
+    def _session(self, key: str, begin: bool = False) -> Optional[UploadSession]:
+        """
+        Get the session of a stream, starting it if needed.
+
+        :param key: the key of the stream.
+        :param begin: whether the message is the UPLOAD_BEGIN, which starts the stream again if it was closed.
+        :return: the session, or None if the stream was closed.
+        """
+        self._sweep()
+        with self._lock:
+            if begin:
+                self._closed.pop(key, None)
+            elif key in self._closed:
+                return None
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = UploadSession(key)
+            session.last_seen = time.monotonic()
+            return session
+
+    def _sweep(self) -> None:
+        """Abort the streams idle for `idle_timeout` seconds, at most once in that time."""
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self.idle_timeout
+            deadline = now - self.idle_timeout
+            self._closed = {
+                key: closed_at
+                for key, closed_at in self._closed.items()
+                if closed_at > deadline
+            }
+            idle = [
+                session
+                for session in self._sessions.values()
+                if session.last_seen <= deadline and not session.parts_in_flight
+            ]
+        for session in idle:
+            self.logger.warning(f"Stream {session.key} is idle, aborting it.")
+            self._abort(session)
+
+    def begin(
+        self, key: str, object_key: str, size: int, fingerprint: str
+    ) -> Optional[StreamedObject]:
+        """
+        Handle the UPLOAD_BEGIN of a stream.
+
+        :param key: the key of the stream.
+        :param object_key: the key the object is stored under.
+        :param size: the size of the file in bytes.
+        :param fingerprint: the fingerprint of the file content.
+        :return: the stored object if the stream is complete, None otherwise.
+        """
+        session = cast(UploadSession, self._session(key, begin=True))
+        try:
+            stored_etag = self.remote_index.find(object_key, size, fingerprint)
+            upload_id = None
+            if stored_etag is None and self.multipart.should_use(size):
+                upload_id = self.multipart.begin(
+                    self.bucket, object_key, {FINGERPRINT_METADATA: fingerprint}
+                )
+            with session.lock:
+                session.object_key = object_key
+                session.upload_id = upload_id
+                session.fingerprint = fingerprint
+                session.stored_etag = stored_etag
+                session.part_size = self.multipart.part_size_for(size)
+                session.size = size
+                parts = self._advance(session)
+        except Exception:
+            self._abort(session)
+            raise
+        self._upload_parts(session, parts)
+        return self._finish(session)
+
+    def chunk(
+        self, key: str, offset: int, content: bytes, chunk_fingerprint: str
+    ) -> Optional[StreamedObject]:
+        """
+        Handle an UPLOAD_CHUNK of a stream.
+
+        :param key: the key of the stream.
+        :param offset: the offset of the chunk in the file.
+        :param content: the bytes of the chunk.
+        :param chunk_fingerprint: the md5 hex digest of the chunk, not checked if empty.
+        :return: the stored object if the stream is complete, None otherwise.
+        """
+        session = self._session(key)
+        if session is None:
+            self.logger.warning(f"Chunk at {offset} of closed stream {key}, dropped.")
+            return None
+        try:
+            if chunk_fingerprint and (
+                hashlib.md5(content).hexdigest() != chunk_fingerprint
+            ):
+                raise ValueError(
+                    f"Chunk at {offset} of {key} does not match its fingerprint."
+                )
+            with session.lock:
+                if session.done:
+                    return None
+                if offset < session.received or offset in session.pending:
+                    self.logger.warning(
+                        f"Duplicate chunk at {offset} of {key}, ignored."
+                    )
+                    return None
+                session.pending[offset] = content
+                session.chunks_received += 1
+                parts = self._advance(session)
+        except Exception:
+            self._abort(session)
+            raise
+        self._upload_parts(session, parts)
+        return self._finish(session)
+
+    def commit(self, key: str, chunk_count: int) -> Optional[StreamedObject]:
+        """
+        Handle the UPLOAD_COMMIT of a stream.
+
+        :param key: the key of the stream.
+        :param chunk_count: the number of chunks the file was sent in.
+        :return: the stored object if the stream is complete, None otherwise.
+        """
+        session = self._session(key)
+        if session is None:
+            self.logger.warning(f"Commit of closed stream {key}, dropped.")
+            return None
+        with session.lock:
+            session.chunk_count = chunk_count
+        return self._finish(session)
+
+    def _advance(self, session: UploadSession) -> List[Tuple[int, bytes]]:
+        """
+        Consume the chunks following the received bytes.
+
+        Must be called with the session lock held.
+
+        :param session: the session.
+        :return: the (part number, bytes) of the parts ready to be sent.
+        """
+        parts = []  # type: List[Tuple[int, bytes]]
+        if not session.begun:
+            return parts
+        while session.received in session.pending:
+            content = session.pending.pop(session.received)
+            session.received += len(content)
+            if session.received > session.size:
+                raise ValueError(f"Stream {session.key} is longer than announced.")
+            if session.stored_etag is not None:
+                continue
+            session.buffer += content
+            while session.upload_id is not None and (
+                len(session.buffer) >= session.part_size
+                or (session.received == session.size and session.buffer)
+            ):
+                part = bytes(session.buffer[: session.part_size])
+                del session.buffer[: session.part_size]
+                parts.append((session.next_part, part))
+                session.next_part += 1
+        session.parts_in_flight += len(parts)
+        return parts
+
+    def _upload_parts(
+        self, session: UploadSession, parts: List[Tuple[int, bytes]]
+    ) -> None:
+        """Send the parts of a multipart stream, aborting it on failure."""
+        for part_number, part in parts:
+            try:
+                response = self.multipart.upload_part(
+                    self.bucket,
+                    session.object_key,
+                    session.upload_id,
+                    part_number,
+                    0,
+                    len(part),
+                    lambda offset, length, part=part: part,
+                )
+            except Exception:
+                self._abort(session)
+                raise
+            with session.lock:
+                session.parts[part_number] = response["ETag"]
+                session.parts_in_flight -= 1
+
+    def close(self) -> None:
+        """Abort the streams in progress."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            self._abort(session)
+
+    def _close(self, session: UploadSession) -> None:
+        """Forget a finished or aborted stream, dropping its later messages."""
+        with self._lock:
+            if self._sessions.get(session.key) is session:
+                del self._sessions[session.key]
+                self._closed[session.key] = time.monotonic()
+
+    def _abort(self, session: UploadSession) -> None:
+        """Drop a failed stream, and abort its multipart upload, if any."""
+        self._close(session)
+        with session.lock:
+            if session.aborted:
+                return
+            session.aborted = session.done = True
+            session.pending.clear()
+            session.buffer.clear()
+            upload_id = session.upload_id
+        if upload_id is None:
+            return
+        try:
+            self.multipart.abort(self.bucket, session.object_key, upload_id)
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.error(f"Could not abort the stream of {session.key}: {e}")
+
+    def _finish(self, session: UploadSession) -> Optional[StreamedObject]:
+        """Store the object of a complete stream, exactly once."""
+        with session.lock:
+            if session.done or not session.complete:
+                return None
+            session.done = True
+        self._close(session)
+        try:
+            if session.stored_etag is not None:
+                etag = session.stored_etag
+            elif session.upload_id is not None:
+                etag = self.multipart.complete(
+                    self.bucket,
+                    session.object_key,
+                    session.upload_id,
+                    [
+                        {"ETag": session.parts[number], "PartNumber": number}
+                        for number in sorted(session.parts)
+                    ],
+                )
+            else:
+                etag = self.s3.put_object(
+                    Body=bytes(session.buffer),
+                    Bucket=self.bucket,
+                    Key=session.object_key,
+                    Metadata={FINGERPRINT_METADATA: session.fingerprint},
+                )["ETag"]
+        except Exception:
+            self._abort(session)
+            raise
+        self.remote_index.add(session.object_key, session.size, etag)
+        duration = time.perf_counter() - session.started
+        STAGE_SECONDS.observe(duration, stage="stream")
+        if session.stored_etag is not None:
+            UPLOADS.inc(result="skipped")
+        else:
+            UPLOADS.inc(result="stored")
+            UPLOADED_BYTES.inc(session.size)
+        return StreamedObject(
+            session.object_key, session.size, etag, {"stream": duration}
+        )
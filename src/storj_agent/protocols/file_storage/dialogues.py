@@ -40,7 +40,11 @@ class FileStorageDialogue(Dialogue):
     INITIAL_PERFORMATIVES = frozenset(
         {
             FileStorageMessage.Performative.FILE_UPLOAD,
+            FileStorageMessage.Performative.FILE_UPLOAD_REF,
+            FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+            FileStorageMessage.Performative.UPLOAD_BEGIN,
             FileStorageMessage.Performative.FILE_DOWNLOAD,
+            FileStorageMessage.Performative.REQUEST_URL,
             FileStorageMessage.Performative.ERROR,
         }
     )
@@ -53,6 +57,9 @@ class FileStorageDialogue(Dialogue):
         FileStorageMessage.Performative.FILE_DOWNLOAD: frozenset(
             {
                 FileStorageMessage.Performative.FILE_UPLOAD,
+                FileStorageMessage.Performative.FILE_UPLOAD_REF,
+                FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+                FileStorageMessage.Performative.UPLOAD_BEGIN,
                 FileStorageMessage.Performative.ERROR,
                 FileStorageMessage.Performative.END,
             }
@@ -60,6 +67,88 @@ class FileStorageDialogue(Dialogue):
         FileStorageMessage.Performative.FILE_UPLOAD: frozenset(
             {
                 FileStorageMessage.Performative.FILE_DOWNLOAD,
+                FileStorageMessage.Performative.UPLOAD_RECEIPT,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.FILE_UPLOAD_BATCH: frozenset(
+            {
+                FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.FILE_UPLOAD_REF: frozenset(
+            {
+                FileStorageMessage.Performative.FILE_DOWNLOAD,
+                FileStorageMessage.Performative.UPLOAD_RECEIPT,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.PRESIGNED_URL: frozenset(
+            {
+                FileStorageMessage.Performative.FILE_UPLOAD,
+                FileStorageMessage.Performative.FILE_UPLOAD_REF,
+                FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+                FileStorageMessage.Performative.UPLOAD_BEGIN,
+                FileStorageMessage.Performative.REQUEST_URL,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.REQUEST_URL: frozenset(
+            {
+                FileStorageMessage.Performative.PRESIGNED_URL,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT: frozenset(
+            {
+                FileStorageMessage.Performative.FILE_UPLOAD,
+                FileStorageMessage.Performative.FILE_UPLOAD_REF,
+                FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+                FileStorageMessage.Performative.UPLOAD_BEGIN,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.UPLOAD_BEGIN: frozenset(
+            {
+                FileStorageMessage.Performative.UPLOAD_CHUNK,
+                FileStorageMessage.Performative.UPLOAD_COMMIT,
+                FileStorageMessage.Performative.FILE_DOWNLOAD,
+                FileStorageMessage.Performative.UPLOAD_RECEIPT,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.UPLOAD_CHUNK: frozenset(
+            {
+                FileStorageMessage.Performative.UPLOAD_CHUNK,
+                FileStorageMessage.Performative.UPLOAD_COMMIT,
+                FileStorageMessage.Performative.FILE_DOWNLOAD,
+                FileStorageMessage.Performative.UPLOAD_RECEIPT,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.UPLOAD_COMMIT: frozenset(
+            {
+                FileStorageMessage.Performative.FILE_DOWNLOAD,
+                FileStorageMessage.Performative.UPLOAD_RECEIPT,
+                FileStorageMessage.Performative.ERROR,
+                FileStorageMessage.Performative.END,
+            }
+        ),
+        FileStorageMessage.Performative.UPLOAD_RECEIPT: frozenset(
+            {
+                FileStorageMessage.Performative.FILE_UPLOAD,
+                FileStorageMessage.Performative.FILE_UPLOAD_REF,
+                FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+                FileStorageMessage.Performative.UPLOAD_BEGIN,
                 FileStorageMessage.Performative.ERROR,
                 FileStorageMessage.Performative.END,
             }
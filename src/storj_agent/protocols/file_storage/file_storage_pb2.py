@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
     syntax="proto3",
     serialized_options=None,
     serialized_pb=_b(
-        '\n\x12\x66ile_storage.proto\x12\x1d\x61\x65\x61.mobix.file_storage.v0_1_0"\xbf\x08\n\x12\x46ileStorageMessage\x12Q\n\x03\x65nd\x18\x05 \x01(\x0b\x32\x42.aea.mobix.file_storage.v0_1_0.FileStorageMessage.End_PerformativeH\x00\x12U\n\x05\x65rror\x18\x06 \x01(\x0b\x32\x44.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Error_PerformativeH\x00\x12\x65\n\rfile_download\x18\x07 \x01(\x0b\x32L.aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Download_PerformativeH\x00\x12\x61\n\x0b\x66ile_upload\x18\x08 \x01(\x0b\x32J.aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_PerformativeH\x00\x1a\xeb\x01\n\tErrorCode\x12]\n\nerror_code\x18\x01 \x01(\x0e\x32I.aea.mobix.file_storage.v0_1_0.FileStorageMessage.ErrorCode.ErrorCodeEnum"\x7f\n\rErrorCodeEnum\x12\x18\n\x14UNSUPPORTED_PROTOCOL\x10\x00\x12\x12\n\x0e\x44\x45\x43ODING_ERROR\x10\x01\x12\x13\n\x0fINVALID_MESSAGE\x10\x02\x12\x15\n\x11UNSUPPORTED_SKILL\x10\x03\x12\x14\n\x10INVALID_DIALOGUE\x10\x04\x1aJ\n\x18\x46ile_Upload_Performative\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x0b\n\x03key\x18\x03 \x01(\t\x1a\x41\n\x1a\x46ile_Download_Performative\x12\x12\n\naccess_url\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\x0c\x1a\x93\x02\n\x12\x45rror_Performative\x12O\n\nerror_code\x18\x01 \x01(\x0b\x32;.aea.mobix.file_storage.v0_1_0.FileStorageMessage.ErrorCode\x12\x11\n\terror_msg\x18\x02 \x01(\t\x12g\n\nerror_data\x18\x03 \x03(\x0b\x32S.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Error_Performative.ErrorDataEntry\x1a\x30\n\x0e\x45rrorDataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c:\x02\x38\x01\x1a\x12\n\x10\x45nd_PerformativeB\x0e\n\x0cperformativeb\x06proto3'
+        '\n\x12\x66ile_storage.proto\x12\x1d\x61\x65\x61.mobix.file_storage.v0_1_0"\xd1\x19\n\x12\x46ileStorageMessage\x12Q\n\x03\x65nd\x18\x05 \x01(\x0b\x32\x42.aea.mobix.file_storage.v0_1_0.FileStorageMessage.End_PerformativeH\x00\x12U\n\x05\x65rror\x18\x06 \x01(\x0b\x32\x44.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Error_PerformativeH\x00\x12\x65\n\rfile_download\x18\x07 \x01(\x0b\x32L.aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Download_PerformativeH\x00\x12\x61\n\x0b\x66ile_upload\x18\x08 \x01(\x0b\x32J.aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_PerformativeH\x00\x12m\n\x11\x66ile_upload_batch\x18\t \x01(\x0b\x32P.aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_PerformativeH\x00\x12i\n\x0f\x66ile_upload_ref\x18\n \x01(\x0b\x32N.aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_PerformativeH\x00\x12\x65\n\rpresigned_url\x18\x0b \x01(\x0b\x32L.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Presigned_Url_PerformativeH\x00\x12\x61\n\x0brequest_url\x18\x0c \x01(\x0b\x32J.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Request_Url_PerformativeH\x00\x12s\n\x14upload_batch_receipt\x18\r \x01(\x0b\x32S.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_PerformativeH\x00\x12\x63\n\x0cupload_begin\x18\x0e \x01(\x0b\x32K.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Begin_PerformativeH\x00\x12\x63\n\x0cupload_chunk\x18\x0f \x01(\x0b\x32K.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Chunk_PerformativeH\x00\x12\x65\n\rupload_commit\x18\x10 \x01(\x0b\x32L.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Commit_PerformativeH\x00\x12g\n\x0eupload_receipt\x18\x11 \x01(\x0b\x32M.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_PerformativeH\x00\x1a\xff\x01\n\tErrorCode\x12]\n\nerror_code\x18\x01 \x01(\x0e\x32I.aea.mobix.file_storage.v0_1_0.FileStorageMessage.ErrorCode.ErrorCodeEnum"\x92\x01\n\rErrorCodeEnum\x12\x18\n\x14UNSUPPORTED_PROTOCOL\x10\x00\x12\x12\n\x0e\x44\x45\x43ODING_ERROR\x10\x01\x12\x13\n\x0fINVALID_MESSAGE\x10\x02\x12\x15\n\x11UNSUPPORTED_SKILL\x10\x03\x12\x14\n\x10INVALID_DIALOGUE\x10\x04\x12\x11\n\rUPLOAD_FAILED\x10\x05\x1a_\n\x18\x46ile_Upload_Performative\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x0b\n\x03key\x18\x03 \x01(\t\x12\x13\n\x0b\x66ingerprint\x18\x04 \x01(\t\x1a\x80\x01\n\x1c\x46ile_Upload_Ref_Performative\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x0b\n\x03key\x18\x02 \x01(\t\x12\x0c\n\x04path\x18\x03 \x01(\t\x12\x0e\n\x06offset\x18\x04 \x01(\x03\x12\x0e\n\x06length\x18\x05 \x01(\x03\x12\x13\n\x0b\x66ingerprint\x18\x06 \x01(\t\x1ax\n\x1e\x46ile_Upload_Batch_Performative\x12\x0c\n\x04keys\x18\x01 \x03(\t\x12\x11\n\tfilenames\x18\x02 \x03(\t\x12\x10\n\x08\x63ontents\x18\x03 \x03(\x0c\x12\r\n\x05paths\x18\x04 \x03(\t\x12\x14\n\x0c\x66ingerprints\x18\x05 \x03(\t\x1a\x41\n\x1a\x46ile_Download_Performative\x12\x12\n\naccess_url\x18\x01 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x02 \x01(\x0c\x1a\xf7\x01\n\x1bUpload_Receipt_Performative\x12\x12\n\naccess_url\x18\x01 \x01(\t\x12\x0b\n\x03key\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x03\x12\x0c\n\x04\x65tag\x18\x04 \x01(\t\x12k\n\x07timings\x18\x05 \x03(\x0b\x32Z.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.TimingsEntry\x1a.\n\x0cTimingsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\x1a]\n\x19Upload_Begin_Performative\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x10\n\x08\x66ilename\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x03\x12\x13\n\x0b\x66ingerprint\x18\x04 \x01(\t\x1a\x64\n\x19Upload_Chunk_Performative\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\x0c\x12\x19\n\x11\x63hunk_fingerprint\x18\x04 \x01(\t\x1a>\n\x1aUpload_Commit_Performative\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x13\n\x0b\x63hunk_count\x18\x02 \x01(\x05\x1a\xa7\x02\n!Upload_Batch_Receipt_Performative\x12\x0c\n\x04keys\x18\x01 \x03(\t\x12\x13\n\x0b\x61\x63\x63\x65ss_urls\x18\x02 \x03(\t\x12\r\n\x05sizes\x18\x03 \x03(\x03\x12\r\n\x05\x65tags\x18\x04 \x03(\t\x12\x0e\n\x06\x65rrors\x18\x05 \x03(\t\x12\x0e\n\x06ranges\x18\x06 \x03(\t\x12q\n\x07timings\x18\x07 \x03(\x0b\x32`.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.TimingsEntry\x1a.\n\x0cTimingsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x02:\x02\x38\x01\x1a\'\n\x18Request_Url_Performative\x12\x0b\n\x03key\x18\x01 \x01(\t\x1a\x65\n\x1aPresigned_Url_Performative\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x12\n\naccess_url\x18\x02 \x01(\t\x12\x12\n\nexpires_at\x18\x03 \x01(\x01\x12\x12\n\nbyte_range\x18\x04 \x01(\t\x1a\x93\x02\n\x12\x45rror_Performative\x12O\n\nerror_code\x18\x01 \x01(\x0b\x32;.aea.mobix.file_storage.v0_1_0.FileStorageMessage.ErrorCode\x12\x11\n\terror_msg\x18\x02 \x01(\t\x12g\n\nerror_data\x18\x03 \x03(\x0b\x32S.aea.mobix.file_storage.v0_1_0.FileStorageMessage.Error_Performative.ErrorDataEntry\x1a\x30\n\x0e\x45rrorDataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x0c:\x02\x38\x01\x1a\x12\n\x10\x45nd_PerformativeB\x0e\n\x0cperformativeb\x06proto3'
     ),
 )
 
@@ -62,11 +62,14 @@ _FILESTORAGEMESSAGE_ERRORCODE_ERRORCODEENUM = _descriptor.EnumDescriptor(
             serialized_options=None,
             type=None,
         ),
+        _descriptor.EnumValueDescriptor(
+            name="UPLOAD_FAILED", index=5, number=5, serialized_options=None, type=None
+        ),
     ],
     containing_type=None,
     serialized_options=None,
-    serialized_start=557,
-    serialized_end=684,
+    serialized_start=1505,
+    serialized_end=1651,
 )
 _sym_db.RegisterEnumDescriptor(_FILESTORAGEMESSAGE_ERRORCODE_ERRORCODEENUM)
 
@@ -107,8 +110,8 @@ _FILESTORAGEMESSAGE_ERRORCODE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=449,
-    serialized_end=684,
+    serialized_start=1396,
+    serialized_end=1651,
 )
 
 _FILESTORAGEMESSAGE_FILE_UPLOAD_PERFORMATIVE = _descriptor.Descriptor(
@@ -172,6 +175,262 @@ _FILESTORAGEMESSAGE_FILE_UPLOAD_PERFORMATIVE = _descriptor.Descriptor(
             serialized_options=None,
             file=DESCRIPTOR,
         ),
+        _descriptor.FieldDescriptor(
+            name="fingerprint",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Performative.fingerprint",
+            index=3,
+            number=4,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=1653,
+    serialized_end=1748,
+)
+
+_FILESTORAGEMESSAGE_FILE_UPLOAD_REF_PERFORMATIVE = _descriptor.Descriptor(
+    name="File_Upload_Ref_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="filename",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative.filename",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative.key",
+            index=1,
+            number=2,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="path",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative.path",
+            index=2,
+            number=3,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="offset",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative.offset",
+            index=3,
+            number=4,
+            type=3,
+            cpp_type=2,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="length",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative.length",
+            index=4,
+            number=5,
+            type=3,
+            cpp_type=2,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="fingerprint",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative.fingerprint",
+            index=5,
+            number=6,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=1751,
+    serialized_end=1879,
+)
+
+_FILESTORAGEMESSAGE_FILE_UPLOAD_BATCH_PERFORMATIVE = _descriptor.Descriptor(
+    name="File_Upload_Batch_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="keys",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_Performative.keys",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="filenames",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_Performative.filenames",
+            index=1,
+            number=2,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="contents",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_Performative.contents",
+            index=2,
+            number=3,
+            type=12,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="paths",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_Performative.paths",
+            index=3,
+            number=4,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="fingerprints",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_Performative.fingerprints",
+            index=4,
+            number=5,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
     ],
     extensions=[],
     nested_types=[],
@@ -181,8 +440,8 @@ _FILESTORAGEMESSAGE_FILE_UPLOAD_PERFORMATIVE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=686,
-    serialized_end=760,
+    serialized_start=1881,
+    serialized_end=2001,
 )
 
 _FILESTORAGEMESSAGE_FILE_DOWNLOAD_PERFORMATIVE = _descriptor.Descriptor(
@@ -211,15 +470,757 @@ _FILESTORAGEMESSAGE_FILE_DOWNLOAD_PERFORMATIVE = _descriptor.Descriptor(
             file=DESCRIPTOR,
         ),
         _descriptor.FieldDescriptor(
-            name="content",
-            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Download_Performative.content",
-            index=1,
-            number=2,
-            type=12,
+            name="content",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Download_Performative.content",
+            index=1,
+            number=2,
+            type=12,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b(""),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2003,
+    serialized_end=2068,
+)
+
+_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE_TIMINGSENTRY = _descriptor.Descriptor(
+    name="TimingsEntry",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.TimingsEntry",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.TimingsEntry.key",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="value",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.TimingsEntry.value",
+            index=1,
+            number=2,
+            type=2,
+            cpp_type=6,
+            label=1,
+            has_default_value=False,
+            default_value=float(0),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=_b("8\001"),
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2272,
+    serialized_end=2318,
+)
+
+_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE = _descriptor.Descriptor(
+    name="Upload_Receipt_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="access_url",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.access_url",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.key",
+            index=1,
+            number=2,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="size",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.size",
+            index=2,
+            number=3,
+            type=3,
+            cpp_type=2,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="etag",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.etag",
+            index=3,
+            number=4,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="timings",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.timings",
+            index=4,
+            number=5,
+            type=11,
+            cpp_type=10,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[
+        _FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE_TIMINGSENTRY,
+    ],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2071,
+    serialized_end=2318,
+)
+
+_FILESTORAGEMESSAGE_UPLOAD_BEGIN_PERFORMATIVE = _descriptor.Descriptor(
+    name="Upload_Begin_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Begin_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Begin_Performative.key",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="filename",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Begin_Performative.filename",
+            index=1,
+            number=2,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="size",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Begin_Performative.size",
+            index=2,
+            number=3,
+            type=3,
+            cpp_type=2,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="fingerprint",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Begin_Performative.fingerprint",
+            index=3,
+            number=4,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2320,
+    serialized_end=2413,
+)
+
+_FILESTORAGEMESSAGE_UPLOAD_CHUNK_PERFORMATIVE = _descriptor.Descriptor(
+    name="Upload_Chunk_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Chunk_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Chunk_Performative.key",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="offset",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Chunk_Performative.offset",
+            index=1,
+            number=2,
+            type=3,
+            cpp_type=2,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="content",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Chunk_Performative.content",
+            index=2,
+            number=3,
+            type=12,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b(""),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="chunk_fingerprint",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Chunk_Performative.chunk_fingerprint",
+            index=3,
+            number=4,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2415,
+    serialized_end=2515,
+)
+
+_FILESTORAGEMESSAGE_UPLOAD_COMMIT_PERFORMATIVE = _descriptor.Descriptor(
+    name="Upload_Commit_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Commit_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Commit_Performative.key",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="chunk_count",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Commit_Performative.chunk_count",
+            index=1,
+            number=2,
+            type=5,
+            cpp_type=1,
+            label=1,
+            has_default_value=False,
+            default_value=0,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2517,
+    serialized_end=2579,
+)
+
+_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE_TIMINGSENTRY = _descriptor.Descriptor(
+    name="TimingsEntry",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.TimingsEntry",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.TimingsEntry.key",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="value",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.TimingsEntry.value",
+            index=1,
+            number=2,
+            type=2,
+            cpp_type=6,
+            label=1,
+            has_default_value=False,
+            default_value=float(0),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=_b("8\001"),
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2272,
+    serialized_end=2318,
+)
+
+_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE = _descriptor.Descriptor(
+    name="Upload_Batch_Receipt_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="keys",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.keys",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="access_urls",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.access_urls",
+            index=1,
+            number=2,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="sizes",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.sizes",
+            index=2,
+            number=3,
+            type=3,
+            cpp_type=2,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="etags",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.etags",
+            index=3,
+            number=4,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="errors",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.errors",
+            index=4,
+            number=5,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="ranges",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.ranges",
+            index=5,
+            number=6,
+            type=9,
+            cpp_type=9,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="timings",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.timings",
+            index=6,
+            number=7,
+            type=11,
+            cpp_type=10,
+            label=3,
+            has_default_value=False,
+            default_value=[],
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[
+        _FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE_TIMINGSENTRY,
+    ],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2582,
+    serialized_end=2877,
+)
+
+_FILESTORAGEMESSAGE_REQUEST_URL_PERFORMATIVE = _descriptor.Descriptor(
+    name="Request_Url_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Request_Url_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Request_Url_Performative.key",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+    ],
+    extensions=[],
+    nested_types=[],
+    enum_types=[],
+    serialized_options=None,
+    is_extendable=False,
+    syntax="proto3",
+    extension_ranges=[],
+    oneofs=[],
+    serialized_start=2879,
+    serialized_end=2918,
+)
+
+_FILESTORAGEMESSAGE_PRESIGNED_URL_PERFORMATIVE = _descriptor.Descriptor(
+    name="Presigned_Url_Performative",
+    full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Presigned_Url_Performative",
+    filename=None,
+    file=DESCRIPTOR,
+    containing_type=None,
+    fields=[
+        _descriptor.FieldDescriptor(
+            name="key",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Presigned_Url_Performative.key",
+            index=0,
+            number=1,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="access_url",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Presigned_Url_Performative.access_url",
+            index=1,
+            number=2,
+            type=9,
+            cpp_type=9,
+            label=1,
+            has_default_value=False,
+            default_value=_b("").decode("utf-8"),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="expires_at",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Presigned_Url_Performative.expires_at",
+            index=2,
+            number=3,
+            type=1,
+            cpp_type=5,
+            label=1,
+            has_default_value=False,
+            default_value=float(0),
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="byte_range",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.Presigned_Url_Performative.byte_range",
+            index=3,
+            number=4,
+            type=9,
             cpp_type=9,
             label=1,
             has_default_value=False,
-            default_value=_b(""),
+            default_value=_b("").decode("utf-8"),
             message_type=None,
             enum_type=None,
             containing_type=None,
@@ -237,8 +1238,8 @@ _FILESTORAGEMESSAGE_FILE_DOWNLOAD_PERFORMATIVE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=762,
-    serialized_end=827,
+    serialized_start=2920,
+    serialized_end=3021,
 )
 
 _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE_ERRORDATAENTRY = _descriptor.Descriptor(
@@ -293,8 +1294,8 @@ _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE_ERRORDATAENTRY = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1057,
-    serialized_end=1105,
+    serialized_start=3251,
+    serialized_end=3299,
 )
 
 _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE = _descriptor.Descriptor(
@@ -369,8 +1370,8 @@ _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=830,
-    serialized_end=1105,
+    serialized_start=3024,
+    serialized_end=3299,
 )
 
 _FILESTORAGEMESSAGE_END_PERFORMATIVE = _descriptor.Descriptor(
@@ -388,8 +1389,8 @@ _FILESTORAGEMESSAGE_END_PERFORMATIVE = _descriptor.Descriptor(
     syntax="proto3",
     extension_ranges=[],
     oneofs=[],
-    serialized_start=1107,
-    serialized_end=1125,
+    serialized_start=3301,
+    serialized_end=3319,
 )
 
 _FILESTORAGEMESSAGE = _descriptor.Descriptor(
@@ -471,12 +1472,183 @@ _FILESTORAGEMESSAGE = _descriptor.Descriptor(
             serialized_options=None,
             file=DESCRIPTOR,
         ),
+        _descriptor.FieldDescriptor(
+            name="file_upload_batch",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.file_upload_batch",
+            index=4,
+            number=9,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="file_upload_ref",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.file_upload_ref",
+            index=5,
+            number=10,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="presigned_url",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.presigned_url",
+            index=6,
+            number=11,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="request_url",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.request_url",
+            index=7,
+            number=12,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="upload_batch_receipt",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.upload_batch_receipt",
+            index=8,
+            number=13,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="upload_begin",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.upload_begin",
+            index=9,
+            number=14,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="upload_chunk",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.upload_chunk",
+            index=10,
+            number=15,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="upload_commit",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.upload_commit",
+            index=11,
+            number=16,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
+        _descriptor.FieldDescriptor(
+            name="upload_receipt",
+            full_name="aea.mobix.file_storage.v0_1_0.FileStorageMessage.upload_receipt",
+            index=12,
+            number=17,
+            type=11,
+            cpp_type=10,
+            label=1,
+            has_default_value=False,
+            default_value=None,
+            message_type=None,
+            enum_type=None,
+            containing_type=None,
+            is_extension=False,
+            extension_scope=None,
+            serialized_options=None,
+            file=DESCRIPTOR,
+        ),
     ],
     extensions=[],
     nested_types=[
         _FILESTORAGEMESSAGE_ERRORCODE,
         _FILESTORAGEMESSAGE_FILE_UPLOAD_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_FILE_UPLOAD_REF_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_FILE_UPLOAD_BATCH_PERFORMATIVE,
         _FILESTORAGEMESSAGE_FILE_DOWNLOAD_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_UPLOAD_BEGIN_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_UPLOAD_CHUNK_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_UPLOAD_COMMIT_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_REQUEST_URL_PERFORMATIVE,
+        _FILESTORAGEMESSAGE_PRESIGNED_URL_PERFORMATIVE,
         _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE,
         _FILESTORAGEMESSAGE_END_PERFORMATIVE,
     ],
@@ -495,7 +1667,7 @@ _FILESTORAGEMESSAGE = _descriptor.Descriptor(
         ),
     ],
     serialized_start=54,
-    serialized_end=1141,
+    serialized_end=3335,
 )
 
 _FILESTORAGEMESSAGE_ERRORCODE.fields_by_name[
@@ -506,7 +1678,30 @@ _FILESTORAGEMESSAGE_ERRORCODE_ERRORCODEENUM.containing_type = (
     _FILESTORAGEMESSAGE_ERRORCODE
 )
 _FILESTORAGEMESSAGE_FILE_UPLOAD_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_FILE_UPLOAD_REF_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_FILE_UPLOAD_BATCH_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
 _FILESTORAGEMESSAGE_FILE_DOWNLOAD_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE_TIMINGSENTRY.containing_type = (
+    _FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE
+)
+_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE.fields_by_name[
+    "timings"
+].message_type = _FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE_TIMINGSENTRY
+_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_UPLOAD_BEGIN_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_UPLOAD_CHUNK_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_UPLOAD_COMMIT_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE_TIMINGSENTRY.containing_type = (
+    _FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE
+)
+_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE.fields_by_name[
+    "timings"
+].message_type = _FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE_TIMINGSENTRY
+_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE.containing_type = (
+    _FILESTORAGEMESSAGE
+)
+_FILESTORAGEMESSAGE_REQUEST_URL_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
+_FILESTORAGEMESSAGE_PRESIGNED_URL_PERFORMATIVE.containing_type = _FILESTORAGEMESSAGE
 _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE_ERRORDATAENTRY.containing_type = (
     _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE
 )
@@ -530,6 +1725,33 @@ _FILESTORAGEMESSAGE.fields_by_name[
 _FILESTORAGEMESSAGE.fields_by_name[
     "file_upload"
 ].message_type = _FILESTORAGEMESSAGE_FILE_UPLOAD_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "file_upload_batch"
+].message_type = _FILESTORAGEMESSAGE_FILE_UPLOAD_BATCH_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "file_upload_ref"
+].message_type = _FILESTORAGEMESSAGE_FILE_UPLOAD_REF_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "presigned_url"
+].message_type = _FILESTORAGEMESSAGE_PRESIGNED_URL_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "request_url"
+].message_type = _FILESTORAGEMESSAGE_REQUEST_URL_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_batch_receipt"
+].message_type = _FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_begin"
+].message_type = _FILESTORAGEMESSAGE_UPLOAD_BEGIN_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_chunk"
+].message_type = _FILESTORAGEMESSAGE_UPLOAD_CHUNK_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_commit"
+].message_type = _FILESTORAGEMESSAGE_UPLOAD_COMMIT_PERFORMATIVE
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_receipt"
+].message_type = _FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE
 _FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
     _FILESTORAGEMESSAGE.fields_by_name["end"]
 )
@@ -554,6 +1776,60 @@ _FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
 _FILESTORAGEMESSAGE.fields_by_name[
     "file_upload"
 ].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["file_upload_batch"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "file_upload_batch"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["file_upload_ref"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "file_upload_ref"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["presigned_url"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "presigned_url"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["request_url"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "request_url"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["upload_batch_receipt"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_batch_receipt"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["upload_begin"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_begin"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["upload_chunk"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_chunk"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["upload_commit"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_commit"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
+_FILESTORAGEMESSAGE.oneofs_by_name["performative"].fields.append(
+    _FILESTORAGEMESSAGE.fields_by_name["upload_receipt"]
+)
+_FILESTORAGEMESSAGE.fields_by_name[
+    "upload_receipt"
+].containing_oneof = _FILESTORAGEMESSAGE.oneofs_by_name["performative"]
 DESCRIPTOR.message_types_by_name["FileStorageMessage"] = _FILESTORAGEMESSAGE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
@@ -579,6 +1855,24 @@ FileStorageMessage = _reflection.GeneratedProtocolMessageType(
                 # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Performative)
             ),
         ),
+        File_Upload_Ref_Performative=_reflection.GeneratedProtocolMessageType(
+            "File_Upload_Ref_Performative",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_FILESTORAGEMESSAGE_FILE_UPLOAD_REF_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Ref_Performative)
+            ),
+        ),
+        File_Upload_Batch_Performative=_reflection.GeneratedProtocolMessageType(
+            "File_Upload_Batch_Performative",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_FILESTORAGEMESSAGE_FILE_UPLOAD_BATCH_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Upload_Batch_Performative)
+            ),
+        ),
         File_Download_Performative=_reflection.GeneratedProtocolMessageType(
             "File_Download_Performative",
             (_message.Message,),
@@ -588,6 +1882,87 @@ FileStorageMessage = _reflection.GeneratedProtocolMessageType(
                 # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.File_Download_Performative)
             ),
         ),
+        Upload_Receipt_Performative=_reflection.GeneratedProtocolMessageType(
+            "Upload_Receipt_Performative",
+            (_message.Message,),
+            dict(
+                TimingsEntry=_reflection.GeneratedProtocolMessageType(
+                    "TimingsEntry",
+                    (_message.Message,),
+                    dict(
+                        DESCRIPTOR=_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE_TIMINGSENTRY,
+                        __module__="file_storage_pb2"
+                        # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative.TimingsEntry)
+                    ),
+                ),
+                DESCRIPTOR=_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Receipt_Performative)
+            ),
+        ),
+        Upload_Begin_Performative=_reflection.GeneratedProtocolMessageType(
+            "Upload_Begin_Performative",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_FILESTORAGEMESSAGE_UPLOAD_BEGIN_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Begin_Performative)
+            ),
+        ),
+        Upload_Chunk_Performative=_reflection.GeneratedProtocolMessageType(
+            "Upload_Chunk_Performative",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_FILESTORAGEMESSAGE_UPLOAD_CHUNK_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Chunk_Performative)
+            ),
+        ),
+        Upload_Commit_Performative=_reflection.GeneratedProtocolMessageType(
+            "Upload_Commit_Performative",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_FILESTORAGEMESSAGE_UPLOAD_COMMIT_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Commit_Performative)
+            ),
+        ),
+        Upload_Batch_Receipt_Performative=_reflection.GeneratedProtocolMessageType(
+            "Upload_Batch_Receipt_Performative",
+            (_message.Message,),
+            dict(
+                TimingsEntry=_reflection.GeneratedProtocolMessageType(
+                    "TimingsEntry",
+                    (_message.Message,),
+                    dict(
+                        DESCRIPTOR=_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE_TIMINGSENTRY,
+                        __module__="file_storage_pb2"
+                        # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative.TimingsEntry)
+                    ),
+                ),
+                DESCRIPTOR=_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Upload_Batch_Receipt_Performative)
+            ),
+        ),
+        Request_Url_Performative=_reflection.GeneratedProtocolMessageType(
+            "Request_Url_Performative",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_FILESTORAGEMESSAGE_REQUEST_URL_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Request_Url_Performative)
+            ),
+        ),
+        Presigned_Url_Performative=_reflection.GeneratedProtocolMessageType(
+            "Presigned_Url_Performative",
+            (_message.Message,),
+            dict(
+                DESCRIPTOR=_FILESTORAGEMESSAGE_PRESIGNED_URL_PERFORMATIVE,
+                __module__="file_storage_pb2"
+                # @@protoc_insertion_point(class_scope:aea.mobix.file_storage.v0_1_0.FileStorageMessage.Presigned_Url_Performative)
+            ),
+        ),
         Error_Performative=_reflection.GeneratedProtocolMessageType(
             "Error_Performative",
             (_message.Message,),
@@ -623,11 +1998,26 @@ FileStorageMessage = _reflection.GeneratedProtocolMessageType(
 _sym_db.RegisterMessage(FileStorageMessage)
 _sym_db.RegisterMessage(FileStorageMessage.ErrorCode)
 _sym_db.RegisterMessage(FileStorageMessage.File_Upload_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.File_Upload_Ref_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.File_Upload_Batch_Performative)
 _sym_db.RegisterMessage(FileStorageMessage.File_Download_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.Upload_Receipt_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.Upload_Receipt_Performative.TimingsEntry)
+_sym_db.RegisterMessage(FileStorageMessage.Upload_Begin_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.Upload_Chunk_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.Upload_Commit_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.Upload_Batch_Receipt_Performative)
+_sym_db.RegisterMessage(
+    FileStorageMessage.Upload_Batch_Receipt_Performative.TimingsEntry
+)
+_sym_db.RegisterMessage(FileStorageMessage.Request_Url_Performative)
+_sym_db.RegisterMessage(FileStorageMessage.Presigned_Url_Performative)
 _sym_db.RegisterMessage(FileStorageMessage.Error_Performative)
 _sym_db.RegisterMessage(FileStorageMessage.Error_Performative.ErrorDataEntry)
 _sym_db.RegisterMessage(FileStorageMessage.End_Performative)
 
 
+_FILESTORAGEMESSAGE_UPLOAD_RECEIPT_PERFORMATIVE_TIMINGSENTRY._options = None
+_FILESTORAGEMESSAGE_UPLOAD_BATCH_RECEIPT_PERFORMATIVE_TIMINGSENTRY._options = None
 _FILESTORAGEMESSAGE_ERROR_PERFORMATIVE_ERRORDATAENTRY._options = None
 # @@protoc_insertion_point(module_scope)
@@ -51,27 +51,71 @@ class FileStorageMessage(Message):
         ERROR = "error"
         FILE_DOWNLOAD = "file_download"
         FILE_UPLOAD = "file_upload"
+        FILE_UPLOAD_BATCH = "file_upload_batch"
+        FILE_UPLOAD_REF = "file_upload_ref"
+        PRESIGNED_URL = "presigned_url"
+        REQUEST_URL = "request_url"
+        UPLOAD_BATCH_RECEIPT = "upload_batch_receipt"
+        UPLOAD_BEGIN = "upload_begin"
+        UPLOAD_CHUNK = "upload_chunk"
+        UPLOAD_COMMIT = "upload_commit"
+        UPLOAD_RECEIPT = "upload_receipt"
 
         def __str__(self) -> str:
             """Get the string representation."""
             return str(self.value)
 
-    _performatives = {"end", "error", "file_download", "file_upload"}
+    _performatives = {
+        "end",
+        "error",
+        "file_download",
+        "file_upload",
+        "file_upload_batch",
+        "file_upload_ref",
+        "presigned_url",
+        "request_url",
+        "upload_batch_receipt",
+        "upload_begin",
+        "upload_chunk",
+        "upload_commit",
+        "upload_receipt",
+    }
     __slots__: Tuple[str, ...] = tuple()
 
     class _SlotsCls:
         __slots__ = (
             "access_url",
+            "access_urls",
+            "byte_range",
+            "chunk_count",
+            "chunk_fingerprint",
             "content",
+            "contents",
             "dialogue_reference",
             "error_code",
             "error_data",
             "error_msg",
+            "errors",
+            "etag",
+            "etags",
+            "expires_at",
             "filename",
+            "filenames",
+            "fingerprint",
+            "fingerprints",
             "key",
+            "keys",
+            "length",
             "message_id",
+            "offset",
+            "path",
+            "paths",
             "performative",
+            "ranges",
+            "size",
+            "sizes",
             "target",
+            "timings",
         )
 
     def __init__(
@@ -133,12 +177,44 @@ class FileStorageMessage(Message):
         enforce(self.is_set("access_url"), "'access_url' content is not set.")
         return cast(str, self.get("access_url"))
 
+    @property
+    def access_urls(self) -> Tuple[str, ...]:
+        """Get the 'access_urls' content from the message."""
+        enforce(self.is_set("access_urls"), "'access_urls' content is not set.")
+        return cast(Tuple[str, ...], self.get("access_urls"))
+
+    @property
+    def byte_range(self) -> str:
+        """Get the 'byte_range' content from the message."""
+        enforce(self.is_set("byte_range"), "'byte_range' content is not set.")
+        return cast(str, self.get("byte_range"))
+
+    @property
+    def chunk_count(self) -> int:
+        """Get the 'chunk_count' content from the message."""
+        enforce(self.is_set("chunk_count"), "'chunk_count' content is not set.")
+        return cast(int, self.get("chunk_count"))
+
+    @property
+    def chunk_fingerprint(self) -> str:
+        """Get the 'chunk_fingerprint' content from the message."""
+        enforce(
+            self.is_set("chunk_fingerprint"), "'chunk_fingerprint' content is not set."
+        )
+        return cast(str, self.get("chunk_fingerprint"))
+
     @property
     def content(self) -> bytes:
         """Get the 'content' content from the message."""
         enforce(self.is_set("content"), "'content' content is not set.")
         return cast(bytes, self.get("content"))
 
+    @property
+    def contents(self) -> Tuple[bytes, ...]:
+        """Get the 'contents' content from the message."""
+        enforce(self.is_set("contents"), "'contents' content is not set.")
+        return cast(Tuple[bytes, ...], self.get("contents"))
+
     @property
     def error_code(self) -> CustomErrorCode:
         """Get the 'error_code' content from the message."""
@@ -157,18 +233,114 @@ class FileStorageMessage(Message):
         enforce(self.is_set("error_msg"), "'error_msg' content is not set.")
         return cast(str, self.get("error_msg"))
 
+    @property
+    def errors(self) -> Tuple[str, ...]:
+        """Get the 'errors' content from the message."""
+        enforce(self.is_set("errors"), "'errors' content is not set.")
+        return cast(Tuple[str, ...], self.get("errors"))
+
+    @property
+    def etag(self) -> str:
+        """Get the 'etag' content from the message."""
+        enforce(self.is_set("etag"), "'etag' content is not set.")
+        return cast(str, self.get("etag"))
+
+    @property
+    def etags(self) -> Tuple[str, ...]:
+        """Get the 'etags' content from the message."""
+        enforce(self.is_set("etags"), "'etags' content is not set.")
+        return cast(Tuple[str, ...], self.get("etags"))
+
+    @property
+    def expires_at(self) -> float:
+        """Get the 'expires_at' content from the message."""
+        enforce(self.is_set("expires_at"), "'expires_at' content is not set.")
+        return cast(float, self.get("expires_at"))
+
     @property
     def filename(self) -> str:
         """Get the 'filename' content from the message."""
         enforce(self.is_set("filename"), "'filename' content is not set.")
         return cast(str, self.get("filename"))
 
+    @property
+    def filenames(self) -> Tuple[str, ...]:
+        """Get the 'filenames' content from the message."""
+        enforce(self.is_set("filenames"), "'filenames' content is not set.")
+        return cast(Tuple[str, ...], self.get("filenames"))
+
+    @property
+    def fingerprint(self) -> str:
+        """Get the 'fingerprint' content from the message."""
+        enforce(self.is_set("fingerprint"), "'fingerprint' content is not set.")
+        return cast(str, self.get("fingerprint"))
+
+    @property
+    def fingerprints(self) -> Tuple[str, ...]:
+        """Get the 'fingerprints' content from the message."""
+        enforce(self.is_set("fingerprints"), "'fingerprints' content is not set.")
+        return cast(Tuple[str, ...], self.get("fingerprints"))
+
     @property
     def key(self) -> str:
         """Get the 'key' content from the message."""
         enforce(self.is_set("key"), "'key' content is not set.")
         return cast(str, self.get("key"))
 
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        """Get the 'keys' content from the message."""
+        enforce(self.is_set("keys"), "'keys' content is not set.")
+        return cast(Tuple[str, ...], self.get("keys"))
+
+    @property
+    def length(self) -> int:
+        """Get the 'length' content from the message."""
+        enforce(self.is_set("length"), "'length' content is not set.")
+        return cast(int, self.get("length"))
+
+    @property
+    def offset(self) -> int:
+        """Get the 'offset' content from the message."""
+        enforce(self.is_set("offset"), "'offset' content is not set.")
+        return cast(int, self.get("offset"))
+
+    @property
+    def path(self) -> str:
+        """Get the 'path' content from the message."""
+        enforce(self.is_set("path"), "'path' content is not set.")
+        return cast(str, self.get("path"))
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        """Get the 'paths' content from the message."""
+        enforce(self.is_set("paths"), "'paths' content is not set.")
+        return cast(Tuple[str, ...], self.get("paths"))
+
+    @property
+    def ranges(self) -> Tuple[str, ...]:
+        """Get the 'ranges' content from the message."""
+        enforce(self.is_set("ranges"), "'ranges' content is not set.")
+        return cast(Tuple[str, ...], self.get("ranges"))
+
+    @property
+    def size(self) -> int:
+        """Get the 'size' content from the message."""
+        enforce(self.is_set("size"), "'size' content is not set.")
+        return cast(int, self.get("size"))
+
+    @property
+    def sizes(self) -> Tuple[int, ...]:
+        """Get the 'sizes' content from the message."""
+        enforce(self.is_set("sizes"), "'sizes' content is not set.")
+        return cast(Tuple[int, ...], self.get("sizes"))
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """Get the 'timings' content from the message."""
+        enforce(self.is_set("timings"), "'timings' content is not set.")
+        return cast(Dict[str, float], self.get("timings"))
+
     def _is_consistent(self) -> bool:
         """Check that the message follows the file_storage protocol."""
         try:
@@ -216,7 +388,7 @@ class FileStorageMessage(Message):
             actual_nb_of_contents = len(self._body) - DEFAULT_BODY_SIZE
             expected_nb_of_contents = 0
             if self.performative == FileStorageMessage.Performative.FILE_UPLOAD:
-                expected_nb_of_contents = 3
+                expected_nb_of_contents = 4
                 enforce(
                     isinstance(self.content, bytes),
                     "Invalid type for content 'content'. Expected 'bytes'. Found '{}'.".format(
@@ -235,6 +407,110 @@ class FileStorageMessage(Message):
                         type(self.key)
                     ),
                 )
+                enforce(
+                    isinstance(self.fingerprint, str),
+                    "Invalid type for content 'fingerprint'. Expected 'str'. Found '{}'.".format(
+                        type(self.fingerprint)
+                    ),
+                )
+            elif self.performative == FileStorageMessage.Performative.FILE_UPLOAD_REF:
+                expected_nb_of_contents = 6
+                enforce(
+                    isinstance(self.filename, str),
+                    "Invalid type for content 'filename'. Expected 'str'. Found '{}'.".format(
+                        type(self.filename)
+                    ),
+                )
+                enforce(
+                    isinstance(self.key, str),
+                    "Invalid type for content 'key'. Expected 'str'. Found '{}'.".format(
+                        type(self.key)
+                    ),
+                )
+                enforce(
+                    isinstance(self.path, str),
+                    "Invalid type for content 'path'. Expected 'str'. Found '{}'.".format(
+                        type(self.path)
+                    ),
+                )
+                enforce(
+                    type(self.offset) is int,
+                    "Invalid type for content 'offset'. Expected 'int'. Found '{}'.".format(
+                        type(self.offset)
+                    ),
+                )
+                enforce(
+                    type(self.length) is int,
+                    "Invalid type for content 'length'. Expected 'int'. Found '{}'.".format(
+                        type(self.length)
+                    ),
+                )
+                enforce(
+                    isinstance(self.fingerprint, str),
+                    "Invalid type for content 'fingerprint'. Expected 'str'. Found '{}'.".format(
+                        type(self.fingerprint)
+                    ),
+                )
+            elif self.performative == FileStorageMessage.Performative.FILE_UPLOAD_BATCH:
+                expected_nb_of_contents = 5
+                enforce(
+                    isinstance(self.keys, tuple),
+                    "Invalid type for content 'keys'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.keys)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.keys),
+                    "Invalid type for tuple elements in content 'keys'. Expected 'str'.",
+                )
+                enforce(
+                    isinstance(self.filenames, tuple),
+                    "Invalid type for content 'filenames'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.filenames)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.filenames),
+                    "Invalid type for tuple elements in content 'filenames'. Expected 'str'.",
+                )
+                enforce(
+                    isinstance(self.contents, tuple),
+                    "Invalid type for content 'contents'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.contents)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, bytes) for element in self.contents),
+                    "Invalid type for tuple elements in content 'contents'. Expected 'bytes'.",
+                )
+                enforce(
+                    isinstance(self.paths, tuple),
+                    "Invalid type for content 'paths'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.paths)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.paths),
+                    "Invalid type for tuple elements in content 'paths'. Expected 'str'.",
+                )
+                enforce(
+                    isinstance(self.fingerprints, tuple),
+                    "Invalid type for content 'fingerprints'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.fingerprints)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.fingerprints),
+                    "Invalid type for tuple elements in content 'fingerprints'. Expected 'str'.",
+                )
+                enforce(
+                    len(self.keys)
+                    == len(self.filenames)
+                    == len(self.contents)
+                    == len(self.paths)
+                    == len(self.fingerprints),
+                    "Contents 'keys', 'filenames', 'contents', 'paths' and 'fingerprints' must have the same length.",
+                )
             elif self.performative == FileStorageMessage.Performative.FILE_DOWNLOAD:
                 expected_nb_of_contents = 2
                 enforce(
@@ -249,6 +525,244 @@ class FileStorageMessage(Message):
                         type(self.content)
                     ),
                 )
+            elif self.performative == FileStorageMessage.Performative.UPLOAD_RECEIPT:
+                expected_nb_of_contents = 5
+                enforce(
+                    isinstance(self.access_url, str),
+                    "Invalid type for content 'access_url'. Expected 'str'. Found '{}'.".format(
+                        type(self.access_url)
+                    ),
+                )
+                enforce(
+                    isinstance(self.key, str),
+                    "Invalid type for content 'key'. Expected 'str'. Found '{}'.".format(
+                        type(self.key)
+                    ),
+                )
+                enforce(
+                    type(self.size) is int,
+                    "Invalid type for content 'size'. Expected 'int'. Found '{}'.".format(
+                        type(self.size)
+                    ),
+                )
+                enforce(
+                    isinstance(self.etag, str),
+                    "Invalid type for content 'etag'. Expected 'str'. Found '{}'.".format(
+                        type(self.etag)
+                    ),
+                )
+                enforce(
+                    isinstance(self.timings, dict),
+                    "Invalid type for content 'timings'. Expected 'dict'. Found '{}'.".format(
+                        type(self.timings)
+                    ),
+                )
+                for key_of_timings, value_of_timings in self.timings.items():
+                    enforce(
+                        isinstance(key_of_timings, str),
+                        "Invalid type for dictionary keys in content 'timings'. Expected 'str'. Found '{}'.".format(
+                            type(key_of_timings)
+                        ),
+                    )
+                    enforce(
+                        isinstance(value_of_timings, float),
+                        "Invalid type for dictionary values in content 'timings'. Expected 'float'. Found '{}'.".format(
+                            type(value_of_timings)
+                        ),
+                    )
+            elif self.performative == FileStorageMessage.Performative.UPLOAD_BEGIN:
+                expected_nb_of_contents = 4
+                enforce(
+                    isinstance(self.key, str),
+                    "Invalid type for content 'key'. Expected 'str'. Found '{}'.".format(
+                        type(self.key)
+                    ),
+                )
+                enforce(
+                    isinstance(self.filename, str),
+                    "Invalid type for content 'filename'. Expected 'str'. Found '{}'.".format(
+                        type(self.filename)
+                    ),
+                )
+                enforce(
+                    type(self.size) is int,
+                    "Invalid type for content 'size'. Expected 'int'. Found '{}'.".format(
+                        type(self.size)
+                    ),
+                )
+                enforce(
+                    isinstance(self.fingerprint, str),
+                    "Invalid type for content 'fingerprint'. Expected 'str'. Found '{}'.".format(
+                        type(self.fingerprint)
+                    ),
+                )
+            elif self.performative == FileStorageMessage.Performative.UPLOAD_CHUNK:
+                expected_nb_of_contents = 4
+                enforce(
+                    isinstance(self.key, str),
+                    "Invalid type for content 'key'. Expected 'str'. Found '{}'.".format(
+                        type(self.key)
+                    ),
+                )
+                enforce(
+                    type(self.offset) is int,
+                    "Invalid type for content 'offset'. Expected 'int'. Found '{}'.".format(
+                        type(self.offset)
+                    ),
+                )
+                enforce(
+                    isinstance(self.content, bytes),
+                    "Invalid type for content 'content'. Expected 'bytes'. Found '{}'.".format(
+                        type(self.content)
+                    ),
+                )
+                enforce(
+                    isinstance(self.chunk_fingerprint, str),
+                    "Invalid type for content 'chunk_fingerprint'. Expected 'str'. Found '{}'.".format(
+                        type(self.chunk_fingerprint)
+                    ),
+                )
+            elif self.performative == FileStorageMessage.Performative.UPLOAD_COMMIT:
+                expected_nb_of_contents = 2
+                enforce(
+                    isinstance(self.key, str),
+                    "Invalid type for content 'key'. Expected 'str'. Found '{}'.".format(
+                        type(self.key)
+                    ),
+                )
+                enforce(
+                    type(self.chunk_count) is int,
+                    "Invalid type for content 'chunk_count'. Expected 'int'. Found '{}'.".format(
+                        type(self.chunk_count)
+                    ),
+                )
+            elif (
+                self.performative
+                == FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT
+            ):
+                expected_nb_of_contents = 7
+                enforce(
+                    isinstance(self.keys, tuple),
+                    "Invalid type for content 'keys'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.keys)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.keys),
+                    "Invalid type for tuple elements in content 'keys'. Expected 'str'.",
+                )
+                enforce(
+                    isinstance(self.access_urls, tuple),
+                    "Invalid type for content 'access_urls'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.access_urls)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.access_urls),
+                    "Invalid type for tuple elements in content 'access_urls'. Expected 'str'.",
+                )
+                enforce(
+                    isinstance(self.sizes, tuple),
+                    "Invalid type for content 'sizes'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.sizes)
+                    ),
+                )
+                enforce(
+                    all(type(element) is int for element in self.sizes),
+                    "Invalid type for tuple elements in content 'sizes'. Expected 'int'.",
+                )
+                enforce(
+                    isinstance(self.etags, tuple),
+                    "Invalid type for content 'etags'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.etags)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.etags),
+                    "Invalid type for tuple elements in content 'etags'. Expected 'str'.",
+                )
+                enforce(
+                    isinstance(self.errors, tuple),
+                    "Invalid type for content 'errors'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.errors)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.errors),
+                    "Invalid type for tuple elements in content 'errors'. Expected 'str'.",
+                )
+                enforce(
+                    isinstance(self.ranges, tuple),
+                    "Invalid type for content 'ranges'. Expected 'tuple'. Found '{}'.".format(
+                        type(self.ranges)
+                    ),
+                )
+                enforce(
+                    all(isinstance(element, str) for element in self.ranges),
+                    "Invalid type for tuple elements in content 'ranges'. Expected 'str'.",
+                )
+                enforce(
+                    len(self.keys)
+                    == len(self.access_urls)
+                    == len(self.sizes)
+                    == len(self.etags)
+                    == len(self.errors)
+                    == len(self.ranges),
+                    "Contents 'keys', 'access_urls', 'sizes', 'etags', 'errors' and 'ranges' must have the same length.",
+                )
+                enforce(
+                    isinstance(self.timings, dict),
+                    "Invalid type for content 'timings'. Expected 'dict'. Found '{}'.".format(
+                        type(self.timings)
+                    ),
+                )
+                for key_of_timings, value_of_timings in self.timings.items():
+                    enforce(
+                        isinstance(key_of_timings, str),
+                        "Invalid type for dictionary keys in content 'timings'. Expected 'str'. Found '{}'.".format(
+                            type(key_of_timings)
+                        ),
+                    )
+                    enforce(
+                        isinstance(value_of_timings, float),
+                        "Invalid type for dictionary values in content 'timings'. Expected 'float'. Found '{}'.".format(
+                            type(value_of_timings)
+                        ),
+                    )
+            elif self.performative == FileStorageMessage.Performative.REQUEST_URL:
+                expected_nb_of_contents = 1
+                enforce(
+                    isinstance(self.key, str),
+                    "Invalid type for content 'key'. Expected 'str'. Found '{}'.".format(
+                        type(self.key)
+                    ),
+                )
+            elif self.performative == FileStorageMessage.Performative.PRESIGNED_URL:
+                expected_nb_of_contents = 4
+                enforce(
+                    isinstance(self.key, str),
+                    "Invalid type for content 'key'. Expected 'str'. Found '{}'.".format(
+                        type(self.key)
+                    ),
+                )
+                enforce(
+                    isinstance(self.access_url, str),
+                    "Invalid type for content 'access_url'. Expected 'str'. Found '{}'.".format(
+                        type(self.access_url)
+                    ),
+                )
+                enforce(
+                    isinstance(self.expires_at, float),
+                    "Invalid type for content 'expires_at'. Expected 'float'. Found '{}'.".format(
+                        type(self.expires_at)
+                    ),
+                )
+                enforce(
+                    isinstance(self.byte_range, str),
+                    "Invalid type for content 'byte_range'. Expected 'str'. Found '{}'.".format(
+                        type(self.byte_range)
+                    ),
+                )
             elif self.performative == FileStorageMessage.Performative.ERROR:
                 expected_nb_of_contents = 3
                 enforce(
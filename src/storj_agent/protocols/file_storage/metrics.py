@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+"""Counters and histograms of the upload pipeline, in the Prometheus text format."""
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_METRICS_CONFIG = {
+    "textfile": None,
+    "interval": 15,
+    "address": "127.0.0.1",
+    "port": None,
+}
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    math.inf,
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Get the `{name="value",...}` selector of a sample, empty without labels."""
+    if not names:
+        return ""
+    pairs = (
+        '{}="{}"'.format(
+            name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Get the text of a sample value."""
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """A named family of samples, one per combination of label values."""
+
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """
+        Initialize the metric.
+
+        :param name: the metric name.
+        :param documentation: the help text of the metric.
+        :param labelnames: the names of the labels of the metric.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes the labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        """Get the sample lines of the metric."""
+        raise NotImplementedError  # pragma: no cover
+
+    def render(self) -> str:
+        """Get the metric in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """A value which only goes up, such as a number of files or bytes."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        """Initialize the counter."""
+        super().__init__(name, documentation, labelnames)
+        self._values = {}  # type: Dict[LabelValues, float]
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increase the counter.
+
+        :param amount: the increase, positive.
+        :param labels: the label values of the sample to increase.
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Get the value of a sample."""
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        """Get the sample lines of the counter."""
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(Metric):
+    """A distribution of observed values, such as durations, in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        Initialize the histogram.
+
+        :param name: the metric name.
+        :param documentation: the help text of the metric.
+        :param labelnames: the names of the labels of the metric.
+        :param buckets: the increasing upper bounds of the buckets, up to infinity.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(set(buckets) | {math.inf}))
+        self._series = {}  # type: Dict[LabelValues, List[float]]
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Observe a value.
+
+        :param value: the observed value.
+        :param labels: the label values of the series the value belongs to.
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # bucket counts, then the sum and the count of the observations
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        """Get the number of values observed in a series."""
+        series = self._series.get(self._label_values(labels))
+        return 0 if series is None else int(series[-1])
+
+    def samples(self) -> List[str]:
+        """Get the sample lines of the histogram."""
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        names = self.labelnames + ("le",)
+        lines = []
+        for key, values in series:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(values[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    The metrics of the agent.
+
+    Metrics are created once, by name, and shared by every component of the
+    process recording into them, so the skill and the connection end up in the
+    same exposition.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._metrics = {}  # type: Dict[str, Metric]
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, *args: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Get the counter of a name, created if needed."""
+        return self._get(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get the histogram of a name, created if needed."""
+        return self._get(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> str:
+        """Get every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return "".join(metric.render() for _, metric in metrics)
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Write the metrics to a file, as read by the node exporter textfile collector.
+
+        The file is replaced atomically, so it is never read half written.
+
+        :param path: the path of the file.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            file.write(self.render())
+        os.replace(temporary, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class MetricsExporter:
+    """
+    Expose a registry to Prometheus.
+
+    The metrics are written to `textfile` every `interval` seconds and once
+    more when the exporter stops, and served over HTTP on `address:port`, each
+    one only if configured.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        """
+        Initialize the exporter.
+
+        :param config: overrides of the `DEFAULT_METRICS_CONFIG` values.
+        :param registry: the registry to expose.
+        """
+        config = {**DEFAULT_METRICS_CONFIG, **(config or {})}
+        self.textfile = config["textfile"]
+        self.interval = float(config["interval"])
+        self.address = config["address"]
+        self.port = config["port"]
+        self.registry = registry
+        self._stopped = threading.Event()
+        self._writer = None  # type: Optional[threading.Thread]
+        self._server = None  # type: Optional[ThreadingHTTPServer]
+
+    def start(self) -> None:
+        """Start writing and serving the metrics."""
+        if self.textfile:
+            self._writer = threading.Thread(
+                target=self._write_periodically, name="metrics-writer", daemon=True
+            )
+            self._writer.start()
+        if self.port is not None:
+            registry = self.registry
+
+            class _Handler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:  # pylint: disable=invalid-name
+                    body = registry.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", CONTENT_TYPE)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args: Any) -> None:
+                    pass
+
+            self._server = ThreadingHTTPServer((self.address, int(self.port)), _Handler)
+            self._server.daemon_threads = True
+            threading.Thread(
+                target=self._server.serve_forever, name="metrics-server", daemon=True
+            ).start()
+
+    @property
+    def server_port(self) -> Optional[int]:
+        """Get the port the metrics are served on, if served."""
+        return None if self._server is None else self._server.server_address[1]
+
+    def _write_periodically(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.registry.write_textfile(self.textfile)
+
+    def stop(self) -> None:
+        """Stop serving the metrics and write them a last time."""
+        self._stopped.set()
+        if self._writer is not None:
+            self._writer.join()
+            self.registry.write_textfile(self.textfile)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+SCAN_SECONDS = REGISTRY.histogram(
+    "storj_scan_seconds",
+    "Duration of the scans of the upload directory, by kind: full, or events "
+    "for the checks of the paths of the file events.",
+    ["kind"],
+)
+SCANNED_FILES = REGISTRY.counter(
+    "storj_scanned_files_total", "Files found new or modified by the scans."
+)
+HASH_SECONDS = REGISTRY.histogram(
+    "storj_hash_seconds",
+    "Duration of the file hashes, including the wait for a hash worker.",
+)
+HASHED_BYTES = REGISTRY.counter(
+    "storj_hashed_bytes_total", "Bytes of the hashed files."
+)
+SCHEDULE_WAIT_SECONDS = REGISTRY.histogram(
+    "storj_schedule_wait_seconds",
+    "Time the hashed files wait in the upload scheduler of the skill.",
+)
+SENT_FILES = REGISTRY.counter(
+    "storj_sent_files_total",
+    "Files sent to the connection, by mode: inline, reference, stream or batch.",
+    ["mode"],
+)
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "storj_queue_wait_seconds",
+    "Time the envelopes wait in the connection for an upload worker.",
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "storj_stage_seconds",
+    "Duration of the upload stages: dedup, put, presign, stream and batch.",
+    ["stage"],
+)
+UPLOADS = REGISTRY.counter(
+    "storj_uploads_total",
+    "Objects handled by the connection, by result: stored, or skipped as already stored.",
+    ["result"],
+)
+UPLOADED_BYTES = REGISTRY.counter(
+    "storj_uploaded_bytes_total", "Bytes of the objects stored on the gateway."
+)
+RETRIES = REGISTRY.counter(
+    "storj_retries_total",
+    "Requests to the gateway sent again, by kind: request for the retries of "
+    "the s3 client, part for the retries of multipart uploads.",
+    ["kind"],
+)
+FAILURES = REGISTRY.counter(
+    "storj_failures_total", "Failures, by stage: hash or upload.", ["stage"]
+)
+THROTTLED_SECONDS = REGISTRY.counter(
+    "storj_throttled_seconds_total",
+    "Time the requests to the gateway were held back by the rate limits, by "
+    "kind: bytes or requests.",
+    ["kind"],
+)
+RECEIPTS = REGISTRY.counter(
+    "storj_receipts_total",
+    "Replies of the connection handled by the skill, by performative.",
+    ["performative"],
+)
+ACKNOWLEDGED_FILES = REGISTRY.counter(
+    "storj_acknowledged_files_total",
+    "Files whose upload was acknowledged to the skill.",
+)
+ACKNOWLEDGED_BYTES = REGISTRY.counter(
+    "storj_acknowledged_bytes_total",
+    "Bytes of the files whose upload was acknowledged to the skill.",
+)
@@ -25,7 +25,7 @@ from typing import Any, Dict, cast
 from aea.mail.base_pb2 import DialogueMessage
 from aea.mail.base_pb2 import Message as ProtobufMessage
 from aea.protocols.base import Message, Serializer
-from packages.eightballer.protocols.file_storage import file_storage_pb2
+from packages.eightballer.protocols.file_storage import file_storage_pb2, wire
 from packages.eightballer.protocols.file_storage.custom_types import ErrorCode
 from packages.eightballer.protocols.file_storage.message import \
     FileStorageMessage
@@ -43,6 +43,9 @@ class FileStorageSerializer(Serializer):
         :return: the bytes.
         """
         msg = cast(FileStorageMessage, msg)
+        encoded = wire.encode(msg)
+        if encoded is not None:
+            return encoded
         message_pb = ProtobufMessage()
         dialogue_message_pb = DialogueMessage()
         file_storage_msg = file_storage_pb2.FileStorageMessage()
@@ -62,7 +65,37 @@ class FileStorageSerializer(Serializer):
             performative.filename = filename
             key = msg.key
             performative.key = key
+            fingerprint = msg.fingerprint
+            performative.fingerprint = fingerprint
             file_storage_msg.file_upload.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.FILE_UPLOAD_REF:
+            performative = file_storage_pb2.FileStorageMessage.File_Upload_Ref_Performative()  # type: ignore
+            filename = msg.filename
+            performative.filename = filename
+            key = msg.key
+            performative.key = key
+            path = msg.path
+            performative.path = path
+            offset = msg.offset
+            performative.offset = offset
+            length = msg.length
+            performative.length = length
+            fingerprint = msg.fingerprint
+            performative.fingerprint = fingerprint
+            file_storage_msg.file_upload_ref.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.FILE_UPLOAD_BATCH:
+            performative = file_storage_pb2.FileStorageMessage.File_Upload_Batch_Performative()  # type: ignore
+            keys = msg.keys
+            performative.keys.extend(keys)
+            filenames = msg.filenames
+            performative.filenames.extend(filenames)
+            contents = msg.contents
+            performative.contents.extend(contents)
+            paths = msg.paths
+            performative.paths.extend(paths)
+            fingerprints = msg.fingerprints
+            performative.fingerprints.extend(fingerprints)
+            file_storage_msg.file_upload_batch.CopyFrom(performative)
         elif performative_id == FileStorageMessage.Performative.FILE_DOWNLOAD:
             performative = file_storage_pb2.FileStorageMessage.File_Download_Performative()  # type: ignore
             access_url = msg.access_url
@@ -70,6 +103,81 @@ class FileStorageSerializer(Serializer):
             content = msg.content
             performative.content = content
             file_storage_msg.file_download.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_RECEIPT:
+            performative = file_storage_pb2.FileStorageMessage.Upload_Receipt_Performative()  # type: ignore
+            access_url = msg.access_url
+            performative.access_url = access_url
+            key = msg.key
+            performative.key = key
+            size = msg.size
+            performative.size = size
+            etag = msg.etag
+            performative.etag = etag
+            timings = msg.timings
+            performative.timings.update(timings)
+            file_storage_msg.upload_receipt.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_BEGIN:
+            performative = file_storage_pb2.FileStorageMessage.Upload_Begin_Performative()  # type: ignore
+            key = msg.key
+            performative.key = key
+            filename = msg.filename
+            performative.filename = filename
+            size = msg.size
+            performative.size = size
+            fingerprint = msg.fingerprint
+            performative.fingerprint = fingerprint
+            file_storage_msg.upload_begin.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_CHUNK:
+            performative = file_storage_pb2.FileStorageMessage.Upload_Chunk_Performative()  # type: ignore
+            key = msg.key
+            performative.key = key
+            offset = msg.offset
+            performative.offset = offset
+            content = msg.content
+            performative.content = content
+            chunk_fingerprint = msg.chunk_fingerprint
+            performative.chunk_fingerprint = chunk_fingerprint
+            file_storage_msg.upload_chunk.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_COMMIT:
+            performative = file_storage_pb2.FileStorageMessage.Upload_Commit_Performative()  # type: ignore
+            key = msg.key
+            performative.key = key
+            chunk_count = msg.chunk_count
+            performative.chunk_count = chunk_count
+            file_storage_msg.upload_commit.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT:
+            performative = file_storage_pb2.FileStorageMessage.Upload_Batch_Receipt_Performative()  # type: ignore
+            keys = msg.keys
+            performative.keys.extend(keys)
+            access_urls = msg.access_urls
+            performative.access_urls.extend(access_urls)
+            sizes = msg.sizes
+            performative.sizes.extend(sizes)
+            etags = msg.etags
+            performative.etags.extend(etags)
+            errors = msg.errors
+            performative.errors.extend(errors)
+            ranges = msg.ranges
+            performative.ranges.extend(ranges)
+            timings = msg.timings
+            performative.timings.update(timings)
+            file_storage_msg.upload_batch_receipt.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.REQUEST_URL:
+            performative = file_storage_pb2.FileStorageMessage.Request_Url_Performative()  # type: ignore
+            key = msg.key
+            performative.key = key
+            file_storage_msg.request_url.CopyFrom(performative)
+        elif performative_id == FileStorageMessage.Performative.PRESIGNED_URL:
+            performative = file_storage_pb2.FileStorageMessage.Presigned_Url_Performative()  # type: ignore
+            key = msg.key
+            performative.key = key
+            access_url = msg.access_url
+            performative.access_url = access_url
+            expires_at = msg.expires_at
+            performative.expires_at = expires_at
+            byte_range = msg.byte_range
+            performative.byte_range = byte_range
+            file_storage_msg.presigned_url.CopyFrom(performative)
         elif performative_id == FileStorageMessage.Performative.ERROR:
             performative = file_storage_pb2.FileStorageMessage.Error_Performative()  # type: ignore
             error_code = msg.error_code
@@ -101,15 +209,19 @@ class FileStorageSerializer(Serializer):
         """
         message_pb = ProtobufMessage()
         file_storage_pb = file_storage_pb2.FileStorageMessage()
-        message_pb.ParseFromString(obj)
-        message_id = message_pb.dialogue_message.message_id
-        dialogue_reference = (
-            message_pb.dialogue_message.dialogue_starter_reference,
-            message_pb.dialogue_message.dialogue_responder_reference,
-        )
-        target = message_pb.dialogue_message.target
+        parsed = wire.parse(obj, file_storage_pb)
+        if parsed is not None:
+            message_id, dialogue_reference, target = parsed
+        else:
+            message_pb.ParseFromString(obj)
+            message_id = message_pb.dialogue_message.message_id
+            dialogue_reference = (
+                message_pb.dialogue_message.dialogue_starter_reference,
+                message_pb.dialogue_message.dialogue_responder_reference,
+            )
+            target = message_pb.dialogue_message.target
 
-        file_storage_pb.ParseFromString(message_pb.dialogue_message.content)
+            file_storage_pb.ParseFromString(message_pb.dialogue_message.content)
         performative = file_storage_pb.WhichOneof("performative")
         performative_id = FileStorageMessage.Performative(str(performative))
         performative_content = dict()  # type: Dict[str, Any]
@@ -120,11 +232,111 @@ class FileStorageSerializer(Serializer):
             performative_content["filename"] = filename
             key = file_storage_pb.file_upload.key
             performative_content["key"] = key
+            fingerprint = file_storage_pb.file_upload.fingerprint
+            performative_content["fingerprint"] = fingerprint
+        elif performative_id == FileStorageMessage.Performative.FILE_UPLOAD_REF:
+            filename = file_storage_pb.file_upload_ref.filename
+            performative_content["filename"] = filename
+            key = file_storage_pb.file_upload_ref.key
+            performative_content["key"] = key
+            path = file_storage_pb.file_upload_ref.path
+            performative_content["path"] = path
+            offset = file_storage_pb.file_upload_ref.offset
+            performative_content["offset"] = offset
+            length = file_storage_pb.file_upload_ref.length
+            performative_content["length"] = length
+            fingerprint = file_storage_pb.file_upload_ref.fingerprint
+            performative_content["fingerprint"] = fingerprint
+        elif performative_id == FileStorageMessage.Performative.FILE_UPLOAD_BATCH:
+            keys = file_storage_pb.file_upload_batch.keys
+            keys_tuple = tuple(keys)
+            performative_content["keys"] = keys_tuple
+            filenames = file_storage_pb.file_upload_batch.filenames
+            filenames_tuple = tuple(filenames)
+            performative_content["filenames"] = filenames_tuple
+            contents = file_storage_pb.file_upload_batch.contents
+            contents_tuple = tuple(contents)
+            performative_content["contents"] = contents_tuple
+            paths = file_storage_pb.file_upload_batch.paths
+            paths_tuple = tuple(paths)
+            performative_content["paths"] = paths_tuple
+            fingerprints = file_storage_pb.file_upload_batch.fingerprints
+            fingerprints_tuple = tuple(fingerprints)
+            performative_content["fingerprints"] = fingerprints_tuple
         elif performative_id == FileStorageMessage.Performative.FILE_DOWNLOAD:
             access_url = file_storage_pb.file_download.access_url
             performative_content["access_url"] = access_url
             content = file_storage_pb.file_download.content
             performative_content["content"] = content
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_RECEIPT:
+            access_url = file_storage_pb.upload_receipt.access_url
+            performative_content["access_url"] = access_url
+            key = file_storage_pb.upload_receipt.key
+            performative_content["key"] = key
+            size = file_storage_pb.upload_receipt.size
+            performative_content["size"] = size
+            etag = file_storage_pb.upload_receipt.etag
+            performative_content["etag"] = etag
+            timings = file_storage_pb.upload_receipt.timings
+            timings_dict = dict(timings)
+            performative_content["timings"] = timings_dict
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_BEGIN:
+            key = file_storage_pb.upload_begin.key
+            performative_content["key"] = key
+            filename = file_storage_pb.upload_begin.filename
+            performative_content["filename"] = filename
+            size = file_storage_pb.upload_begin.size
+            performative_content["size"] = size
+            fingerprint = file_storage_pb.upload_begin.fingerprint
+            performative_content["fingerprint"] = fingerprint
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_CHUNK:
+            key = file_storage_pb.upload_chunk.key
+            performative_content["key"] = key
+            offset = file_storage_pb.upload_chunk.offset
+            performative_content["offset"] = offset
+            content = file_storage_pb.upload_chunk.content
+            performative_content["content"] = content
+            chunk_fingerprint = file_storage_pb.upload_chunk.chunk_fingerprint
+            performative_content["chunk_fingerprint"] = chunk_fingerprint
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_COMMIT:
+            key = file_storage_pb.upload_commit.key
+            performative_content["key"] = key
+            chunk_count = file_storage_pb.upload_commit.chunk_count
+            performative_content["chunk_count"] = chunk_count
+        elif performative_id == FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT:
+            keys = file_storage_pb.upload_batch_receipt.keys
+            keys_tuple = tuple(keys)
+            performative_content["keys"] = keys_tuple
+            access_urls = file_storage_pb.upload_batch_receipt.access_urls
+            access_urls_tuple = tuple(access_urls)
+            performative_content["access_urls"] = access_urls_tuple
+            sizes = file_storage_pb.upload_batch_receipt.sizes
+            sizes_tuple = tuple(sizes)
+            performative_content["sizes"] = sizes_tuple
+            etags = file_storage_pb.upload_batch_receipt.etags
+            etags_tuple = tuple(etags)
+            performative_content["etags"] = etags_tuple
+            errors = file_storage_pb.upload_batch_receipt.errors
+            errors_tuple = tuple(errors)
+            performative_content["errors"] = errors_tuple
+            ranges = file_storage_pb.upload_batch_receipt.ranges
+            ranges_tuple = tuple(ranges)
+            performative_content["ranges"] = ranges_tuple
+            timings = file_storage_pb.upload_batch_receipt.timings
+            timings_dict = dict(timings)
+            performative_content["timings"] = timings_dict
+        elif performative_id == FileStorageMessage.Performative.REQUEST_URL:
+            key = file_storage_pb.request_url.key
+            performative_content["key"] = key
+        elif performative_id == FileStorageMessage.Performative.PRESIGNED_URL:
+            key = file_storage_pb.presigned_url.key
+            performative_content["key"] = key
+            access_url = file_storage_pb.presigned_url.access_url
+            performative_content["access_url"] = access_url
+            expires_at = file_storage_pb.presigned_url.expires_at
+            performative_content["expires_at"] = expires_at
+            byte_range = file_storage_pb.presigned_url.byte_range
+            performative_content["byte_range"] = byte_range
         elif performative_id == FileStorageMessage.Performative.ERROR:
             pb2_error_code = file_storage_pb.error.error_code
             error_code = ErrorCode.decode(pb2_error_code)
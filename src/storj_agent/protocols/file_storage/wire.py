@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2021 eightballer
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Low copy wire encoding of the file_storage messages carrying file bytes."""
+
+from typing import Dict, Optional, Tuple
+
+from aea.mail.base_pb2 import DialogueMessage
+from google.protobuf.message import DecodeError
+from google.protobuf.message import Message as ProtobufMessage
+from packages.eightballer.protocols.file_storage import file_storage_pb2
+from packages.eightballer.protocols.file_storage.message import \
+    FileStorageMessage
+
+ENABLED = True
+
+_LENGTH_DELIMITED = 2
+_VARINT = 0
+_DIALOGUE_MESSAGE_FIELD = 2
+_DIALOGUE_CONTENT_FIELD = 5
+
+BULK_PERFORMATIVES = {
+    FileStorageMessage.Performative.FILE_UPLOAD: "file_upload",
+    FileStorageMessage.Performative.FILE_DOWNLOAD: "file_download",
+    FileStorageMessage.Performative.UPLOAD_CHUNK: "upload_chunk",
+}  # type: Dict[FileStorageMessage.Performative, str]
+
+
+def _varint(value: int) -> bytes:
+    """Encode a non negative integer as a protobuf varint."""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _key(field_number: int, wire_type: int) -> bytes:
+    """Encode the key of a field."""
+    return _varint((field_number << 3) | wire_type)
+
+
+def _field_number(message: ProtobufMessage, name: str) -> int:
+    """Get the number of a field of a protobuf message."""
+    return message.DESCRIPTOR.fields_by_name[name].number
+
+
+def encode(msg: FileStorageMessage) -> Optional[bytes]:
+    """
+    Encode a message carrying file bytes with a single copy of the bytes.
+
+    The generic serializer builds the performative, copies it into the
+    protocol message, serializes that into the dialogue message, copies the
+    dialogue message into the envelope message and serializes it again, the
+    file bytes being copied at every step. Here every field but the content
+    is serialized by protobuf, then the length prefixes of the enclosing
+    messages are written by hand and the content is appended once, as the
+    last field of the performative. Protobuf parsers accept fields in any
+    order, so the output decodes like the generic one.
+
+    :param msg: the message.
+    :return: the encoded message, or None if the message has no fast path.
+    """
+    name = BULK_PERFORMATIVES.get(msg.performative)
+    if not ENABLED or name is None:
+        return None
+    content = msg.content
+    file_storage_msg = file_storage_pb2.FileStorageMessage()
+    performative = getattr(file_storage_msg, name)
+    for field in performative.DESCRIPTOR.fields:
+        if field.name != "content":
+            setattr(performative, field.name, getattr(msg, field.name))
+    head = performative.SerializeToString()
+    content_head = _key(
+        _field_number(performative, "content"), _LENGTH_DELIMITED
+    ) + _varint(len(content))
+    performative_length = len(head) + len(content_head) + len(content)
+    performative_head = _key(
+        _field_number(file_storage_msg, name), _LENGTH_DELIMITED
+    ) + _varint(performative_length)
+    file_storage_length = len(performative_head) + performative_length
+
+    dialogue_message_pb = DialogueMessage()
+    dialogue_message_pb.message_id = msg.message_id
+    dialogue_message_pb.dialogue_starter_reference = msg.dialogue_reference[0]
+    dialogue_message_pb.dialogue_responder_reference = msg.dialogue_reference[1]
+    dialogue_message_pb.target = msg.target
+    dialogue_head = dialogue_message_pb.SerializeToString() + (
+        _key(_DIALOGUE_CONTENT_FIELD, _LENGTH_DELIMITED) + _varint(file_storage_length)
+    )
+    dialogue_length = len(dialogue_head) + file_storage_length
+    message_head = _key(_DIALOGUE_MESSAGE_FIELD, _LENGTH_DELIMITED) + _varint(
+        dialogue_length
+    )
+    return b"".join(
+        (message_head, dialogue_head, performative_head, head, content_head, content)
+    )
+
+
+def _read_varint(view: memoryview, position: int) -> Tuple[int, int]:
+    """Read a varint, returning its value and the position after it."""
+    value = 0
+    shift = 0
+    while True:
+        if position >= len(view):
+            raise DecodeError("Truncated varint.")
+        if shift > 63:
+            raise DecodeError("Too many bytes when decoding varint.")
+        byte = view[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def _read_length_delimited(view: memoryview, position: int) -> Tuple[memoryview, int]:
+    """Read a length delimited value, returning it and the position after it."""
+    length, position = _read_varint(view, position)
+    end = position + length
+    if end > len(view):
+        raise DecodeError("Truncated message.")
+    return view[position:end], end
+
+
+def _int32(value: int) -> int:
+    """Get the signed value of a varint encoded int32."""
+    value &= 0xFFFFFFFF
+    return value - (1 << 32) if value & 0x80000000 else value
+
+
+def parse(
+    obj: bytes, file_storage_pb: ProtobufMessage
+) -> Optional[Tuple[int, Tuple[str, str], int]]:
+    """
+    Parse an encoded message, skipping the copy of the dialogue content.
+
+    The generic serializer parses the envelope message, which copies the
+    dialogue content out, then parses that copy. Here the dialogue message is
+    walked in place and the protocol message is parsed straight from a view
+    of the content.
+
+    :param obj: the encoded message.
+    :param file_storage_pb: the protocol message to parse the content into.
+    :return: the message id, dialogue reference and target, or None if the
+        message has no dialogue message.
+    :raises DecodeError: if the message is truncated or corrupt.
+    """
+    if not ENABLED:
+        return None
+    view = memoryview(obj)
+    position = 0
+    dialogue = None  # type: Optional[memoryview]
+    while position < len(view):
+        key, position = _read_varint(view, position)
+        if key & 7 != _LENGTH_DELIMITED:
+            return None
+        value, position = _read_length_delimited(view, position)
+        if key >> 3 == _DIALOGUE_MESSAGE_FIELD:
+            dialogue = value
+    if dialogue is None:
+        return None
+
+    fields = {1: 0, 2: "", 3: "", 4: 0}  # type: Dict[int, object]
+    content = dialogue[0:0]
+    position = 0
+    while position < len(dialogue):
+        key, position = _read_varint(dialogue, position)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == _VARINT:
+            value, position = _read_varint(dialogue, position)
+            fields[number] = _int32(value)
+        elif wire_type == _LENGTH_DELIMITED:
+            value, position = _read_length_delimited(dialogue, position)
+            if number == _DIALOGUE_CONTENT_FIELD:
+                content = value
+            else:
+                try:
+                    fields[number] = str(value, "utf-8")
+                except UnicodeDecodeError as e:
+                    raise DecodeError(f"Invalid string field: {e}") from e
+        else:
+            return None
+    try:
+        file_storage_pb.ParseFromString(content)
+    except TypeError:
+        file_storage_pb.ParseFromString(content.tobytes())
+    return (
+        int(fields[1]),  # type: ignore
+        (str(fields[2]), str(fields[3])),
+        int(fields[4]),  # type: ignore
+    )
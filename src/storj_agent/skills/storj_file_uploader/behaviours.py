@@ -18,61 +18,484 @@
 # ------------------------------------------------------------------------------
 
 """This package contains a scaffold of a behaviour."""
-import glob
-from hashlib import md5
-from typing import cast
+import hashlib
+import os
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, cast
 
 from aea.mail.base import Envelope
 from aea.skills.behaviours import TickerBehaviour
-from packages.eightballer.protocols.file_storage.message import \
-    FileStorageMessage
-from packages.eightballer.skills.storj_file_uploader import \
-    PUBLIC_ID as SENDER_ID
-from packages.eightballer.skills.storj_file_uploader.strategy import Strategy
+from packages.eightballer.protocols.file_storage.keys import object_key
+from packages.eightballer.protocols.file_storage.message import FileStorageMessage
+from packages.eightballer.protocols.file_storage.metrics import (
+    FAILURES,
+    HASH_SECONDS,
+    HASHED_BYTES,
+    SCAN_SECONDS,
+    SCANNED_FILES,
+    SCHEDULE_WAIT_SECONDS,
+    SENT_FILES,
+)
+from packages.eightballer.skills.storj_file_uploader import PUBLIC_ID as SENDER_ID
+from packages.eightballer.skills.storj_file_uploader.hashing import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_HASH_ALGORITHM,
+    DEFAULT_HASH_WORKERS,
+    fingerprint_file,
+    make_hash_pool,
+    new_hasher,
+)
+from packages.eightballer.skills.storj_file_uploader.ledger import UploadLedger
+from packages.eightballer.skills.storj_file_uploader.scanner import (
+    ScanIndex,
+    UploadRoot,
+    find_root,
+    stat_key,
+)
+from packages.eightballer.skills.storj_file_uploader.scheduler import (
+    ScheduledFile,
+    UploadScheduler,
+)
+from packages.eightballer.skills.storj_file_uploader.strategy import (
+    PendingUpload,
+    Strategy,
+)
+from packages.eightballer.skills.storj_file_uploader.watcher import (
+    WATCH_MODES,
+    FileWatcher,
+)
+
+
+class StreamCursor(NamedTuple):
+    """The progress of a file streamed over several ticks."""
+
+    path: str
+    stat_result: os.stat_result
+    offset: int
+    chunk_count: int
 
 
 class StorjFileUploadBehaviour(TickerBehaviour):
     """This class scaffolds a behaviour."""
 
     @property
-    def uploaded_ids(self) -> list:
+    def uploaded_ids(self) -> UploadLedger:
         """store uploaded file hashs"""
         strategy = cast(Strategy, self.context.strategy)
         return strategy.uploaded_files
 
     def __init__(self, *args, **kwargs):
-        self._upload_dir = kwargs.pop("upload_dir")
+        upload_roots = kwargs.pop("upload_roots", None)
+        upload_dir = kwargs.pop("upload_dir", None)
+        if upload_roots:
+            self._roots = [UploadRoot.from_config(root) for root in upload_roots]
+        elif upload_dir:
+            self._roots = [UploadRoot.from_pattern(upload_dir)]
+        else:
+            raise ValueError("One of upload_roots or upload_dir must be set.")
         self._uploaded_ids = kwargs.pop("uploaded_ids")
+        self._scan_index = ScanIndex(kwargs.pop("scan_index_path", None))
+        self._hash_algorithm = kwargs.pop("hash_algorithm", DEFAULT_HASH_ALGORITHM)
+        self._hash_chunk_size = kwargs.pop("hash_chunk_size", DEFAULT_CHUNK_SIZE)
+        new_hasher(self._hash_algorithm)
+        self._hash_workers = kwargs.pop("hash_workers", DEFAULT_HASH_WORKERS)
+        self._hash_executor = kwargs.pop("hash_executor", "thread")
+        self._hash_pool = None
+        self._upload_by_reference = kwargs.pop("upload_by_reference", False)
+        self._stream_chunk_size = kwargs.pop("stream_chunk_size", 0)
+        self._stream_chunks_per_tick = kwargs.pop("stream_chunks_per_tick", 0)
+        self._streams = {}  # type: Dict[str, StreamCursor]
+        self._batch_max_files = kwargs.pop("batch_max_files", 0)
+        self._batch_max_file_size = kwargs.pop("batch_max_file_size", 0)
+        self._watch_mode = kwargs.pop("watch_mode", "poll")
+        if self._watch_mode not in WATCH_MODES:
+            raise ValueError(f"watch_mode must be one of {WATCH_MODES}.")
+        if self._watch_mode == "events" and not FileWatcher.available():
+            raise ValueError("watch_mode 'events' requires the 'watchdog' package.")
+        self._poll_interval = kwargs.pop("poll_interval", 0)
+        self._rescan_interval = kwargs.pop("rescan_interval", 300)
+        self._watcher = None  # type: Optional[FileWatcher]
+        self._next_scan = 0.0
+        self._deferred = set()  # type: Set[str]
+        self._stable_after = kwargs.pop("stable_after", 0)
+        self._partial_suffixes = tuple(kwargs.pop("partial_suffixes", ()))
+        self._complete = set()  # type: Set[str]
+        self._pending = {}  # type: Dict[Future, Tuple[str, os.stat_result]]
+        self._scheduler = UploadScheduler(
+            policy=kwargs.pop("schedule_policy", "fifo"),
+            tick_bytes=kwargs.pop("schedule_tick_bytes", 0),
+            max_wait=kwargs.pop("schedule_max_wait", 0),
+        )
+        self._upload_retry_delay = kwargs.pop("upload_retry_delay", 30)
+        self._uploading = set()  # type: Set[str]
+        self._retries = []  # type: List[Tuple[float, ScheduledFile]]
         super().__init__(*args, **kwargs)
 
     def setup(self) -> None:
         """Implement the setup."""
         self.log = self.context.logger.info
         self.log(f"setting up storj behaviour")
+        self._hash_pool = make_hash_pool(self._hash_workers, self._hash_executor)
+        if self._watch_mode != "poll" and FileWatcher.available():
+            self._start_watcher()
+
+    def _start_watcher(self) -> None:
+        """Watch the upload roots for file events, or fall back to polling them."""
+        watcher = FileWatcher(self._roots)
+        try:
+            watcher.start()
+        except OSError as e:
+            if self._watch_mode == "events":
+                raise
+            self.context.logger.warning(
+                f"Could not watch the upload roots ({e}), polling them instead."
+            )
+            return
+        self._watcher = watcher
+        self.log(f"watching {len(self._roots)} upload roots for file events")
 
     def act(self) -> None:
-        """Implement the act."""
-        strategy = cast(Strategy, self.context.strategy)
-        available_files = glob.glob(self._upload_dir)
-        for file in available_files:
-            file_bytes = open(file, "rb").read()
-            id = md5(file_bytes).hexdigest()
-            if id not in strategy.uploaded_files:
-                self.log(f"Not already uploaded file.. Uploading.")
-                self.__create_envelope(file_bytes, file, id)
-                strategy.uploaded_files.append(id)
+        """
+        Implement the act.
+
+        The receipts and hashes which came back since the previous tick are
+        collected first and the files the scheduler picks for this tick are
+        sent, then the new or modified files are submitted to the hash pool so
+        the agent loop never waits on file reads.
+        """
+        self._collect_uploads()
+        self._collect_hashes()
+        self._send_scheduled()
+        self._send_stream_chunks()
+        pending_paths = {file for file, _ in self._pending.values()}
+        started = time.perf_counter()
+        kind, paths = self._changed_files()
+        changed_files = list(paths)
+        if kind is not None:
+            SCAN_SECONDS.observe(time.perf_counter() - started, kind=kind)
+        SCANNED_FILES.inc(len(changed_files))
+        now = time.time()
+        for file, stat_result in changed_files:
+            if file.endswith(self._partial_suffixes):
+                continue
+            if self._scheduler.is_queued(file) or file in self._uploading:
+                # checked for changes when sent, recorded once uploaded
+                continue
+            if file in pending_paths or not self._is_complete(file, stat_result, now):
+                # still being hashed or written, checked again later
+                self._deferred.add(file)
+                continue
+            self._complete.discard(file)
+            future = self._hash_pool.submit(
+                fingerprint_file, file, self._hash_algorithm, self._hash_chunk_size
+            )
+            future.add_done_callback(self._hash_done(time.perf_counter()))
+            self._pending[future] = (file, stat_result)
+        self._scan_index.save()
+
+    def _changed_files(
+        self,
+    ) -> Tuple[Optional[str], Iterable[Tuple[str, os.stat_result]]]:
+        """
+        Get the new or modified files.
+
+        When watching for file events only the paths of the events since the
+        previous tick are checked, and the upload roots are walked every
+        `rescan_interval` seconds in case events were lost. When polling the
+        roots are walked every `poll_interval` seconds.
+
+        :return: the kind of scan, full, events or None if no scan is due, and the (path, stat result) of the files.
+        """
+        now = time.monotonic()
+        if self._watcher is not None and now < self._next_scan:
+            paths = self._deferred.union(self._drain_events())
+            self._deferred.clear()
+            return "events", self._scan_index.changed_paths(sorted(paths))
+        if now < self._next_scan:
+            return None, ()
+        # the scan covers the deferred files and the events received so far
+        self._deferred.clear()
+        if self._watcher is not None:
+            self._drain_events()
+            self._next_scan = now + self._rescan_interval
+        else:
+            self._next_scan = now + self._poll_interval
+        return "full", self._scan_index.changed_files(self._roots)
+
+    def _drain_events(self) -> List[str]:
+        """Get the paths of the file events, noting the files they tell are complete."""
+        events = self._watcher.drain()
+        for path, complete in events.items():
+            if complete:
+                self._complete.add(path)
             else:
+                self._complete.discard(path)
+        return list(events)
+
+    def _is_complete(self, file: str, stat_result: os.stat_result, now: float) -> bool:
+        """
+        Check whether a file is completely written, and can be uploaded.
+
+        A file is complete once it was not modified for `stable_after`
+        seconds, or right away if its last file event was the close of the
+        writer or the move of the file into place. Files named with one of the
+        `partial_suffixes` are never complete, they are expected to be renamed
+        once written.
+
+        :param file: the path of the file.
+        :param stat_result: the stat data of the file.
+        :param now: the current time.
+        :return: whether the file is complete.
+        """
+        return (
+            file in self._complete or now - stat_result.st_mtime >= self._stable_after
+        )
+
+    @staticmethod
+    def _hash_done(started: float):
+        """Get the callback timing a hash submitted at `started`."""
+        return lambda future: HASH_SECONDS.observe(time.perf_counter() - started)
+
+    def _collect_uploads(self) -> None:
+        """
+        Record the files whose upload succeeded, and queue the failed ones again.
+
+        A file is recorded in the scan index only once the connection acknowledged
+        its upload, so a file which was not uploaded is hashed and sent again
+        after a restart. A failed file is queued again `upload_retry_delay`
+        seconds later.
+        """
+        strategy = cast(Strategy, self.context.strategy)
+        now = time.monotonic()
+        for upload, error in strategy.pop_finished():
+            if not error:
+                self._uploading.discard(upload.path)
+                self._scan_index.record(
+                    upload.path, upload.stat_result, upload.fingerprint
+                )
                 continue
+            self._streams.pop(upload.key, None)
+            self.context.logger.warning(
+                f"upload of {upload.path} failed: {error}, retrying in {self._upload_retry_delay}s."
+            )
+            scheduled = ScheduledFile(
+                upload.path, upload.key, upload.fingerprint, upload.stat_result, now
+            )
+            self._retries.append((now + self._upload_retry_delay, scheduled))
+        due = [retry for retry in self._retries if retry[0] <= now]
+        if not due:
+            return
+        self._retries = [retry for retry in self._retries if retry[0] > now]
+        for _, scheduled in due:
+            self._uploading.discard(scheduled.path)
+            root = find_root(self._roots, scheduled.path)
+            self._scheduler.push(
+                scheduled._replace(queued_at=now),
+                root,
+                1.0 if root is None else root.weight,
+            )
 
-    def __create_envelope(self, bytes, filename, fileid) -> None:
-        receiver_id = "eightballer/storj_file_transfer:0.1.0"
-        self.log(f"Sender ID {SENDER_ID}")
+    def _collect_hashes(self) -> None:
+        """Queue the files whose hash is ready and not in the ledger yet."""
+        strategy = cast(Strategy, self.context.strategy)
+        done = [future for future in self._pending if future.done()]
+        for future in done:
+            file, stat_result = self._pending.pop(future)
+            try:
+                id = future.result()
+            except OSError as e:
+                self.context.logger.warning(f"Could not hash {file}: {e}")
+                FAILURES.inc(stage="hash")
+                continue
+            if self._is_changed(file, stat_result):
+                self.log(f"{file} changed while being hashed, hashing it again.")
+                continue
+            HASHED_BYTES.inc(stat_result.st_size)
+            root = find_root(self._roots, file)
+            key = id if root is None else root.key_prefix + id
+            if key in strategy.uploaded_files or key in self._scheduler:
+                self._scan_index.record(file, stat_result, id)
+                continue
+            if strategy.is_uploading(key):
+                # the same content is being uploaded from another path
+                continue
+            self._scheduler.push(
+                ScheduledFile(file, key, id, stat_result, time.monotonic()),
+                root,
+                1.0 if root is None else root.weight,
+            )
+
+    def _is_changed(self, file: str, stat_result: os.stat_result) -> bool:
+        """
+        Check whether a file was modified since it was stat, deferring it if so.
+
+        :param file: the path of the file.
+        :param stat_result: the stat data of the file.
+        :return: whether the file was modified or removed.
+        """
+        try:
+            # inodes are left out, scandir does not report them on Windows
+            changed = stat_key(os.stat(file))[:2] != stat_key(stat_result)[:2]
+        except FileNotFoundError:
+            return True
+        if changed:
+            self._deferred.add(file)
+        return changed
+
+    def _send_scheduled(self) -> None:
+        """
+        Send the files the scheduler picks for this tick.
+
+        Files of at most `batch_max_file_size` bytes are grouped in batches of
+        up to `batch_max_files` files. Other files are sent by reference if
+        `upload_by_reference` is set, whatever their size, else streamed if
+        larger than `stream_chunk_size`, else inline.
+        """
+        strategy = cast(Strategy, self.context.strategy)
+        batch = []  # type: List[Tuple[str, str, str]]
+        now = time.monotonic()
+        for scheduled in self._scheduler.tick(now):
+            file, key, id, stat_result, queued_at = scheduled
+            if self._is_changed(file, stat_result):
+                continue
+            SCHEDULE_WAIT_SECONDS.observe(now - queued_at)
+            strategy.upload_sent(
+                object_key(key, file), PendingUpload(key, file, id, stat_result)
+            )
+            self._uploading.add(file)
+            self.log(f"Not already uploaded file.. Uploading.")
+            if self._batch_max_files > 1 and (
+                stat_result.st_size <= self._batch_max_file_size
+            ):
+                batch.append((file, key, id))
+                if len(batch) == self._batch_max_files:
+                    self.__create_batch_envelope(batch)
+                    batch = []
+            elif self._upload_by_reference:
+                self.__create_ref_envelope(file, stat_result.st_size, key, id)
+            elif 0 < self._stream_chunk_size < stat_result.st_size:
+                self.__create_stream_envelopes(file, stat_result, key, id)
+            else:
+                with open(file, "rb") as f:
+                    file_bytes = f.read()
+                self.__create_envelope(file_bytes, file, key, id)
+        if batch:
+            self.__create_batch_envelope(batch)
+
+    def __create_envelope(self, bytes, filename, fileid, fingerprint) -> None:
         msg = FileStorageMessage(
             performative=FileStorageMessage.Performative.FILE_UPLOAD,
             content=bytes,
             key=fileid,
             filename=filename,
+            fingerprint=fingerprint,
         )
+        self.__send(msg)
+        SENT_FILES.inc(mode="inline")
+
+    def __create_ref_envelope(self, filename, size, fileid, fingerprint) -> None:
+        msg = FileStorageMessage(
+            performative=FileStorageMessage.Performative.FILE_UPLOAD_REF,
+            filename=filename,
+            key=fileid,
+            path=os.path.abspath(filename),
+            offset=0,
+            length=size,
+            fingerprint=fingerprint,
+        )
+        self.__send(msg)
+        SENT_FILES.inc(mode="reference")
+
+    def __create_batch_envelope(self, files) -> None:
+        contents = []
+        paths = []
+        for filename, _, _ in files:
+            if self._upload_by_reference:
+                contents.append(b"")
+                paths.append(os.path.abspath(filename))
+            else:
+                with open(filename, "rb") as f:
+                    contents.append(f.read())
+                paths.append("")
+        msg = FileStorageMessage(
+            performative=FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+            keys=tuple(fileid for _, fileid, _ in files),
+            filenames=tuple(filename for filename, _, _ in files),
+            contents=tuple(contents),
+            paths=tuple(paths),
+            fingerprints=tuple(fingerprint for _, _, fingerprint in files),
+        )
+        self.__send(msg)
+        SENT_FILES.inc(len(files), mode="batch")
+
+    def __create_stream_envelopes(
+        self, filename, stat_result, fileid, fingerprint
+    ) -> None:
+        msg = FileStorageMessage(
+            performative=FileStorageMessage.Performative.UPLOAD_BEGIN,
+            key=fileid,
+            filename=filename,
+            size=stat_result.st_size,
+            fingerprint=fingerprint,
+        )
+        self.__send(msg)
+        self._streams[fileid] = StreamCursor(filename, stat_result, 0, 0)
+        SENT_FILES.inc(mode="stream")
+
+    def _send_stream_chunks(self) -> None:
+        """
+        Send the next chunks of the files being streamed.
+
+        At most `stream_chunks_per_tick` chunks are read and sent per tick,
+        all of them if 0, the streams being served in the order they began.
+        A stream whose file changed is dropped and its upload failed, so the
+        file is hashed and sent again.
+        """
+        strategy = cast(Strategy, self.context.strategy)
+        budget = self._stream_chunks_per_tick or None
+        for key, cursor in list(self._streams.items()):
+            if budget is not None and budget <= 0:
+                break
+            if self._is_changed(cursor.path, cursor.stat_result):
+                del self._streams[key]
+                strategy.upload_finished(key, f"{cursor.path} changed while streamed")
+                continue
+            offset, chunk_count = cursor.offset, cursor.chunk_count
+            with open(cursor.path, "rb") as f:
+                f.seek(offset)
+                while budget is None or budget > 0:
+                    chunk = f.read(self._stream_chunk_size)
+                    if not chunk:
+                        break
+                    msg = FileStorageMessage(
+                        performative=FileStorageMessage.Performative.UPLOAD_CHUNK,
+                        key=key,
+                        offset=offset,
+                        content=chunk,
+                        chunk_fingerprint=hashlib.md5(chunk).hexdigest(),
+                    )
+                    self.__send(msg)
+                    chunk_count += 1
+                    offset += len(chunk)
+                    if budget is not None:
+                        budget -= 1
+            if offset < cursor.stat_result.st_size:
+                self._streams[key] = cursor._replace(
+                    offset=offset, chunk_count=chunk_count
+                )
+                continue
+            del self._streams[key]
+            msg = FileStorageMessage(
+                performative=FileStorageMessage.Performative.UPLOAD_COMMIT,
+                key=key,
+                chunk_count=chunk_count,
+            )
+            self.__send(msg)
+
+    def __send(self, msg: FileStorageMessage) -> None:
+        receiver_id = "eightballer/storj_file_transfer:0.1.0"
+        self.log(f"Sender ID {SENDER_ID}")
         msg.sender = str(SENDER_ID)
         msg.to = receiver_id
         file_upload_envolope = Envelope(
@@ -82,4 +505,9 @@ class StorjFileUploadBehaviour(TickerBehaviour):
 
     def teardown(self) -> None:
         """Implement the task teardown."""
+        if self._watcher is not None:
+            self._watcher.stop()
+        if self._hash_pool is not None:
+            self._hash_pool.shutdown(wait=True)
+        self._scan_index.save()
         self.log(f"Tearing down storj behaviour")
@@ -24,8 +24,13 @@ from typing import Optional, cast
 from aea.configurations.base import PublicId
 from aea.protocols.base import Message
 from aea.skills.base import Handler
-from packages.eightballer.protocols.file_storage.message import \
-    FileStorageMessage
+from packages.eightballer.protocols.file_storage.message import FileStorageMessage
+from packages.eightballer.protocols.file_storage.metrics import (
+    ACKNOWLEDGED_BYTES,
+    ACKNOWLEDGED_FILES,
+    RECEIPTS,
+)
+from packages.eightballer.skills.storj_file_uploader.registry import url_key
 from packages.eightballer.skills.storj_file_uploader.strategy import Strategy
 
 
@@ -46,10 +51,55 @@ class FileStorageHandler(Handler):
         :param message: the message
         """
         strategy = cast(Strategy, self.context.strategy)
+        RECEIPTS.inc(performative=str(message.performative))
 
-        if message.access_url not in strategy.file_urls.keys():
-            strategy.file_urls[message.access_url] = message
-            self.log(f"receieved new url and saved in strategy {message.access_url}")
+        if message.performative == FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT:
+            self._handle_batch_receipt(message, strategy)
+            return
+
+        if message.performative == FileStorageMessage.Performative.UPLOAD_RECEIPT:
+            strategy.url_registry.register(
+                message.access_url, message.key, message.size, message.etag
+            )
+            strategy.upload_finished(message.key)
+            ACKNOWLEDGED_FILES.inc()
+            ACKNOWLEDGED_BYTES.inc(message.size)
+        elif message.performative == FileStorageMessage.Performative.ERROR:
+            key = message.error_data.get("key", b"").decode("utf-8")
+            self.context.logger.warning(f"request of {key} failed: {message.error_msg}")
+            strategy.upload_finished(key, message.error_msg)
+            strategy.url_request_failed(key)
+            return
+        elif message.performative == FileStorageMessage.Performative.PRESIGNED_URL:
+            strategy.register_presigned_url(
+                message.key, message.access_url, message.expires_at, message.byte_range
+            )
+        else:
+            # a FILE_DOWNLOAD reply names the object only through its url
+            strategy.url_registry.register(message.access_url)
+            strategy.upload_finished(url_key(message.access_url))
+        self.log(f"receieved new url and saved in strategy {message.access_url}")
+
+    def _handle_batch_receipt(
+        self, message: FileStorageMessage, strategy: Strategy
+    ) -> None:
+        """Register the urls of the files of a batch which were uploaded, and its failures."""
+        for key, url, size, etag, error, byte_range in zip(
+            message.keys,
+            message.access_urls,
+            message.sizes,
+            message.etags,
+            message.errors,
+            message.ranges,
+        ):
+            strategy.upload_finished(key, error)
+            if error:
+                self.context.logger.warning(f"upload of {key} failed: {error}")
+                continue
+            strategy.url_registry.register(url, key, size, etag, byte_range=byte_range)
+            ACKNOWLEDGED_FILES.inc()
+            ACKNOWLEDGED_BYTES.inc(size)
+        self.log(f"receieved {len(message.keys)} urls and saved in strategy")
 
     def teardown(self) -> None:
         """Implement the handler teardown."""
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the streaming file fingerprint helpers."""
+
+import hashlib
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import Any
+
+DEFAULT_HASH_ALGORITHM = "md5"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_HASH_WORKERS = 4
+
+
+def new_hasher(algorithm: str = DEFAULT_HASH_ALGORITHM) -> Any:
+    """
+    Get a new hash object for the algorithm.
+
+    Any algorithm known to `hashlib` can be used, `md5` keeps the fingerprint
+    equal to the S3 ETag of single part uploads while `blake2b` is faster.
+    `blake3` is supported if the optional `blake3` package is installed.
+
+    :param algorithm: the name of the hash algorithm.
+    :return: the hash object.
+    """
+    if algorithm == "blake3":
+        try:
+            import blake3  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise ValueError(
+                "Hash algorithm 'blake3' requires the 'blake3' package."
+            ) from e
+        return blake3.blake3()
+    return hashlib.new(algorithm)
+
+
+def fingerprint_file(
+    path: str,
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> str:
+    """
+    Hash a file by streaming it through a fixed size buffer.
+
+    Memory use is bounded by `chunk_size` whatever the size of the file.
+
+    :param path: the path of the file.
+    :param algorithm: the name of the hash algorithm.
+    :param chunk_size: the size of the read buffer in bytes.
+    :return: the hex digest of the file content.
+    """
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as file:
+        while True:
+            size = file.readinto(buffer)
+            if not size:
+                break
+            hasher.update(view[:size])
+    return hasher.hexdigest()
+
+
+def make_hash_pool(
+    workers: int = DEFAULT_HASH_WORKERS, kind: str = "thread"
+) -> Executor:
+    """
+    Create the executor files are hashed on.
+
+    Threads are enough for large files as `hashlib` releases the GIL while
+    hashing big buffers, processes help when hashing many small files.
+
+    :param workers: the number of workers.
+    :param kind: either `thread` or `process`.
+    :return: the executor.
+    """
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown hash executor {kind}, expected thread or process.")
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the ledger of the uploaded file ids."""
+
+import os
+from typing import IO, Optional, Set
+
+
+class UploadLedger:
+    """
+    Set of uploaded file ids backed by an append-only log.
+
+    The log holds one file id per line. It is only read the first time the
+    ledger is queried, after that membership checks are plain set lookups and
+    every new id costs a single appended line.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initialize the ledger.
+
+        :param path: the log file, the ledger is kept in memory only if None.
+        """
+        self._path = path
+        self._ids = None  # type: Optional[Set[str]]
+        self._log = None  # type: Optional[IO[str]]
+
+    @property
+    def ids(self) -> Set[str]:
+        """Get the uploaded ids, loading them from the log on first access."""
+        if self._ids is None:
+            self._ids = set()
+            if self._path is not None and os.path.exists(self._path):
+                with open(self._path, "r") as log:
+                    self._ids.update(line.strip() for line in log if line.strip())
+        return self._ids
+
+    def __contains__(self, file_id: object) -> bool:
+        """Check whether a file id was uploaded already."""
+        return file_id in self.ids
+
+    def __len__(self) -> int:
+        """Get the number of uploaded file ids."""
+        return len(self.ids)
+
+    def add(self, file_id: str) -> None:
+        """
+        Record an uploaded file id.
+
+        :param file_id: the id of the uploaded file.
+        """
+        if file_id in self.ids:
+            return
+        self.ids.add(file_id)
+        if self._path is None:
+            return
+        if self._log is None:
+            self._log = open(self._path, "a")
+        self._log.write(file_id + "\n")
+        self._log.flush()
+
+    def close(self) -> None:
+        """Close the log file."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
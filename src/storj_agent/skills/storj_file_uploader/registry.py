@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the bounded registry of the uploaded file urls."""
+
+import shelve
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+DEFAULT_URL_TTL = 604800
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class UrlRecord(NamedTuple):
+    """The access url of an uploaded object and its metadata."""
+
+    url: str
+    size: int
+    etag: str
+    expires_at: float
+    byte_range: str = ""
+
+
+def url_key(url: str) -> str:
+    """Get the object key of a presigned url, the last segment of its path."""
+    return urlparse(url).path.rsplit("/", 1)[-1]
+
+
+class UrlRegistry:
+    """
+    Bounded map of object keys to their access url.
+
+    Records are kept in least recently used order and evicted once either
+    `max_entries` or `max_bytes` is exceeded, the byte budget counting the
+    strings held by each record. Records expire `ttl` seconds after they are
+    registered, matching the expiry of the presigned urls. If `spill_path` is
+    set, records evicted for lack of room are moved to a shelve on disk and
+    brought back in memory the next time they are looked up, otherwise they
+    are dropped.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_URL_TTL,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        :param max_entries: the maximum number of records held in memory.
+        :param max_bytes: the maximum number of bytes held in memory.
+        :param ttl: the lifetime of a record in seconds.
+        :param spill_path: the shelve evicted records are moved to, dropped if None.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._records = OrderedDict()  # type: OrderedDict[str, UrlRecord]
+        self._bytes = 0
+        self._spill_path = spill_path
+        self._spill = None  # type: Optional[shelve.Shelf]
+
+    @staticmethod
+    def _record_bytes(key: str, record: UrlRecord) -> int:
+        """Get the number of bytes a record counts for in the budget."""
+        return len(key) + len(record.url) + len(record.etag) + len(record.byte_range)
+
+    @property
+    def spill(self) -> Optional[shelve.Shelf]:
+        """Get the spill shelve, opening it on first access."""
+        if self._spill is None and self._spill_path is not None:
+            self._spill = shelve.open(self._spill_path)
+        return self._spill
+
+    def __len__(self) -> int:
+        """Get the number of records held in memory."""
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a valid url is registered for an object key."""
+        return isinstance(key, str) and self.get(key) is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Get the number of bytes held in memory."""
+        return self._bytes
+
+    def register(
+        self,
+        url: str,
+        key: Optional[str] = None,
+        size: int = 0,
+        etag: str = "",
+        expires_at: Optional[float] = None,
+        byte_range: str = "",
+        now: Optional[float] = None,
+    ) -> UrlRecord:
+        """
+        Register the access url of an uploaded object.
+
+        :param url: the access url.
+        :param key: the object key, taken from the url if None.
+        :param size: the size of the object in bytes.
+        :param etag: the ETag of the object.
+        :param expires_at: the expiry time of the url, `ttl` from now if None.
+        :param byte_range: the HTTP Range of the object in the url, if packed.
+        :param now: the registration time, the current time if None.
+        :return: the registered record.
+        """
+        now = time.time() if now is None else now
+        key = url_key(url) if key is None else key
+        expires_at = now + self.ttl if expires_at is None else expires_at
+        record = UrlRecord(url, size, etag, expires_at, byte_range)
+        self._pop(key)
+        self._records[key] = record
+        self._bytes += self._record_bytes(key, record)
+        self._evict(now)
+        return record
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[UrlRecord]:
+        """
+        Get the record of an object key.
+
+        :param key: the object key.
+        :param now: the lookup time, the current time if None.
+        :return: the record, or None if it is unknown or expired.
+        """
+        now = time.time() if now is None else now
+        record = self._records.get(key)
+        if record is None and self.spill is not None and key in self.spill:
+            record = UrlRecord(*self.spill.pop(key))
+            self._records[key] = record
+            self._bytes += self._record_bytes(key, record)
+        if record is None:
+            return None
+        if record.expires_at <= now:
+            self._pop(key)
+            return None
+        self._records.move_to_end(key)
+        self._evict(now)
+        return self._records.get(key)
+
+    def _pop(self, key: str) -> None:
+        """Remove a record from memory and from the spill."""
+        record = self._records.pop(key, None)
+        if record is not None:
+            self._bytes -= self._record_bytes(key, record)
+        if self.spill is not None and key in self.spill:
+            del self.spill[key]
+
+    def _evict(self, now: float) -> None:
+        """
+        Evict the least recently used records until the registry fits its budget.
+
+        Expired records are dropped instead of being spilled. Only the least
+        recently used end is checked for expiry, records expired elsewhere are
+        dropped when they are looked up.
+        """
+        while self._records:
+            key, record = next(iter(self._records.items()))
+            expired = record.expires_at <= now
+            if not (
+                expired
+                or len(self._records) > self.max_entries
+                or self._bytes > self.max_bytes
+            ):
+                break
+            self._records.popitem(last=False)
+            self._bytes -= self._record_bytes(key, record)
+            if not expired and self.spill is not None:
+                self.spill[key] = tuple(record)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the size of the registry."""
+        return {
+            "entries": len(self._records),
+            "bytes": self._bytes,
+            "spilled": len(self.spill) if self.spill is not None else 0,
+        }
+
+    def close(self) -> None:
+        """Close the spill shelve."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the directory scanner and its stat based change index."""
+
+import fnmatch
+import json
+import os
+import stat
+from typing import (Any, Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    Sequence, Tuple)
+
+StatKey = Tuple[int, int, int]
+
+
+def stat_key(stat_result: os.stat_result) -> StatKey:
+    """Get the (size, mtime_ns, inode) triple used to detect file changes."""
+    return (stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino)
+
+
+def _matches(relative: str, patterns: Sequence[str], is_dir: bool = False) -> bool:
+    """
+    Check whether a relative path matches one of the glob patterns.
+
+    Patterns with a slash are matched against the whole relative path,
+    the others against the last component only, and the patterns ending with
+    a slash only match directories. Hidden names only match patterns whose
+    last component starts with a dot, like with `glob.glob`.
+
+    :param relative: the path relative to the root, with `/` separators.
+    :param patterns: the glob patterns.
+    :param is_dir: whether the path is a directory.
+    :return: whether the path matches.
+    """
+    name = relative.rsplit("/", 1)[-1]
+    for pattern in patterns:
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern[:-1]
+        if name.startswith(".") and not pattern.rsplit("/", 1)[-1].startswith("."):
+            continue
+        if fnmatch.fnmatch(relative if "/" in pattern else name, pattern):
+            return True
+    return False
+
+
+class UploadRoot(NamedTuple):
+    """
+    A directory whose files are uploaded.
+
+    Files are selected by their path relative to the directory: they must
+    match one of the `include` patterns and none of the `exclude` ones.
+    Subdirectories are only entered if `recursive`, and never if they are
+    hidden or match an `exclude` pattern. The object keys of the files are
+    prefixed with `key_prefix`, and the root gets a share of the upload
+    bandwidth proportional to its `weight`.
+    """
+
+    path: str
+    include: Tuple[str, ...] = ("*",)
+    exclude: Tuple[str, ...] = ()
+    recursive: bool = False
+    key_prefix: str = ""
+    weight: float = 1.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "UploadRoot":
+        """Get a root from its `upload_roots` entry of the skill configuration."""
+        weight = float(config.get("weight", 1.0))
+        if weight <= 0:
+            raise ValueError(
+                f"The weight of upload root {config['path']} must be positive."
+            )
+        return cls(
+            path=config["path"].rstrip("/") or "/",
+            include=tuple(config.get("include") or ("*",)),
+            exclude=tuple(config.get("exclude") or ()),
+            recursive=bool(config.get("recursive", True)),
+            key_prefix=config.get("key_prefix") or "",
+            weight=weight,
+        )
+
+    @classmethod
+    def from_pattern(cls, pattern: str) -> "UploadRoot":
+        """
+        Get the root of a single level glob pattern such as `./upload_dir/*`.
+
+        :param pattern: the glob pattern, only the last path component may contain wildcards.
+        :return: the non recursive root.
+        """
+        directory, name_pattern = os.path.split(pattern)
+        return cls(path=directory or os.curdir, include=(name_pattern,))
+
+    def relative(self, path: str) -> Optional[str]:
+        """Get a path relative to the root, with `/` separators, or None if outside."""
+        relative = os.path.relpath(path, self.path)
+        if relative == os.curdir or relative.split(os.sep, 1)[0] == os.pardir:
+            return None
+        return relative.replace(os.sep, "/")
+
+    def _is_pruned(self, relative: str) -> bool:
+        """Check whether a subdirectory is left out, with all its content."""
+        return relative.rsplit("/", 1)[-1].startswith(".") or _matches(
+            relative, self.exclude, is_dir=True
+        )
+
+    def _is_selected(self, relative: str) -> bool:
+        """Check whether a file is selected, its directories being entered."""
+        return _matches(relative, self.include) and not _matches(relative, self.exclude)
+
+    def contains_directory(self, path: str) -> bool:
+        """Check whether a directory is one the walks of the root enter."""
+        relative = self.relative(path)
+        if relative is None or not self.recursive:
+            return False
+        parts = relative.split("/")
+        return not any(
+            self._is_pruned("/".join(parts[: index + 1])) for index in range(len(parts))
+        )
+
+    def matches(self, path: str) -> bool:
+        """Check whether a file is one the walks of the root yield."""
+        relative = self.relative(path)
+        if relative is None:
+            return False
+        directory = os.path.dirname(path)
+        if directory != self.path and not self.contains_directory(directory):
+            return False
+        return self._is_selected(relative)
+
+    def walk(
+        self, directory: Optional[str] = None
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Yield the selected regular files under the root.
+
+        The tree is walked with `os.scandir`, reusing the stat data it returns,
+        and the excluded subdirectories are pruned rather than walked and
+        filtered. Symbolic links to directories are not followed.
+
+        :param directory: the directory to walk, which must be the root or one
+            of the subdirectories it contains, the root if None.
+        :return: an iterator of (path, stat result) tuples.
+        """
+        directory = self.path if directory is None else directory
+        relative = self.relative(directory)
+        stack = [(directory, "" if relative is None else relative + "/")]
+        while stack:
+            current, prefix = stack.pop()
+            try:
+                iterator = os.scandir(current)
+            except OSError:
+                continue
+            with iterator:
+                for entry in iterator:
+                    relative = prefix + entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive and not self._is_pruned(relative):
+                                stack.append((entry.path, relative + "/"))
+                        elif entry.is_file() and self._is_selected(relative):
+                            yield entry.path, entry.stat()
+                    except FileNotFoundError:
+                        continue
+
+
+def find_root(roots: Sequence[UploadRoot], path: str) -> Optional[UploadRoot]:
+    """Get the innermost of the roots a file is under, if any."""
+    candidates = [root for root in roots if root.relative(path) is not None]
+    return max(candidates, key=lambda root: len(root.path), default=None)
+
+
+class ScanIndex:
+    """
+    Index of scanned files keyed on their path and stat data.
+
+    The index is persisted as an append-only log, one JSON array per line:
+    the path, stat key and fingerprint of a recorded file, or the path alone
+    of a forgotten one. Saving only appends the lines of the changes since
+    the previous save, and the log is rewritten with the live entries once
+    it holds more than `COMPACT_RATIO` lines per entry.
+    """
+
+    COMPACT_RATIO = 2
+    COMPACT_MIN_LINES = 1000
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Initialize the index.
+
+        :param path: the log the index is persisted to, kept in memory only if None.
+        """
+        self._path = path
+        self._entries = {}  # type: Dict[str, List]
+        self._changes = []  # type: List[List]
+        self._log_lines = 0
+        self._compact_due = False
+        self._load()
+
+    def __len__(self) -> int:
+        """Get the number of indexed files."""
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Replay the log, if the index was persisted before."""
+        if self._path is None or not os.path.exists(self._path):
+            return
+        with open(self._path, "r") as log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # a line cut short by a crash, the file is hashed again and
+                    # the log rewritten so no line gets appended to this one
+                    self._compact_due = True
+                    continue
+                self._log_lines += 1
+                if len(entry) == 1:
+                    self._entries.pop(entry[0], None)
+                else:
+                    self._entries[entry[0]] = entry[1:]
+
+    def save(self) -> None:
+        """Persist the changes since the last save, compacting the log if due."""
+        if self._path is None or not self._changes:
+            return
+        self._log_lines += len(self._changes)
+        if self._compact_due or self._log_lines > max(
+            self.COMPACT_MIN_LINES, self.COMPACT_RATIO * len(self._entries)
+        ):
+            self._compact()
+        else:
+            with open(self._path, "a") as log:
+                log.writelines(self._dumps(change) for change in self._changes)
+        self._changes = []
+
+    def _compact(self) -> None:
+        """Rewrite the log with one line per live entry."""
+        tmp_path = self._path + ".tmp"
+        with open(tmp_path, "w") as log:
+            log.writelines(
+                self._dumps([path, *entry]) for path, entry in self._entries.items()
+            )
+        os.replace(tmp_path, self._path)
+        self._log_lines = len(self._entries)
+        self._compact_due = False
+
+    @staticmethod
+    def _dumps(change: List) -> str:
+        """Get the log line of a change."""
+        return json.dumps(change, separators=(",", ":")) + "\n"
+
+    def is_changed(self, path: str, stat_result: os.stat_result) -> bool:
+        """Check whether a file is new or was modified since it was recorded."""
+        entry = self._entries.get(path)
+        return entry is None or tuple(entry[:3]) != stat_key(stat_result)
+
+    def record(self, path: str, stat_result: os.stat_result, fingerprint: str) -> None:
+        """Record the stat data and fingerprint of a processed file."""
+        entry = [*stat_key(stat_result), fingerprint]
+        self._entries[path] = entry
+        self._changes.append([path, *entry])
+
+    def forget(self, path: str) -> None:
+        """Forget a file, if it was recorded."""
+        if self._entries.pop(path, None) is not None:
+            self._changes.append([path])
+
+    def prune(self, seen_paths: set) -> None:
+        """Forget the files which were not seen during the last scan."""
+        removed = [path for path in self._entries if path not in seen_paths]
+        for path in removed:
+            self.forget(path)
+
+    def changed_files(
+        self, roots: Sequence[UploadRoot]
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Walk the roots and yield only the new or modified files.
+
+        Files that disappeared since the previous scan are dropped from the index.
+
+        :param roots: the roots to walk.
+        :return: an iterator of (path, stat result) tuples.
+        """
+        seen_paths = set()
+        for path, stat_result in (file for root in roots for file in root.walk()):
+            if path in seen_paths:
+                continue
+            seen_paths.add(path)
+            if self.is_changed(path, stat_result):
+                yield path, stat_result
+        self.prune(seen_paths)
+
+    def changed_paths(
+        self, paths: Iterable[str]
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        Check the given paths and yield only the new or modified files.
+
+        Unlike `changed_files` nothing else is scanned. Paths which no longer
+        exist are dropped from the index.
+
+        :param paths: the paths to check, as reported by `UploadRoot.walk`.
+        :return: an iterator of (path, stat result) tuples.
+        """
+        for path in paths:
+            try:
+                stat_result = os.stat(path)
+            except FileNotFoundError:
+                self.forget(path)
+                continue
+            if stat.S_ISREG(stat_result.st_mode) and self.is_changed(path, stat_result):
+                yield path, stat_result
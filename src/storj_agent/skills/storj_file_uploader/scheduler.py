@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the scheduler ordering the files sent for upload."""
+
+import heapq
+import itertools
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+SCHEDULE_POLICIES = ("fifo", "smallest", "oldest")
+
+
+class ScheduledFile(NamedTuple):
+    """A hashed file waiting to be sent to the connection."""
+
+    path: str
+    key: str
+    fingerprint: str
+    stat_result: os.stat_result
+    queued_at: float
+
+
+class _RootQueue:
+    """The files of one upload root, ordered by the scheduling policy."""
+
+    def __init__(self, weight: float) -> None:
+        self.weight = weight
+        self.finish = 0.0
+        self.waiting = 0
+        self.heap = []  # type: List[List[Any]]
+        self.arrivals = deque()  # type: Deque[List[Any]]
+
+    def peek(self, now: float, max_wait: float) -> Optional[List[Any]]:
+        """
+        Get the entry of the next file, without removing it.
+
+        The file waiting for the longest time comes first once it waited for
+        more than `max_wait` seconds, the first in the policy order otherwise.
+        """
+        # entries taken out of one structure are blanked and skipped in the other
+        while self.arrivals and self.arrivals[0][2] is None:
+            self.arrivals.popleft()
+        while self.heap and self.heap[0][2] is None:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return None
+        oldest = self.arrivals[0]
+        if 0 < max_wait <= now - oldest[2].queued_at:
+            return oldest
+        return self.heap[0]
+
+
+class UploadScheduler:
+    """
+    Order the hashed files before they are sent to the connection.
+
+    Within an upload root the files are taken in the order of the `policy`:
+
+    - fifo: in the order they were hashed,
+    - smallest: the smallest file first, so that large files do not hold back
+      many small ones,
+    - oldest: the least recently modified file first.
+
+    A file waiting for more than `max_wait` seconds is taken first whatever
+    the policy, so large files still make progress under a steady stream of
+    small ones. Across roots the files are taken by weighted fair queuing: each
+    root gets a share of the bytes sent proportional to its weight while it
+    has files waiting.
+
+    At most `tick_bytes` bytes are taken per tick on average: the file which
+    exceeds the budget of a tick is still taken and the excess is taken from
+    the budget of the following ticks, so no file is too large to be sent.
+    """
+
+    def __init__(
+        self, policy: str = "fifo", tick_bytes: int = 0, max_wait: float = 0
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        :param policy: the order of the files of a root, one of `SCHEDULE_POLICIES`.
+        :param tick_bytes: the bytes taken per tick on average, unlimited if 0.
+        :param max_wait: the seconds after which a file is taken first, never if 0.
+        """
+        if policy not in SCHEDULE_POLICIES:
+            raise ValueError(f"schedule_policy must be one of {SCHEDULE_POLICIES}.")
+        self._policy = policy
+        self._tick_bytes = tick_bytes
+        self._max_wait = max_wait
+        self._credit = 0
+        self._virtual_time = 0.0
+        self._counter = itertools.count()
+        self._queues = {}  # type: Dict[Any, _RootQueue]
+        self._paths = set()  # type: Set[str]
+        self._keys = set()  # type: Set[str]
+
+    def __len__(self) -> int:
+        """Get the number of files waiting."""
+        return len(self._paths)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a file of the object key is waiting."""
+        return key in self._keys
+
+    def is_queued(self, path: str) -> bool:
+        """Check whether a file is waiting."""
+        return path in self._paths
+
+    def _order(self, file: ScheduledFile) -> Tuple[float, ...]:
+        """Get the sort key of a file within its root."""
+        if self._policy == "smallest":
+            return (file.stat_result.st_size,)
+        if self._policy == "oldest":
+            return (file.stat_result.st_mtime,)
+        return ()
+
+    def push(self, file: ScheduledFile, root: Any = None, weight: float = 1) -> None:
+        """
+        Queue a file.
+
+        :param file: the file.
+        :param root: the upload root of the file, any hashable identifying it.
+        :param weight: the weight of the root.
+        """
+        queue = self._queues.get(root)
+        if queue is None:
+            queue = self._queues[root] = _RootQueue(weight)
+        if not queue.waiting:
+            # a root with no file waiting does not keep the share it did not use
+            queue.finish = max(queue.finish, self._virtual_time)
+        queue.waiting += 1
+        entry = [self._order(file), next(self._counter), file]
+        heapq.heappush(queue.heap, entry)
+        queue.arrivals.append(entry)
+        self._paths.add(file.path)
+        self._keys.add(file.key)
+
+    def _pop(self, now: float) -> Optional[ScheduledFile]:
+        """Take the next file, from the root whose share of bytes is the most behind."""
+        best = None  # type: Optional[Tuple[float, int, _RootQueue, List[Any]]]
+        for queue in self._queues.values():
+            entry = queue.peek(now, self._max_wait)
+            if entry is None:
+                continue
+            finish = queue.finish + entry[2].stat_result.st_size / queue.weight
+            if best is None or (finish, entry[1]) < best[:2]:
+                best = (finish, entry[1], queue, entry)
+        if best is None:
+            return None
+        finish, _, queue, entry = best
+        queue.finish = self._virtual_time = finish
+        queue.waiting -= 1
+        file = entry[2]
+        entry[2] = None
+        self._paths.discard(file.path)
+        self._keys.discard(file.key)
+        return file
+
+    def tick(self, now: float) -> List[ScheduledFile]:
+        """
+        Take the files to send this tick.
+
+        :param now: the current time, on the clock of the `queued_at` of the files.
+        :return: the files, in the order to send them.
+        """
+        if self._tick_bytes:
+            self._credit = min(self._credit + self._tick_bytes, self._tick_bytes)
+        files = []
+        while not self._tick_bytes or self._credit > 0:
+            file = self._pop(now)
+            if file is None:
+                break
+            files.append(file)
+            self._credit -= file.stat_result.st_size
+        return files
@@ -19,11 +19,186 @@
 
 """This package contains a scaffold of a model."""
 
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from aea.mail.base import Envelope
 from aea.skills.base import Model
+from packages.eightballer.protocols.file_storage.message import FileStorageMessage
+from packages.eightballer.skills.storj_file_uploader import PUBLIC_ID as SENDER_ID
+from packages.eightballer.skills.storj_file_uploader.ledger import UploadLedger
+from packages.eightballer.skills.storj_file_uploader.registry import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_URL_TTL,
+    UrlRegistry,
+)
+
+
+class PendingUpload(NamedTuple):
+    """A file sent to the connection, waiting for its receipt."""
+
+    key: str
+    path: str
+    fingerprint: str
+    stat_result: os.stat_result
 
 
 class Strategy(Model):
     """This class scaffolds a model."""
 
-    uploaded_files = []
-    file_urls = {}
+    def __init__(self, **kwargs: Any) -> None:
+        """
+        Initialize the strategy.
+
+        :param kwargs: keyword arguments
+        """
+        ledger_path = kwargs.pop("ledger_path", None)
+        url_registry_max_entries = kwargs.pop(
+            "url_registry_max_entries", DEFAULT_MAX_ENTRIES
+        )
+        url_registry_max_bytes = kwargs.pop("url_registry_max_bytes", DEFAULT_MAX_BYTES)
+        url_ttl = kwargs.pop("url_ttl", DEFAULT_URL_TTL)
+        url_spill_path = kwargs.pop("url_spill_path", None)
+        self._url_refresh_margin = kwargs.pop("url_refresh_margin", 86400)
+        self._url_request_timeout = kwargs.pop("url_request_timeout", 60)
+        super().__init__(**kwargs)
+        self._uploaded_files = UploadLedger(ledger_path)
+        self._url_registry = UrlRegistry(
+            max_entries=url_registry_max_entries,
+            max_bytes=url_registry_max_bytes,
+            ttl=url_ttl,
+            spill_path=url_spill_path,
+        )
+        self._url_requests = {}  # type: Dict[str, float]
+        self._uploads = {}  # type: Dict[str, PendingUpload]
+        self._object_keys = {}  # type: Dict[str, str]
+        self._finished = []  # type: List[Tuple[PendingUpload, str]]
+
+    @property
+    def uploaded_files(self) -> UploadLedger:
+        """Get the ledger of the uploaded file ids."""
+        return self._uploaded_files
+
+    @property
+    def url_registry(self) -> UrlRegistry:
+        """Get the registry of the access urls of the uploaded files."""
+        return self._url_registry
+
+    def upload_sent(self, object_key: str, upload: PendingUpload) -> None:
+        """
+        Track a file sent to the connection until its receipt comes back.
+
+        :param object_key: the object key the file is uploaded to.
+        :param upload: the file.
+        """
+        self._uploads[object_key] = upload
+        self._object_keys[upload.key] = object_key
+
+    def is_uploading(self, key: str) -> bool:
+        """Check whether a file of the ledger key is waiting for its receipt."""
+        return key in self._object_keys
+
+    def upload_finished(self, key: str, error: str = "") -> None:
+        """
+        Record the receipt of an upload.
+
+        The key is added to the ledger only if the upload succeeded, and the
+        upload is handed to the behaviour through `pop_finished` either way.
+
+        :param key: the object key, or the ledger key, of the file.
+        :param error: the error of the upload, empty if it succeeded.
+        """
+        upload = self._uploads.pop(self._object_keys.get(key, key), None)
+        if upload is None:
+            return
+        del self._object_keys[upload.key]
+        if not error:
+            self._uploaded_files.add(upload.key)
+        self._finished.append((upload, error))
+
+    def pop_finished(self) -> List[Tuple[PendingUpload, str]]:
+        """Take the uploads whose receipt came back, with their error, if any."""
+        finished, self._finished = self._finished, []
+        return finished
+
+    def access_url(self, key: str, now: Optional[float] = None) -> Optional[str]:
+        """
+        Get the access url of an uploaded object.
+
+        Urls are served from the registry. When the url of the key is unknown,
+        expired or within `url_refresh_margin` seconds of its expiry, a new one
+        is requested from the connection and registered when it comes back,
+        the current url, if any, being returned in the meantime.
+
+        :param key: the object key.
+        :param now: the lookup time, the current time if None.
+        :return: the access url, or None if there is no valid one yet.
+        """
+        now = time.time() if now is None else now
+        record = self._url_registry.get(key, now)
+        if record is None or record.expires_at - self._url_refresh_margin <= now:
+            self._request_url(key)
+        return record.url if record is not None else None
+
+    def register_presigned_url(
+        self, key: str, url: str, expires_at: float, byte_range: str = ""
+    ) -> None:
+        """
+        Register a url sent back for a REQUEST_URL.
+
+        The size and ETag are kept from the current record of the key, if
+        any, the url and byte range coming from the reply.
+
+        :param key: the object key.
+        :param url: the presigned url.
+        :param expires_at: the expiry time of the url.
+        :param byte_range: the byte range of the file in the object, if packed.
+        """
+        self._url_requests.pop(key, None)
+        record = self._url_registry.get(key)
+        self._url_registry.register(
+            url,
+            key,
+            record.size if record is not None else 0,
+            record.etag if record is not None else "",
+            expires_at=expires_at,
+            byte_range=byte_range,
+        )
+
+    def url_request_failed(self, key: str) -> None:
+        """
+        Forget the url request of a key the connection failed to answer.
+
+        :param key: the object key.
+        """
+        self._url_requests.pop(key, None)
+
+    def _request_url(self, key: str) -> None:
+        """
+        Ask the connection for a url of the key.
+
+        The key is not asked again while its request is pending, unless it
+        was not answered within `url_request_timeout` seconds.
+        """
+        now = time.monotonic()
+        requested_at = self._url_requests.get(key)
+        if requested_at is not None and now - requested_at < self._url_request_timeout:
+            return
+        self._url_requests[key] = now
+        receiver_id = "eightballer/storj_file_transfer:0.1.0"
+        msg = FileStorageMessage(
+            performative=FileStorageMessage.Performative.REQUEST_URL, key=key
+        )
+        msg.sender = str(SENDER_ID)
+        msg.to = receiver_id
+        self.context.outbox.put(
+            Envelope(to=receiver_id, sender=str(SENDER_ID), message=msg)
+        )
+
+    def teardown(self) -> None:
+        """Tear the strategy down."""
+        self._uploaded_files.close()
+        self._url_registry.close()
+        super().teardown()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the filesystem event watcher of the upload roots."""
+
+import os
+import threading
+from typing import Any, Dict, Sequence, Set, Tuple
+
+from packages.eightballer.skills.storj_file_uploader.scanner import UploadRoot
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover
+    FileSystemEventHandler = object
+    Observer = None
+
+WATCH_MODES = ("auto", "events", "poll")
+COMPLETE_EVENTS = ("closed", "moved")
+
+
+class _EventCollector(FileSystemEventHandler):  # type: ignore
+    """Collect the paths of the file events of an upload root."""
+
+    def __init__(self, root: UploadRoot) -> None:
+        super().__init__()
+        self.root = root
+        self._paths = {}  # type: Dict[str, bool]
+        self._directories = set()  # type: Set[str]
+        self._lock = threading.Lock()
+
+    def dispatch(self, event: Any) -> None:
+        """
+        Record the path of a file event, its destination for a move.
+
+        The path is marked complete if the event is the last close of a file
+        opened for writing or the move of a file into place. Directories
+        created or moved in are recorded too, their files raise no event.
+        """
+        path = getattr(event, "dest_path", None) or event.src_path
+        path = os.path.join(self.root.path, os.path.relpath(path, self.root.path))
+        if event.is_directory:
+            if event.event_type in ("created", "moved") and (
+                self.root.contains_directory(path)
+            ):
+                with self._lock:
+                    self._directories.add(path)
+            return
+        if not self.root.matches(path):
+            return
+        with self._lock:
+            self._paths[path] = event.event_type in COMPLETE_EVENTS
+
+    def drain(self) -> Tuple[Dict[str, bool], Set[str]]:
+        """Get and forget the file and directory paths recorded so far."""
+        with self._lock:
+            paths, self._paths = self._paths, {}
+            directories, self._directories = self._directories, set()
+        return paths, directories
+
+
+class FileWatcher:
+    """
+    Watch upload roots for the files created, written, moved in or deleted.
+
+    Events come from the native notification API of the platform, inotify on
+    Linux, through the optional `watchdog` package. Paths are reported under
+    the root path as given, like `UploadRoot.walk` reports them.
+    """
+
+    def __init__(self, roots: Sequence[UploadRoot]) -> None:
+        """
+        Initialize the watcher.
+
+        :param roots: the roots to watch.
+        """
+        if Observer is None:
+            raise ValueError(
+                "Watching for file events requires the 'watchdog' package."
+            )
+        self._collectors = [_EventCollector(root) for root in roots]
+        self._observer = Observer()
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether the `watchdog` package is installed."""
+        return Observer is not None
+
+    def start(self) -> None:
+        """Start watching, raises OSError if a root cannot be watched."""
+        for collector in self._collectors:
+            self._observer.schedule(
+                collector, collector.root.path, recursive=collector.root.recursive
+            )
+        self._observer.start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._observer.stop()
+        self._observer.join()
+
+    def drain(self) -> Dict[str, bool]:
+        """
+        Get the paths of the files with an event since the previous call.
+
+        The files of the directories created or moved in are walked and
+        reported as well.
+
+        :return: for each path whether its last event tells the file is
+            complete: it was closed after being written, or moved into place.
+        """
+        events = {}  # type: Dict[str, bool]
+        for collector in self._collectors:
+            paths, directories = collector.drain()
+            for directory in directories:
+                for path, _ in collector.root.walk(directory):
+                    events.setdefault(path, False)
+            events.update(paths)
+        return events
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+from moto import mock_aws
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from aea.mail.base import Envelope  # noqa: E402
+
+from packages.eightballer.connections.storj_file_transfer.client import (  # noqa: E402
+    StorjClient,
+)
+from packages.eightballer.protocols.file_storage.message import (  # noqa: E402
+    FileStorageMessage,
+)
+
+SKILL = "eightballer/storj_file_uploader:0.1.0"
+CONNECTION = "eightballer/storj_file_transfer:0.1.0"
+
+
+def batch(*entries):
+    message = FileStorageMessage(
+        performative=FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+        keys=tuple(entry[0] for entry in entries),
+        filenames=tuple(entry[1] for entry in entries),
+        contents=tuple(entry[2] for entry in entries),
+        paths=tuple(entry[3] for entry in entries),
+        fingerprints=tuple(hashlib.md5(entry[2]).hexdigest() for entry in entries),
+    )
+    message.sender = SKILL
+    message.to = CONNECTION
+    return Envelope(to=CONNECTION, sender=SKILL, message=message)
+
+
+class TestBatchUpload(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+        self.aws = mock_aws()
+        self.aws.start()
+        self.addCleanup(self.aws.stop)
+        self.client = StorjClient(
+            {
+                "storj_creds": {
+                    "aws_access_key_id": "a",
+                    "aws_secret_access_key": "b",
+                    "endpoint_url": None,
+                },
+                "batch_concurrency": 4,
+            },
+            1,
+            logging.getLogger("test"),
+        )
+        self.client.connect()
+        self.addCleanup(self.client.close)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def stored(self, key):
+        return self.client.s3.get_object(Bucket=self.client.bucket_name, Key=key)[
+            "Body"
+        ].read()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_receipt(self):
+        contents = [os.urandom(size) for size in (10, 0, 2000)]
+        path = self.write("c.bin", contents[2])
+        reply = self.client.handle(
+            batch(
+                ("a", "a.txt", contents[0], ""),
+                ("b", "b", contents[1], ""),
+                ("c", "c.bin", contents[2], path),
+            )
+        )
+        self.assertEqual((reply.to, reply.sender), (SKILL, CONNECTION))
+        receipt = reply.message
+        self.assertEqual(
+            receipt.performative,
+            FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT,
+        )
+        self.assertTrue(receipt._is_consistent())
+        self.assertEqual(receipt.keys, ("a.txt", "b", "c.bin"))
+        self.assertEqual(receipt.sizes, (10, 0, 2000))
+        self.assertEqual(receipt.errors, ("", "", ""))
+        self.assertEqual(receipt.ranges, ("", "", ""))
+        self.assertEqual(
+            receipt.etags, tuple(hashlib.md5(data).hexdigest() for data in contents)
+        )
+        for key, url, data in zip(receipt.keys, receipt.access_urls, contents):
+            self.assertIn(key, url)
+            self.assertEqual(self.stored(key), data)
+        self.assertIn("batch", receipt.timings)
+
+    def test_failed_entry_does_not_fail_the_others(self):
+        reply = self.client.handle(
+            batch(
+                ("a", "a.txt", b"abc", ""),
+                ("b", "b.txt", b"", os.path.join(self.directory, "missing")),
+            )
+        )
+        receipt = reply.message
+        self.assertEqual(receipt.keys, ("a.txt", "b.txt"))
+        self.assertEqual(receipt.errors[0], "")
+        self.assertNotEqual(receipt.errors[1], "")
+        self.assertEqual((receipt.access_urls[1], receipt.sizes[1]), ("", 0))
+        self.assertEqual(self.stored("a.txt"), b"abc")
+
+    def test_stored_entry_is_not_uploaded_again(self):
+        self.client.handle(batch(("a", "a.txt", b"abc", "")))
+        puts = []
+        self.client.s3.meta.events.register(
+            "before-call.s3.PutObject", lambda **kwargs: puts.append(kwargs)
+        )
+        receipt = self.client.handle(
+            batch(("a", "a.txt", b"abc", ""), ("b", "b.txt", b"def", ""))
+        ).message
+        self.assertEqual(receipt.errors, ("", ""))
+        self.assertEqual(len(puts), 1)
+
+    def test_empty_batch(self):
+        receipt = self.client.handle(batch()).message
+        self.assertEqual(
+            receipt.performative,
+            FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT,
+        )
+        self.assertEqual(receipt.keys, ())
+
+    def test_entries_of_different_lengths_are_inconsistent(self):
+        message = batch(("a", "a.txt", b"abc", "")).message
+        message.set("paths", ("", ""))
+        self.assertFalse(message._is_consistent())
+
+
+if __name__ == "__main__":
+    unittest.main()
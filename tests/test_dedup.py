@@ -0,0 +1,135 @@
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import boto3
+from moto import mock_aws
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.connections.storj_file_transfer import dedup  # noqa: E402
+from packages.eightballer.connections.storj_file_transfer.dedup import (  # noqa: E402
+    FINGERPRINT_METADATA,
+    RemoteIndex,
+)
+
+BUCKET = "bucket"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class TestRemoteIndex(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+        self.aws = mock_aws()
+        self.aws.start()
+        self.addCleanup(self.aws.stop)
+        self.s3 = boto3.client("s3", aws_access_key_id="a", aws_secret_access_key="b")
+        self.s3.create_bucket(Bucket=BUCKET)
+        self.heads = 0
+        self.s3.meta.events.register("before-call.s3.HeadObject", self.count_head)
+        self.clock = FakeClock()
+        patcher = mock.patch.object(dedup, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.index_path = os.path.join(directory.name, "remote_index.log")
+
+    def count_head(self, **kwargs):
+        self.heads += 1
+
+    def put(self, key, data, fingerprint=None):
+        metadata = {} if fingerprint is None else {FINGERPRINT_METADATA: fingerprint}
+        return self.s3.put_object(Bucket=BUCKET, Key=key, Body=data, Metadata=metadata)[
+            "ETag"
+        ].strip('"')
+
+    def index(self, **config):
+        index = RemoteIndex(self.s3, BUCKET, {"index_path": self.index_path, **config})
+        self.addCleanup(index.close)
+        return index
+
+    def test_stored_object_is_found_once(self):
+        data = os.urandom(100)
+        fingerprint = hashlib.md5(data).hexdigest()
+        etag = self.put("k.bin", data)
+        index = self.index()
+        self.assertEqual(index.find("k.bin", 100, fingerprint), etag)
+        self.assertEqual(index.find("k.bin", 100, fingerprint), etag)
+        self.assertEqual(self.heads, 1)
+
+    def test_fingerprint_metadata(self):
+        data = os.urandom(100)
+        etag = self.put("k.bin", data, fingerprint="blake2b-fingerprint")
+        index = self.index()
+        self.assertEqual(index.find("k.bin", 100, "blake2b-fingerprint"), etag)
+
+    def test_different_content_is_not_found(self):
+        data = os.urandom(100)
+        self.put("k.bin", data)
+        index = self.index()
+        with self.assertLogs(index.logger, "WARNING"):
+            self.assertIsNone(index.find("k.bin", 100, "0" * 32))
+        self.clock.now += index.negative_ttl
+        with self.assertLogs(index.logger, "WARNING"):
+            self.assertIsNone(index.find("k.bin", 99, hashlib.md5(data).hexdigest()))
+        self.assertEqual(len(index), 0)
+
+    def test_missing_object_is_checked_again_after_the_ttl(self):
+        index = self.index(negative_ttl=60)
+        self.assertIsNone(index.find("k.bin", 3, hashlib.md5(b"abc").hexdigest()))
+        etag = self.put("k.bin", b"abc")
+        self.clock.now += 59
+        self.assertIsNone(index.find("k.bin", 3, hashlib.md5(b"abc").hexdigest()))
+        self.assertEqual(self.heads, 1)
+        self.clock.now += 1
+        self.assertEqual(index.find("k.bin", 3, hashlib.md5(b"abc").hexdigest()), etag)
+        self.assertEqual(self.heads, 2)
+
+    def test_added_object_is_not_checked(self):
+        index = self.index()
+        index.find("k.bin", 3, "fingerprint")
+        index.add("k.bin", 3, '"etag"')
+        self.assertEqual(index.find("k.bin", 3, "fingerprint"), "etag")
+        self.assertEqual(self.heads, 1)
+
+    def test_log_survives_a_restart(self):
+        index = self.index()
+        index.add("a.bin", 1, "etag-a")
+        index.add("a.bin", 1, "etag-a")
+        index.add("b.bin", 2, "etag-b")
+        index.close()
+        with open(self.index_path) as log:
+            self.assertEqual(len(log.readlines()), 2)
+        reopened = self.index()
+        self.assertEqual(len(reopened), 2)
+        self.assertEqual(reopened.find("b.bin", 2, "fingerprint"), "etag-b")
+        # a different size is not the same object
+        reopened.find("b.bin", 3, "fingerprint")
+        self.assertEqual(self.heads, 1)
+
+    def test_disabled(self):
+        self.put("k.bin", b"abc")
+        index = self.index(enabled=False)
+        self.assertIsNone(index.find("k.bin", 3, hashlib.md5(b"abc").hexdigest()))
+        index.add("k.bin", 3, "etag")
+        self.assertEqual(self.heads, 0)
+        self.assertFalse(os.path.exists(self.index_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.skills.storj_file_uploader.hashing import (  # noqa: E402
+    fingerprint_file,
+    make_hash_pool,
+    new_hasher,
+)
+
+
+class TestHashing(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_matches_the_whole_file_digest(self):
+        content = os.urandom(3 * 1024 + 17)
+        path = self.write("file", content)
+        for chunk_size in (1, 1000, 1024, 1024 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    fingerprint_file(path, chunk_size=chunk_size),
+                    hashlib.md5(content).hexdigest(),
+                )
+
+    def test_algorithms(self):
+        content = os.urandom(5000)
+        path = self.write("file", content)
+        for algorithm in ("sha256", "blake2b"):
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(
+                    fingerprint_file(path, algorithm, 1024),
+                    hashlib.new(algorithm, content).hexdigest(),
+                )
+
+    def test_empty_file(self):
+        path = self.write("empty", b"")
+        self.assertEqual(fingerprint_file(path), hashlib.md5(b"").hexdigest())
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            new_hasher("unknown")
+
+    def test_missing_file(self):
+        with self.assertRaises(OSError):
+            fingerprint_file(os.path.join(self.directory, "missing"))
+
+    def test_hash_pools(self):
+        contents = [os.urandom(size) for size in (0, 1, 4096, 100000)]
+        paths = [self.write(str(index), data) for index, data in enumerate(contents)]
+        for kind in ("thread", "process"):
+            with self.subTest(kind=kind):
+                pool = make_hash_pool(2, kind)
+                try:
+                    futures = [
+                        pool.submit(fingerprint_file, path, "md5", 1024)
+                        for path in paths
+                    ]
+                    self.assertEqual(
+                        [future.result() for future in futures],
+                        [hashlib.md5(data).hexdigest() for data in contents],
+                    )
+                finally:
+                    pool.shutdown(wait=True)
+
+    def test_unknown_pool(self):
+        with self.assertRaises(ValueError):
+            make_hash_pool(1, "fiber")
+
+
+if __name__ == "__main__":
+    unittest.main()
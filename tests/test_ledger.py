@@ -0,0 +1,155 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.protocols.file_storage.message import (  # noqa: E402
+    FileStorageMessage,
+)
+from packages.eightballer.skills.storj_file_uploader.handlers import (  # noqa: E402
+    FileStorageHandler,
+)
+from packages.eightballer.skills.storj_file_uploader.ledger import (  # noqa: E402
+    UploadLedger,
+)
+from packages.eightballer.skills.storj_file_uploader.strategy import (  # noqa: E402
+    PendingUpload,
+    Strategy,
+)
+
+URL = "https://gateway/bucket/{}?X-Amz-Signature=signature"
+
+
+class TestUploadLedger(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "uploaded_files.log")
+
+    def test_in_memory(self):
+        ledger = UploadLedger()
+        ledger.add("a")
+        ledger.add("a")
+        self.assertIn("a", ledger)
+        self.assertNotIn("b", ledger)
+        self.assertEqual(len(ledger), 1)
+
+    def test_persisted(self):
+        ledger = UploadLedger(self.path)
+        for file_id in ("a", "b", "a"):
+            ledger.add(file_id)
+        ledger.close()
+        with open(self.path) as log:
+            self.assertEqual(log.read(), "a\nb\n")
+        reloaded = UploadLedger(self.path)
+        self.assertEqual(reloaded.ids, {"a", "b"})
+        reloaded.add("c")
+        reloaded.close()
+        self.assertEqual(UploadLedger(self.path).ids, {"a", "b", "c"})
+
+    def test_log_is_read_lazily(self):
+        ledger = UploadLedger(self.path)
+        with open(self.path, "w") as log:
+            log.write("a\n\nb\n")
+        self.assertEqual(ledger.ids, {"a", "b"})
+
+    def test_missing_log(self):
+        ledger = UploadLedger(self.path)
+        self.assertEqual(len(ledger), 0)
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestStrategyUploads(unittest.TestCase):
+    def setUp(self):
+        self.context = SimpleNamespace(logger=logging.getLogger("test"), outbox=None)
+        self.strategy = Strategy(name="strategy", skill_context=self.context)
+        self.context.strategy = self.strategy
+        self.handler = FileStorageHandler(name="handler", skill_context=self.context)
+        self.handler.setup()
+
+    def send(self, key, path):
+        upload = PendingUpload(key, path, "fingerprint-" + key, os.stat(__file__))
+        self.strategy.upload_sent(key + ".txt", upload)
+        return upload
+
+    def test_receipt(self):
+        upload = self.send("prefix/id", "/a.txt")
+        self.assertTrue(self.strategy.is_uploading("prefix/id"))
+        self.handler.handle(
+            FileStorageMessage(
+                performative=FileStorageMessage.Performative.UPLOAD_RECEIPT,
+                access_url=URL.format("prefix/id.txt"),
+                key="prefix/id.txt",
+                size=4,
+                etag="etag",
+                timings={},
+            )
+        )
+        self.assertIn("prefix/id", self.strategy.uploaded_files)
+        self.assertFalse(self.strategy.is_uploading("prefix/id"))
+        self.assertEqual(self.strategy.pop_finished(), [(upload, "")])
+        self.assertEqual(self.strategy.pop_finished(), [])
+
+    def test_file_download_reply(self):
+        upload = self.send("id", "/a.txt")
+        self.handler.handle(
+            FileStorageMessage(
+                performative=FileStorageMessage.Performative.FILE_DOWNLOAD,
+                access_url=URL.format("id.txt"),
+                content=b"",
+            )
+        )
+        self.assertIn("id", self.strategy.uploaded_files)
+        self.assertEqual(self.strategy.pop_finished(), [(upload, "")])
+        self.assertIsNotNone(self.strategy.url_registry.get("id.txt"))
+
+    def test_error_is_not_recorded(self):
+        upload = self.send("id", "/a.txt")
+        self.handler.handle(
+            FileStorageMessage(
+                performative=FileStorageMessage.Performative.ERROR,
+                error_code=FileStorageMessage.ErrorCode.UPLOAD_FAILED,
+                error_msg="failed",
+                error_data={"key": b"id.txt"},
+            )
+        )
+        self.assertNotIn("id", self.strategy.uploaded_files)
+        self.assertFalse(self.strategy.is_uploading("id"))
+        self.assertEqual(self.strategy.pop_finished(), [(upload, "failed")])
+
+    def test_batch_receipt(self):
+        first = self.send("a", "/a.txt")
+        second = self.send("b", "/b.txt")
+        self.handler.handle(
+            FileStorageMessage(
+                performative=FileStorageMessage.Performative.UPLOAD_BATCH_RECEIPT,
+                keys=("a.txt", "b.txt"),
+                access_urls=(URL.format("a.txt"), ""),
+                sizes=(1, 0),
+                etags=("etag", ""),
+                errors=("", "failed"),
+                ranges=("", ""),
+                timings={},
+            )
+        )
+        self.assertEqual(self.strategy.uploaded_files.ids, {"a"})
+        self.assertEqual(
+            self.strategy.pop_finished(), [(first, ""), (second, "failed")]
+        )
+
+    def test_unknown_receipt_is_ignored(self):
+        self.strategy.upload_finished("unknown.txt")
+        self.assertEqual(self.strategy.pop_finished(), [])
+        self.assertEqual(len(self.strategy.uploaded_files), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import hashlib
+import io
+import logging
+import os
+import sys
+import tarfile
+import tempfile
+import unittest
+
+from moto import mock_aws
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from aea.mail.base import Envelope  # noqa: E402
+
+from packages.eightballer.connections.storj_file_transfer.client import (  # noqa: E402
+    StorjClient,
+)
+from packages.eightballer.connections.storj_file_transfer.packing import (  # noqa: E402
+    PACK_PREFIX,
+    PackedFile,
+    PackIndex,
+    build_pack,
+    pack_key,
+)
+from packages.eightballer.protocols.file_storage.message import (  # noqa: E402
+    FileStorageMessage,
+)
+
+
+class TestBuildPack(unittest.TestCase):
+    def test_ranges_select_the_file_contents(self):
+        files = [
+            ("a.txt", os.urandom(1)),
+            ("b.txt", os.urandom(tarfile.BLOCKSIZE)),
+            ("c.txt", os.urandom(tarfile.BLOCKSIZE + 1)),
+            # a long name takes an extended header
+            ("d" * 200 + ".txt", os.urandom(3000)),
+        ]
+        data, ranges = build_pack(files)
+        self.assertEqual(len(ranges), len(files))
+        for (name, content), (offset, length) in zip(files, ranges):
+            with self.subTest(name=name[:10]):
+                self.assertEqual(length, len(content))
+                self.assertEqual(data[offset : offset + length], content)
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            self.assertEqual(tar.getnames(), [name for name, _ in files])
+            for name, content in files:
+                self.assertEqual(tar.extractfile(name).read(), content)
+
+    def test_byte_range(self):
+        self.assertEqual(PackedFile("p", 512, 10).byte_range, "bytes=512-521")
+
+    def test_pack_key(self):
+        key = pack_key(["a.txt", "b.txt"])
+        self.assertTrue(key.startswith(PACK_PREFIX))
+        self.assertTrue(key.endswith(".tar"))
+        self.assertEqual(key, pack_key(["a.txt", "b.txt"]))
+        self.assertNotEqual(key, pack_key(["b.txt", "a.txt"]))
+
+
+class TestPackIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "packs.log")
+
+    def test_in_memory(self):
+        index = PackIndex()
+        index.add("a.txt", PackedFile("p", 512, 1))
+        self.assertEqual(index.get("a.txt"), PackedFile("p", 512, 1))
+        self.assertIsNone(index.get("b.txt"))
+
+    def test_survives_a_restart(self):
+        index = PackIndex(self.path)
+        index.add("a.txt", PackedFile("p1", 512, 1))
+        index.add("b.txt", PackedFile("p1", 1536, 2))
+        index.add("a.txt", PackedFile("p2", 512, 1))
+        index.close()
+        reopened = PackIndex(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(len(reopened), 2)
+        self.assertEqual(reopened.get("a.txt"), PackedFile("p2", 512, 1))
+        self.assertEqual(reopened.get("b.txt"), PackedFile("p1", 1536, 2))
+
+    def test_torn_line_is_dropped(self):
+        index = PackIndex(self.path)
+        index.add("a.txt", PackedFile("p", 512, 1))
+        index.close()
+        with open(self.path, "a") as log:
+            log.write('{"key": "b.txt", "pack"')
+        reopened = PackIndex(self.path)
+        self.assertEqual(len(reopened), 1)
+        reopened.add("c.txt", PackedFile("p", 1536, 1))
+        reopened.close()
+        with open(self.path) as log:
+            self.assertEqual(len(log.readlines()), 2)
+        self.assertEqual(len(PackIndex(self.path)), 2)
+
+
+class TestPackUpload(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+        self.aws = mock_aws()
+        self.aws.start()
+        self.addCleanup(self.aws.stop)
+        self.client = StorjClient(
+            {
+                "storj_creds": {
+                    "aws_access_key_id": "a",
+                    "aws_secret_access_key": "b",
+                    "endpoint_url": None,
+                },
+                "packing": {"enabled": True},
+            },
+            1,
+            logging.getLogger("test"),
+        )
+        self.client.connect()
+        self.addCleanup(self.client.close)
+
+    def upload(self, files):
+        message = FileStorageMessage(
+            performative=FileStorageMessage.Performative.FILE_UPLOAD_BATCH,
+            keys=tuple(key for key, _ in files),
+            filenames=tuple(key + ".txt" for key, _ in files),
+            contents=tuple(content for _, content in files),
+            paths=("",) * len(files),
+            fingerprints=tuple(
+                hashlib.md5(content).hexdigest() for _, content in files
+            ),
+        )
+        envelope = Envelope(to="connection", sender="skill", message=message)
+        return self.client.handle(envelope).message
+
+    def test_files_are_read_back_by_range(self):
+        files = [("a", os.urandom(10)), ("b", os.urandom(1000))]
+        receipt = self.upload(files)
+        self.assertEqual(receipt.errors, ("", ""))
+        self.assertEqual(receipt.access_urls[0], receipt.access_urls[1])
+        pack = pack_key(["a.txt", "b.txt"])
+        self.assertEqual(len(set(receipt.etags)), 1)
+        for (_, content), byte_range in zip(files, receipt.ranges):
+            response = self.client.s3.get_object(
+                Bucket=self.client.bucket_name, Key=pack, Range=byte_range
+            )
+            self.assertEqual(response["Body"].read(), content)
+
+    def test_packed_files_are_not_packed_again(self):
+        first = self.upload([("a", b"abc")])
+        second = self.upload([("a", b"abc"), ("b", b"def")])
+        self.assertEqual(second.ranges[0], first.ranges[0])
+        self.assertEqual(second.access_urls[0], first.access_urls[0])
+        self.assertNotEqual(second.access_urls[1], first.access_urls[0])
+        self.assertEqual(len(self.client.pack_index), 2)
+
+    def test_empty_file_is_not_packed(self):
+        receipt = self.upload([("a", b""), ("b", b"abc")])
+        self.assertEqual(receipt.ranges[0], "")
+        self.assertNotEqual(receipt.ranges[1], "")
+        self.assertIsNone(self.client.pack_index.get("a.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
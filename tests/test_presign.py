@@ -0,0 +1,188 @@
+import logging
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import urlparse
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.connections.storj_file_transfer.presign import (  # noqa: E402
+    PresignCache,
+)
+from packages.eightballer.protocols.file_storage.message import (  # noqa: E402
+    FileStorageMessage,
+)
+from packages.eightballer.skills.storj_file_uploader import (  # noqa: E402
+    registry as registry_module,
+)
+from packages.eightballer.skills.storj_file_uploader import (  # noqa: E402
+    strategy as strategy_module,
+)
+from packages.eightballer.skills.storj_file_uploader.strategy import (  # noqa: E402
+    Strategy,
+)
+
+NOW = 1700000000.0
+DAY = 86400
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return NOW + self.now
+
+
+class CountingS3:
+    def __init__(self):
+        self.s3 = boto3.client(
+            "s3",
+            region_name="us-east-1",
+            aws_access_key_id="a",
+            aws_secret_access_key="b",
+        )
+        self.signed = 0
+
+    def generate_presigned_url(self, **kwargs):
+        self.signed += 1
+        return self.s3.generate_presigned_url(**kwargs)
+
+
+class TestPresignCache(unittest.TestCase):
+    def setUp(self):
+        self.s3 = CountingS3()
+
+    def test_url_is_cached(self):
+        cache = PresignCache(self.s3, "bucket")
+        url, expires_at = cache.url("a.txt", NOW)
+        self.assertEqual(expires_at, NOW + cache.expiry)
+        self.assertTrue(urlparse(url).path.endswith("/a.txt"))
+        self.assertEqual(cache.url("a.txt", NOW + DAY), (url, expires_at))
+        self.assertEqual(self.s3.signed, 1)
+
+    def test_refreshed_within_the_margin(self):
+        cache = PresignCache(self.s3, "bucket", {"expiry": 7 * DAY})
+        _, expires_at = cache.url("a.txt", NOW)
+        refresh_at = expires_at - cache.refresh_margin
+        self.assertEqual(cache.url("a.txt", refresh_at - 1)[1], expires_at)
+        self.assertEqual(self.s3.signed, 1)
+        self.assertEqual(cache.url("a.txt", refresh_at)[1], refresh_at + 7 * DAY)
+        self.assertEqual(self.s3.signed, 2)
+
+    def test_margin_is_capped_at_half_the_expiry(self):
+        cache = PresignCache(self.s3, "bucket", {"expiry": 100, "refresh_margin": DAY})
+        self.assertEqual(cache.refresh_margin, 50)
+        cache.url("a.txt", NOW)
+        cache.url("a.txt", NOW + 49)
+        self.assertEqual(self.s3.signed, 1)
+
+    def test_sign_replaces_the_cached_url(self):
+        cache = PresignCache(self.s3, "bucket")
+        cache.url("a.txt", NOW)
+        _, expires_at = cache.sign("a.txt", NOW + 10)
+        self.assertEqual(cache.url("a.txt", NOW + 10)[1], expires_at)
+        self.assertEqual(self.s3.signed, 2)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = PresignCache(self.s3, "bucket", {"max_entries": 2})
+        cache.url("a", NOW)
+        cache.url("b", NOW)
+        cache.url("a", NOW)
+        cache.url("c", NOW)
+        self.assertEqual(len(cache), 2)
+        cache.url("a", NOW)
+        self.assertEqual(self.s3.signed, 3)
+        cache.url("b", NOW)
+        self.assertEqual(self.s3.signed, 4)
+
+
+class TestStrategyUrlRefresh(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        for module in (strategy_module, registry_module):
+            patcher = mock.patch.object(module, "time", self.clock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.outbox = []
+        context = SimpleNamespace(
+            logger=logging.getLogger("test"),
+            outbox=SimpleNamespace(put=self.outbox.append),
+        )
+        self.strategy = Strategy(
+            name="strategy",
+            skill_context=context,
+            url_refresh_margin=DAY,
+            url_request_timeout=60,
+        )
+
+    def requested(self):
+        keys = [envelope.message.key for envelope in self.outbox]
+        self.outbox.clear()
+        return keys
+
+    def test_unknown_key_is_requested_once(self):
+        self.assertIsNone(self.strategy.access_url("a.txt"))
+        self.assertIsNone(self.strategy.access_url("a.txt"))
+        self.assertEqual(self.requested(), ["a.txt"])
+
+    def test_unanswered_request_is_sent_again(self):
+        self.strategy.access_url("a.txt")
+        self.clock.now += 59
+        self.strategy.access_url("a.txt")
+        self.assertEqual(self.requested(), ["a.txt"])
+        self.clock.now += 1
+        self.strategy.access_url("a.txt")
+        self.assertEqual(self.requested(), ["a.txt"])
+
+    def test_failed_request_is_sent_again(self):
+        self.strategy.access_url("a.txt")
+        self.strategy.url_request_failed("a.txt")
+        self.strategy.access_url("a.txt")
+        self.assertEqual(self.requested(), ["a.txt", "a.txt"])
+
+    def test_url_is_refreshed_within_the_margin(self):
+        now = self.clock.time()
+        self.strategy.url_registry.register(
+            "https://url/a.txt", "a.txt", 3, "etag", expires_at=now + 7 * DAY, now=now
+        )
+        self.assertEqual(self.strategy.access_url("a.txt", now), "https://url/a.txt")
+        self.assertEqual(self.requested(), [])
+        refresh_at = now + 6 * DAY
+        # the current url is served until the new one comes back
+        self.assertEqual(
+            self.strategy.access_url("a.txt", refresh_at), "https://url/a.txt"
+        )
+        self.assertEqual(self.requested(), ["a.txt"])
+        self.strategy.register_presigned_url(
+            "a.txt", "https://url/a.txt?new", refresh_at + 7 * DAY
+        )
+        self.assertEqual(
+            self.strategy.access_url("a.txt", refresh_at), "https://url/a.txt?new"
+        )
+        record = self.strategy.url_registry.get("a.txt", refresh_at)
+        self.assertEqual((record.size, record.etag), (3, "etag"))
+        self.assertEqual(self.requested(), [])
+
+    def test_request_message(self):
+        self.strategy.access_url("a.txt")
+        message = self.outbox[0].message
+        self.assertEqual(
+            message.performative, FileStorageMessage.Performative.REQUEST_URL
+        )
+        self.assertEqual(self.outbox[0].to, "eightballer/storj_file_transfer:0.1.0")
+
+
+if __name__ == "__main__":
+    unittest.main()
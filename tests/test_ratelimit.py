@@ -0,0 +1,184 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.connections.storj_file_transfer import ratelimit  # noqa: E402
+from packages.eightballer.connections.storj_file_transfer.ratelimit import (  # noqa: E402
+    MIN_BURST_BYTES,
+    RateLimiter,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+
+class ClockTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(ratelimit, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestTokenBucket(ClockTestCase):
+    def test_unlimited(self):
+        bucket = TokenBucket()
+        self.assertEqual(bucket.take(10 ** 9), 0.0)
+        self.assertEqual(self.clock.slept, 0.0)
+
+    def test_starts_full(self):
+        bucket = TokenBucket(rate=100, capacity=300)
+        self.assertEqual(bucket.take(300), 0.0)
+        self.assertEqual(bucket.take(50), 0.5)
+
+    def test_capacity_defaults_to_rate(self):
+        bucket = TokenBucket(rate=100)
+        self.assertEqual(bucket.take(100), 0.0)
+        self.assertEqual(bucket.take(100), 1.0)
+
+    def test_refill_is_capped(self):
+        bucket = TokenBucket(rate=100, capacity=100)
+        bucket.take(100)
+        self.clock.now += 60
+        self.assertEqual(bucket.take(100), 0.0)
+        self.assertEqual(bucket.take(100), 1.0)
+
+    def test_takers_are_served_in_turn(self):
+        bucket = TokenBucket(rate=100, capacity=100)
+        bucket.take(100)
+        # the bucket goes into debt, the second taker waits for both
+        first = bucket.take(100)
+        self.clock.now -= first
+        second = bucket.take(100)
+        self.assertEqual((first, second), (1.0, 2.0))
+
+    def test_take_larger_than_capacity(self):
+        bucket = TokenBucket(rate=100, capacity=100)
+        self.assertEqual(bucket.take(1000), 9.0)
+
+    def test_average_rate(self):
+        bucket = TokenBucket(rate=1000, capacity=1000)
+        start = self.clock.now
+        for _ in range(100):
+            bucket.take(100)
+        # 10000 tokens, the first 1000 from the full bucket
+        self.assertAlmostEqual(self.clock.now - start, 9.0)
+
+    def test_configure_keeps_the_tokens(self):
+        bucket = TokenBucket(rate=100, capacity=100)
+        bucket.take(60)
+        bucket.configure(200, 200)
+        self.assertEqual(bucket.rate, 200)
+        self.assertEqual(bucket.take(40), 0.0)
+        self.assertEqual(bucket.take(200), 1.0)
+
+    def test_configure_caps_the_tokens(self):
+        bucket = TokenBucket(rate=100, capacity=100)
+        bucket.configure(10, 10)
+        self.assertEqual(bucket.take(20), 1.0)
+
+    def test_limit_removed_and_set_again(self):
+        bucket = TokenBucket(rate=100, capacity=100)
+        bucket.take(100)
+        bucket.configure(0)
+        self.assertEqual(bucket.take(10 ** 6), 0.0)
+        bucket.configure(100, 100)
+        # a bucket which was unlimited starts full
+        self.assertEqual(bucket.take(100), 0.0)
+
+
+class TestRateLimiter(ClockTestCase):
+    def request(self, body):
+        return SimpleNamespace(body=body)
+
+    def test_unlimited_leaves_the_body(self):
+        limiter = RateLimiter()
+        request = self.request(b"data")
+        limiter.throttle(request)
+        self.assertEqual(request.body, b"data")
+        self.assertEqual(self.clock.slept, 0.0)
+
+    def test_requests_per_second(self):
+        limiter = RateLimiter({"requests_per_second": 2})
+        for _ in range(6):
+            limiter.throttle(self.request(None))
+        self.assertAlmostEqual(self.clock.slept, 2.0)
+
+    def test_body_is_read_through_the_bytes_bucket(self):
+        rate = MIN_BURST_BYTES
+        limiter = RateLimiter({"bytes_per_second": rate})
+        data = os.urandom(3 * rate)
+        for body in (data, io.BytesIO(data)):
+            request = self.request(body)
+            limiter.throttle(request)
+            self.assertEqual(request.body.read(), data)
+        # the first burst comes from the full bucket
+        self.assertAlmostEqual(self.clock.slept, 5.0)
+
+    def test_body_is_rewound_for_retries(self):
+        limiter = RateLimiter({"bytes_per_second": MIN_BURST_BYTES})
+        request = self.request(io.BytesIO(b"0123456789"))
+        limiter.throttle(request)
+        self.assertEqual(request.body.read(4), b"0123")
+        self.assertTrue(request.body.seekable())
+        request.body.seek(0)
+        self.assertEqual(request.body.read(), b"0123456789")
+
+    def test_control_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rate_limit.json")
+            limiter = RateLimiter({"control_path": path, "control_interval": 5})
+            with open(path, "w") as control_file:
+                json.dump(
+                    {"bytes_per_second": 2 ** 20, "requests_per_second": 3},
+                    control_file,
+                )
+            limiter.throttle(self.request(None))
+            self.assertEqual(limiter.bytes_per_second, 2 ** 20)
+            self.assertEqual(limiter.requests_per_second, 3)
+            with open(path, "w") as control_file:
+                json.dump({"requests_per_second": 0}, control_file)
+            os.utime(path, (0, 0))
+            # checked again only after control_interval seconds
+            limiter.throttle(self.request(None))
+            self.assertEqual(limiter.requests_per_second, 3)
+            self.clock.now += 5
+            limiter.throttle(self.request(None))
+            self.assertEqual(limiter.requests_per_second, 0)
+            self.assertEqual(limiter.bytes_per_second, 2 ** 20)
+
+    def test_invalid_control_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rate_limit.json")
+            with open(path, "w") as control_file:
+                control_file.write("{")
+            limiter = RateLimiter({"control_path": path, "requests_per_second": 1})
+            with self.assertLogs(limiter.logger, "WARNING"):
+                limiter.throttle(self.request(None))
+            self.assertEqual(limiter.requests_per_second, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.skills.storj_file_uploader.registry import (  # noqa: E402
+    UrlRegistry,
+    url_key,
+)
+
+NOW = 1000.0
+
+
+def url(key):
+    return f"https://gateway/bucket/{key}?X-Amz-Expires=604800"
+
+
+class TestUrlRegistry(unittest.TestCase):
+    def test_url_key(self):
+        self.assertEqual(url_key(url("abc.txt")), "abc.txt")
+        self.assertEqual(url_key("https://bucket.gateway/abc"), "abc")
+
+    def test_register_and_get(self):
+        registry = UrlRegistry()
+        record = registry.register(url("a.txt"), size=3, etag="etag", now=NOW)
+        self.assertEqual(registry.get("a.txt", NOW), record)
+        self.assertEqual(record.size, 3)
+        self.assertIsNone(registry.get("b.txt", NOW))
+
+    def test_lru_eviction_by_entries(self):
+        registry = UrlRegistry(max_entries=2)
+        for key in ("a", "b"):
+            registry.register(url(key), key, now=NOW)
+        # a becomes the most recently used, b is evicted
+        registry.get("a", NOW)
+        registry.register(url("c"), "c", now=NOW)
+        self.assertEqual(len(registry), 2)
+        self.assertIsNotNone(registry.get("a", NOW))
+        self.assertIsNone(registry.get("b", NOW))
+        self.assertIsNotNone(registry.get("c", NOW))
+
+    def test_eviction_by_bytes(self):
+        registry = UrlRegistry(max_bytes=3 * len(url("k0")) + 6)
+        for index in range(5):
+            registry.register(url(f"k{index}"), f"k{index}", now=NOW)
+        self.assertEqual(len(registry), 3)
+        self.assertLessEqual(registry.nbytes, registry.max_bytes)
+        self.assertIsNone(registry.get("k1", NOW))
+        self.assertIsNotNone(registry.get("k4", NOW))
+
+    def test_register_again_replaces_the_record(self):
+        registry = UrlRegistry()
+        registry.register(url("a"), "a", now=NOW)
+        nbytes = registry.nbytes
+        registry.register(url("a") + "&new", "a", now=NOW)
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(registry.nbytes, nbytes + 4)
+        self.assertTrue(registry.get("a", NOW).url.endswith("&new"))
+
+    def test_ttl(self):
+        registry = UrlRegistry(ttl=10)
+        registry.register(url("a"), "a", now=NOW)
+        registry.register(url("b"), "b", expires_at=NOW + 100, now=NOW)
+        self.assertIsNotNone(registry.get("a", NOW + 9))
+        self.assertIsNone(registry.get("a", NOW + 10))
+        self.assertEqual(len(registry), 1)
+        self.assertIsNotNone(registry.get("b", NOW + 10))
+
+    def test_expired_records_are_evicted_first(self):
+        registry = UrlRegistry(ttl=10)
+        registry.register(url("a"), "a", now=NOW)
+        registry.register(url("b"), "b", now=NOW + 20)
+        self.assertEqual(len(registry), 1)
+
+
+class TestUrlRegistrySpill(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.spill_path = os.path.join(directory.name, "urls")
+
+    def test_evicted_records_are_spilled_and_brought_back(self):
+        registry = UrlRegistry(max_entries=2, spill_path=self.spill_path)
+        self.addCleanup(registry.close)
+        for key in "abc":
+            registry.register(url(key), key, size=1, etag="etag-" + key, now=NOW)
+        self.assertEqual(
+            registry.stats(), {"entries": 2, "bytes": registry.nbytes, "spilled": 1}
+        )
+        record = registry.get("a", NOW)
+        self.assertEqual((record.url, record.etag), (url("a"), "etag-a"))
+        # bringing a back in memory spilled b, the least recently used
+        self.assertEqual(registry.stats()["spilled"], 1)
+        self.assertIsNotNone(registry.get("b", NOW))
+
+    def test_spill_survives_a_restart(self):
+        registry = UrlRegistry(max_entries=1, spill_path=self.spill_path)
+        registry.register(url("a"), "a", now=NOW)
+        registry.register(url("b"), "b", now=NOW)
+        registry.close()
+        reopened = UrlRegistry(max_entries=1, spill_path=self.spill_path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get("a", NOW).url, url("a"))
+
+    def test_expired_records_are_not_spilled(self):
+        registry = UrlRegistry(ttl=10, spill_path=self.spill_path)
+        self.addCleanup(registry.close)
+        registry.register(url("a"), "a", now=NOW)
+        registry.register(url("b"), "b", now=NOW + 20)
+        self.assertEqual(registry.stats()["spilled"], 0)
+        self.assertIsNone(registry.get("a", NOW + 20))
+
+    def test_expired_spilled_record(self):
+        registry = UrlRegistry(max_entries=1, ttl=10, spill_path=self.spill_path)
+        self.addCleanup(registry.close)
+        registry.register(url("a"), "a", now=NOW)
+        registry.register(url("b"), "b", now=NOW)
+        self.assertIsNone(registry.get("a", NOW + 10))
+        self.assertEqual(registry.stats()["spilled"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.skills.storj_file_uploader.scanner import (  # noqa: E402
+    ScanIndex,
+    UploadRoot,
+    find_root,
+)
+
+
+def write(path, content=b"data"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+    return os.stat(path)
+
+
+class TestScanIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.log_path = os.path.join(self.directory, "scan_index.log")
+        self.root = UploadRoot(os.path.join(self.directory, "files"), recursive=True)
+
+    def path(self, name):
+        return os.path.join(self.root.path, name)
+
+    def log_lines(self):
+        with open(self.log_path) as log:
+            return log.read().splitlines()
+
+    def test_changed_files(self):
+        index = ScanIndex()
+        stat_a = write(self.path("a"))
+        write(self.path("sub/b"))
+        changed = dict(index.changed_files([self.root]))
+        self.assertEqual(set(changed), {self.path("a"), self.path("sub/b")})
+        index.record(self.path("a"), stat_a, "fingerprint")
+        self.assertEqual(
+            [path for path, _ in index.changed_files([self.root])], [self.path("sub/b")]
+        )
+        write(self.path("a"), b"modified")
+        self.assertIn(self.path("a"), dict(index.changed_files([self.root])))
+
+    def test_removed_files_are_pruned(self):
+        index = ScanIndex()
+        index.record(self.path("a"), write(self.path("a")), "fingerprint")
+        os.remove(self.path("a"))
+        self.assertEqual(list(index.changed_files([self.root])), [])
+        self.assertEqual(len(index), 0)
+
+    def test_changed_paths(self):
+        index = ScanIndex()
+        stat_a = write(self.path("a"))
+        index.record(self.path("a"), stat_a, "fingerprint")
+        write(self.path("b"))
+        paths = [self.path("a"), self.path("b"), self.path("missing")]
+        self.assertEqual(
+            [path for path, _ in index.changed_paths(paths)], [self.path("b")]
+        )
+        os.remove(self.path("a"))
+        self.assertEqual(list(index.changed_paths([self.path("a")])), [])
+        self.assertEqual(len(index), 0)
+
+    def test_log_replay(self):
+        index = ScanIndex(self.log_path)
+        for name in "abc":
+            index.record(self.path(name), write(self.path(name)), "id-" + name)
+        index.save()
+        index.forget(self.path("b"))
+        index.save()
+        self.assertEqual(len(self.log_lines()), 4)
+        replayed = ScanIndex(self.log_path)
+        self.assertEqual(len(replayed), 2)
+        self.assertEqual(
+            [path for path, _ in replayed.changed_files([self.root])], [self.path("b")]
+        )
+
+    def test_save_appends_the_changes_only(self):
+        index = ScanIndex(self.log_path)
+        index.save()
+        self.assertFalse(os.path.exists(self.log_path))
+        index.record(self.path("a"), write(self.path("a")), "id-a")
+        index.save()
+        index.save()
+        self.assertEqual(len(self.log_lines()), 1)
+
+    def test_compaction(self):
+        index = ScanIndex(self.log_path)
+        index.COMPACT_MIN_LINES = 10
+        stat_a = write(self.path("a"))
+        for count in range(10):
+            index.record(self.path("a"), stat_a, f"id-{count}")
+            index.save()
+        self.assertEqual(len(self.log_lines()), 10)
+        index.record(self.path("a"), stat_a, "id-last")
+        index.save()
+        # rewritten with the live entry once over the limit
+        self.assertEqual(len(self.log_lines()), 1)
+        self.assertEqual(len(ScanIndex(self.log_path)), 1)
+        self.assertFalse(os.path.exists(self.log_path + ".tmp"))
+
+    def test_torn_line_is_dropped(self):
+        index = ScanIndex(self.log_path)
+        for name in "ab":
+            index.record(self.path(name), write(self.path(name)), "id-" + name)
+        index.save()
+        with open(self.log_path, "a") as log:
+            log.write('["' + self.path("c"))
+        replayed = ScanIndex(self.log_path)
+        self.assertEqual(len(replayed), 2)
+        replayed.record(self.path("c"), write(self.path("c")), "id-c")
+        replayed.save()
+        # the log was rewritten rather than appended to the torn line
+        self.assertEqual(len(self.log_lines()), 3)
+        self.assertEqual(len(ScanIndex(self.log_path)), 3)
+
+
+class TestUploadRoot(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def tree(self, *names):
+        for name in names:
+            write(os.path.join(self.directory, name))
+
+    def walked(self, root):
+        return sorted(
+            os.path.relpath(path, self.directory).replace(os.sep, "/")
+            for path, _ in root.walk()
+        )
+
+    def test_include_and_exclude(self):
+        self.tree("a.txt", "b.log", "sub/c.txt", "sub/d.tmp", "build/e.txt")
+        root = UploadRoot(
+            self.directory,
+            include=("*.txt", "*.tmp"),
+            exclude=("*.tmp", "build/"),
+            recursive=True,
+        )
+        self.assertEqual(self.walked(root), ["a.txt", "sub/c.txt"])
+
+    def test_patterns_with_a_slash_match_the_relative_path(self):
+        self.tree("a.txt", "sub/a.txt", "sub/b.txt", "other/a.txt")
+        root = UploadRoot(self.directory, exclude=("sub/a.*",), recursive=True)
+        self.assertEqual(self.walked(root), ["a.txt", "other/a.txt", "sub/b.txt"])
+
+    def test_directory_patterns_do_not_match_files(self):
+        self.tree("build", "sub/build/a.txt")
+        root = UploadRoot(self.directory, exclude=("build/",), recursive=True)
+        self.assertEqual(self.walked(root), ["build"])
+
+    def test_hidden_files(self):
+        self.tree("a.txt", ".b.txt", ".git/c.txt")
+        root = UploadRoot(self.directory, recursive=True)
+        self.assertEqual(self.walked(root), ["a.txt"])
+        dotted = UploadRoot(self.directory, include=(".*",), recursive=True)
+        self.assertEqual(self.walked(dotted), [".b.txt"])
+
+    def test_not_recursive(self):
+        self.tree("a.txt", "sub/b.txt")
+        self.assertEqual(self.walked(UploadRoot(self.directory)), ["a.txt"])
+
+    def test_walk_a_subdirectory(self):
+        self.tree("a.txt", "sub/b.txt", "sub/deeper/c.txt")
+        root = UploadRoot(self.directory, recursive=True)
+        paths = [path for path, _ in root.walk(os.path.join(self.directory, "sub"))]
+        self.assertEqual(
+            sorted(paths),
+            [
+                os.path.join(self.directory, "sub", "b.txt"),
+                os.path.join(self.directory, "sub", "deeper", "c.txt"),
+            ],
+        )
+
+    def test_matches_agrees_with_walk(self):
+        names = ("a.txt", "b.log", ".c.txt", "sub/d.txt", "tmp/e.txt", ".git/f.txt")
+        self.tree(*names)
+        for recursive in (False, True):
+            root = UploadRoot(
+                self.directory,
+                include=("*.txt",),
+                exclude=("tmp/",),
+                recursive=recursive,
+            )
+            with self.subTest(recursive=recursive):
+                self.assertEqual(
+                    [
+                        name
+                        for name in sorted(names)
+                        if root.matches(os.path.join(self.directory, name))
+                    ],
+                    self.walked(root),
+                )
+        self.assertFalse(root.matches(os.path.join(self.directory + "2", "a.txt")))
+
+    def test_contains_directory(self):
+        root = UploadRoot(self.directory, exclude=("tmp/",), recursive=True)
+        self.assertTrue(root.contains_directory(os.path.join(self.directory, "a")))
+        self.assertTrue(root.contains_directory(os.path.join(self.directory, "a/b")))
+        for name in ("tmp", "a/tmp", "tmp/a", ".git", "a/.cache"):
+            with self.subTest(name=name):
+                self.assertFalse(
+                    root.contains_directory(os.path.join(self.directory, name))
+                )
+        self.assertFalse(root.contains_directory(self.directory))
+        self.assertFalse(
+            UploadRoot(self.directory).contains_directory(
+                os.path.join(self.directory, "a")
+            )
+        )
+
+    def test_relative(self):
+        root = UploadRoot("/data")
+        self.assertEqual(root.relative("/data/a/b.txt"), "a/b.txt")
+        self.assertIsNone(root.relative("/data"))
+        self.assertIsNone(root.relative("/other/a.txt"))
+        self.assertIsNone(root.relative("/database/a.txt"))
+
+    def test_from_config(self):
+        root = UploadRoot.from_config(
+            {"path": "/data/", "include": ["*.txt"], "key_prefix": "p/", "weight": 2}
+        )
+        self.assertEqual(root, UploadRoot("/data", ("*.txt",), (), True, "p/", 2.0))
+        self.assertEqual(UploadRoot.from_config({"path": "/"}).path, "/")
+        self.assertEqual(
+            UploadRoot.from_config({"path": "/data", "include": None}).include, ("*",)
+        )
+        with self.assertRaises(ValueError):
+            UploadRoot.from_config({"path": "/data", "weight": 0})
+
+    def test_from_pattern(self):
+        self.assertEqual(
+            UploadRoot.from_pattern("./upload_dir/*"),
+            UploadRoot("./upload_dir", ("*",)),
+        )
+        self.assertEqual(UploadRoot.from_pattern("*.txt"), UploadRoot(".", ("*.txt",)))
+
+
+class TestFindRoot(unittest.TestCase):
+    def test_innermost_root(self):
+        outer = UploadRoot("/data", recursive=True)
+        inner = UploadRoot("/data/inner")
+        roots = [inner, outer]
+        self.assertIs(find_root(roots, "/data/a.txt"), outer)
+        self.assertIs(find_root(roots, "/data/inner/a.txt"), inner)
+        self.assertIs(find_root(roots, "/data/inner/sub/a.txt"), inner)
+        self.assertIs(find_root(roots, "/data/innermost/a.txt"), outer)
+
+    def test_outside_every_root(self):
+        self.assertIsNone(find_root([UploadRoot("/data")], "/other/a.txt"))
+        self.assertIsNone(find_root([], "/data/a.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.skills.storj_file_uploader.scheduler import (  # noqa: E402
+    ScheduledFile,
+    UploadScheduler,
+)
+
+
+def scheduled(name, size, mtime=0.0, queued_at=0.0):
+    stat_result = os.stat_result((0o100644, 0, 0, 1, 0, 0, size, mtime, mtime, mtime))
+    return ScheduledFile(name, "key-" + name, "id-" + name, stat_result, queued_at)
+
+
+def names(files):
+    return [file.path for file in files]
+
+
+class TestUploadScheduler(unittest.TestCase):
+    def test_fifo(self):
+        scheduler = UploadScheduler("fifo")
+        for name, size in (("a", 30), ("b", 10), ("c", 20)):
+            scheduler.push(scheduled(name, size))
+        self.assertEqual(names(scheduler.tick(0)), ["a", "b", "c"])
+        self.assertEqual(len(scheduler), 0)
+
+    def test_smallest(self):
+        scheduler = UploadScheduler("smallest")
+        for name, size in (("a", 30), ("b", 10), ("c", 20), ("d", 10)):
+            scheduler.push(scheduled(name, size))
+        self.assertEqual(names(scheduler.tick(0)), ["b", "d", "c", "a"])
+
+    def test_oldest(self):
+        scheduler = UploadScheduler("oldest")
+        for name, mtime in (("a", 3.0), ("b", 1.0), ("c", 2.0)):
+            scheduler.push(scheduled(name, 1, mtime))
+        self.assertEqual(names(scheduler.tick(0)), ["b", "c", "a"])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            UploadScheduler("largest")
+
+    def test_max_wait_takes_the_oldest_first(self):
+        scheduler = UploadScheduler("smallest", max_wait=10)
+        scheduler.push(scheduled("large", 1000, queued_at=0))
+        scheduler.push(scheduled("small", 1, queued_at=5))
+        self.assertEqual(names(scheduler.tick(5)), ["small", "large"])
+        scheduler.push(scheduled("large", 1000, queued_at=0))
+        scheduler.push(scheduled("small", 1, queued_at=5))
+        self.assertEqual(names(scheduler.tick(11)), ["large", "small"])
+
+    def test_tick_bytes(self):
+        scheduler = UploadScheduler("fifo", tick_bytes=100)
+        for name in "abcdefg":
+            scheduler.push(scheduled(name, 60))
+        # the file exceeding the budget of a tick is still taken, and its
+        # excess is taken from the budget of the next ticks
+        ticks = [names(scheduler.tick(0)) for _ in range(5)]
+        self.assertEqual(ticks, [["a", "b"], ["c", "d"], ["e"], ["f", "g"], []])
+
+    def test_large_file_is_not_held_back(self):
+        scheduler = UploadScheduler("fifo", tick_bytes=100)
+        scheduler.push(scheduled("huge", 1000))
+        self.assertEqual(names(scheduler.tick(0)), ["huge"])
+        scheduler.push(scheduled("small", 1))
+        ticks = 0
+        while not scheduler.tick(0):
+            ticks += 1
+        self.assertEqual(ticks, 9)
+
+    def test_weighted_roots(self):
+        scheduler = UploadScheduler("fifo")
+        for index in range(30):
+            scheduler.push(scheduled(f"a{index}", 10), "a", 2)
+            scheduler.push(scheduled(f"b{index}", 10), "b", 1)
+        order = names(scheduler.tick(0))[:30]
+        sent = sum(1 for name in order if name.startswith("a"))
+        self.assertEqual(sent, 20)
+
+    def test_idle_root_does_not_keep_its_share(self):
+        scheduler = UploadScheduler("fifo")
+        for index in range(10):
+            scheduler.push(scheduled(f"a{index}", 10), "a", 1)
+        self.assertEqual(len(scheduler.tick(0)), 10)
+        # b was idle meanwhile, it does not get 10 files in a row now
+        for index in range(4):
+            scheduler.push(scheduled(f"a{index + 10}", 10), "a", 1)
+            scheduler.push(scheduled(f"b{index}", 10), "b", 1)
+        order = names(scheduler.tick(0))
+        self.assertEqual([name[0] for name in order[:4]], ["a", "b", "a", "b"])
+
+    def test_queued_files(self):
+        scheduler = UploadScheduler()
+        scheduler.push(scheduled("a", 1))
+        self.assertTrue(scheduler.is_queued("a"))
+        self.assertIn("key-a", scheduler)
+        self.assertNotIn("key-b", scheduler)
+        scheduler.tick(0)
+        self.assertFalse(scheduler.is_queued("a"))
+        self.assertNotIn("key-a", scheduler)
+
+
+if __name__ == "__main__":
+    unittest.main()
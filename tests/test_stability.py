@@ -0,0 +1,158 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.skills.storj_file_uploader import (  # noqa: E402
+    behaviours as behaviours_module,
+)
+from packages.eightballer.skills.storj_file_uploader.behaviours import (  # noqa: E402
+    StorjFileUploadBehaviour,
+)
+from packages.eightballer.skills.storj_file_uploader.strategy import (  # noqa: E402
+    Strategy,
+)
+
+NOW = 1700000000.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+    def time(self):
+        return NOW + self.now
+
+
+class FakePool:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, file, *args):
+        self.submitted.append(file)
+        return Future()
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class FakeWatcher:
+    def __init__(self):
+        self.events = {}
+
+    def drain(self):
+        events, self.events = self.events, {}
+        return events
+
+    def stop(self):
+        pass
+
+
+class TestStabilityGate(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(behaviours_module, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        context = SimpleNamespace(logger=logging.getLogger("test"), outbox=None)
+        context.strategy = Strategy(name="strategy", skill_context=context)
+        self.behaviour = StorjFileUploadBehaviour(
+            name="file_reader",
+            skill_context=context,
+            upload_roots=[{"path": self.directory}],
+            uploaded_ids=[],
+            stable_after=10,
+            partial_suffixes=[".part"],
+        )
+        self.behaviour.setup()
+        self.addCleanup(self.behaviour.teardown)
+        self.behaviour._hash_pool.shutdown()
+        self.behaviour._hash_pool = self.pool = FakePool()
+
+    def write(self, name, age):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as file:
+            file.write(b"abc")
+        mtime = self.clock.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def submitted(self):
+        files, self.pool.submitted = self.pool.submitted, []
+        return sorted(files)
+
+    def test_is_complete(self):
+        path = self.write("a.txt", 9)
+        stat_result = os.stat(path)
+        now = self.clock.time()
+        self.assertFalse(self.behaviour._is_complete(path, stat_result, now))
+        self.assertTrue(self.behaviour._is_complete(path, stat_result, now + 1))
+        self.behaviour._complete.add(path)
+        self.assertTrue(self.behaviour._is_complete(path, stat_result, now))
+
+    def test_recently_modified_file_is_deferred(self):
+        stable = self.write("stable.txt", 10)
+        recent = self.write("recent.txt", 5)
+        self.behaviour.act()
+        self.assertEqual(self.submitted(), [stable])
+        self.assertEqual(self.behaviour._deferred, {recent})
+        self.clock.now += 4
+        self.behaviour.act()
+        self.assertEqual(self.submitted(), [])
+        self.clock.now += 1
+        self.behaviour.act()
+        self.assertEqual(self.submitted(), [recent])
+
+    def test_partial_files_are_skipped(self):
+        self.write("a.txt.part", 100)
+        self.behaviour.act()
+        self.assertEqual(self.submitted(), [])
+        self.assertEqual(self.behaviour._deferred, set())
+        os.rename(
+            os.path.join(self.directory, "a.txt.part"),
+            os.path.join(self.directory, "a.txt"),
+        )
+        self.behaviour.act()
+        self.assertEqual(self.submitted(), [os.path.join(self.directory, "a.txt")])
+
+    def test_closed_file_is_complete_right_away(self):
+        watcher = self.behaviour._watcher = FakeWatcher()
+        self.behaviour._rescan_interval = 300
+        self.behaviour.act()
+        written = self.write("written.txt", 0)
+        closed = self.write("closed.txt", 0)
+        watcher.events = {written: False, closed: True}
+        self.behaviour.act()
+        self.assertEqual(self.submitted(), [closed])
+        self.assertEqual(self.behaviour._deferred, {written})
+        self.assertEqual(self.behaviour._complete, set())
+        # a write after the close makes the file incomplete again
+        watcher.events = {written: True}
+        self.behaviour._drain_events()
+        self.assertEqual(self.behaviour._complete, {written})
+        watcher.events = {written: False}
+        self.behaviour._drain_events()
+        self.assertEqual(self.behaviour._complete, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import sys
+import time
+import unittest
+
+import boto3
+from moto import mock_aws
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.connections.storj_file_transfer.dedup import (  # noqa: E402
+    RemoteIndex,
+)
+from packages.eightballer.connections.storj_file_transfer.multipart import (  # noqa: E402
+    MIB,
+    MultipartUploader,
+)
+from packages.eightballer.connections.storj_file_transfer.streaming import (  # noqa: E402
+    StreamingUploads,
+)
+
+BUCKET = "bucket"
+
+
+class TestStreamingUploads(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+        self.aws = mock_aws()
+        self.aws.start()
+        self.s3 = boto3.client("s3", aws_access_key_id="a", aws_secret_access_key="b")
+        self.s3.create_bucket(Bucket=BUCKET)
+        self.streams = StreamingUploads(
+            self.s3,
+            BUCKET,
+            MultipartUploader(self.s3, {"threshold": 6 * MIB, "part_size": 5 * MIB}),
+            RemoteIndex(self.s3, BUCKET, {"enabled": False}),
+        )
+
+    def tearDown(self):
+        self.aws.stop()
+
+    def stream(self, key, data, chunk_size, order=None):
+        chunks = [
+            (offset, data[offset : offset + chunk_size])
+            for offset in range(0, len(data), chunk_size)
+        ]
+        messages = [("begin",)] + [("chunk",) + chunk for chunk in chunks]
+        messages.append(("commit", len(chunks)))
+        results = []
+        for index in order or range(len(messages)):
+            message = messages[index]
+            if message[0] == "begin":
+                result = self.streams.begin(
+                    key, key + ".bin", len(data), hashlib.md5(data).hexdigest()
+                )
+            elif message[0] == "chunk":
+                result = self.streams.chunk(
+                    key, message[1], message[2], hashlib.md5(message[2]).hexdigest()
+                )
+            else:
+                result = self.streams.commit(key, message[1])
+            results.append(result)
+        return results
+
+    def stored(self, key):
+        return self.s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+
+    def uploads(self):
+        return self.s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", [])
+
+    def test_chunks_in_order(self):
+        data = os.urandom(1000)
+        results = self.stream("k", data, 100)
+        self.assertEqual(results[:-1], [None] * (len(results) - 1))
+        self.assertEqual(results[-1].key, "k.bin")
+        self.assertEqual(results[-1].size, len(data))
+        self.assertEqual(self.stored("k.bin"), data)
+        self.assertEqual(len(self.streams), 0)
+
+    def test_chunks_out_of_order(self):
+        data = os.urandom(1000)
+        # commit, chunks backwards, then begin
+        results = self.stream("k", data, 100, [11] + list(range(10, 0, -1)) + [0])
+        self.assertEqual([r for r in results if r is not None][0].key, "k.bin")
+        self.assertIsNotNone(results[-1])
+        self.assertEqual(self.stored("k.bin"), data)
+
+    def test_multipart_reassembly(self):
+        data = os.urandom(11 * MIB)
+        chunk = MIB
+        order = [0, 2, 1, 4, 3] + list(range(5, 13))
+        results = self.stream("k", data, chunk, order)
+        self.assertIsNotNone(results[-1])
+        self.assertEqual(self.stored("k.bin"), data)
+        self.assertEqual(self.uploads(), [])
+
+    def test_empty_stream(self):
+        results = self.stream("k", b"", 100)
+        self.assertIsNotNone(results[-1])
+        self.assertEqual(self.stored("k.bin"), b"")
+
+    def test_duplicate_chunk_ignored(self):
+        data = os.urandom(300)
+        self.streams.begin("k", "k.bin", 300, "")
+        self.assertIsNone(self.streams.chunk("k", 0, data[:100], ""))
+        self.assertIsNone(self.streams.chunk("k", 0, data[:100], ""))
+        self.streams.chunk("k", 100, data[100:200], "")
+        self.streams.chunk("k", 200, data[200:], "")
+        self.assertIsNotNone(self.streams.commit("k", 3))
+        self.assertEqual(self.stored("k.bin"), data)
+
+    def test_fingerprint_mismatch_aborts(self):
+        data = os.urandom(7 * MIB)
+        self.streams.begin("k", "k.bin", len(data), "")
+        self.assertEqual(len(self.uploads()), 1)
+        with self.assertRaises(ValueError):
+            self.streams.chunk("k", 0, data[:MIB], "0" * 32)
+        self.assertEqual(self.uploads(), [])
+        self.assertEqual(len(self.streams), 0)
+        # the rest of the aborted stream is dropped
+        self.assertIsNone(self.streams.chunk("k", MIB, data[MIB:], ""))
+        self.assertIsNone(self.streams.commit("k", 2))
+        self.assertEqual(len(self.streams), 0)
+
+    def test_overlong_stream_aborts(self):
+        data = os.urandom(7 * MIB)
+        self.streams.begin("k", "k.bin", len(data) - 1, "")
+        with self.assertRaises(ValueError):
+            self.streams.chunk("k", 0, data, "")
+        self.assertEqual(self.uploads(), [])
+        self.assertEqual(len(self.streams), 0)
+
+    def test_begin_again_after_abort(self):
+        data = os.urandom(200)
+        self.streams.begin("k", "k.bin", 100, "")
+        with self.assertRaises(ValueError):
+            self.streams.chunk("k", 0, data, "")
+        results = self.stream("k", data, 100)
+        self.assertIsNotNone(results[-1])
+        self.assertEqual(self.stored("k.bin"), data)
+
+    def test_idle_stream_expires(self):
+        streams = StreamingUploads(
+            self.s3,
+            BUCKET,
+            self.streams.multipart,
+            self.streams.remote_index,
+            idle_timeout=0.05,
+        )
+        data = os.urandom(7 * MIB)
+        streams.begin("k", "k.bin", len(data), "")
+        streams.chunk("k", 0, data[:MIB], "")
+        self.assertEqual(len(self.uploads()), 1)
+        time.sleep(0.1)
+        # any later message sweeps the idle streams
+        streams.chunk("other", 0, b"x", "")
+        self.assertEqual(self.uploads(), [])
+        self.assertIsNone(streams.chunk("k", MIB, data[MIB:], ""))
+
+    def test_close_aborts_streams(self):
+        self.streams.begin("k", "k.bin", 7 * MIB, "")
+        self.streams.close()
+        self.assertEqual(self.uploads(), [])
+        self.assertEqual(len(self.streams), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
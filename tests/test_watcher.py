@@ -0,0 +1,123 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from packages.eightballer.skills.storj_file_uploader.scanner import (  # noqa: E402
+    UploadRoot,
+)
+from packages.eightballer.skills.storj_file_uploader.watcher import (  # noqa: E402
+    FileWatcher,
+    _EventCollector,
+)
+
+ROOT = "/data"
+
+
+def event(event_type, src_path, dest_path="", is_directory=False):
+    return SimpleNamespace(
+        event_type=event_type,
+        src_path=src_path,
+        dest_path=dest_path,
+        is_directory=is_directory,
+    )
+
+
+class TestEventCollector(unittest.TestCase):
+    def setUp(self):
+        self.collector = _EventCollector(
+            UploadRoot(ROOT, include=("*.txt",), exclude=("tmp/",), recursive=True)
+        )
+
+    def test_complete_flag(self):
+        self.collector.dispatch(event("created", "/data/a.txt"))
+        self.collector.dispatch(event("modified", "/data/a.txt"))
+        self.collector.dispatch(event("closed", "/data/b.txt"))
+        self.collector.dispatch(event("moved", "/data/c.part", "/data/c.txt"))
+        paths, directories = self.collector.drain()
+        self.assertEqual(
+            paths, {"/data/a.txt": False, "/data/b.txt": True, "/data/c.txt": True}
+        )
+        self.assertEqual(directories, set())
+        self.assertEqual(self.collector.drain(), ({}, set()))
+
+    def test_last_event_wins(self):
+        self.collector.dispatch(event("closed", "/data/a.txt"))
+        self.collector.dispatch(event("modified", "/data/a.txt"))
+        self.assertEqual(self.collector.drain()[0], {"/data/a.txt": False})
+
+    def test_excluded_files_are_ignored(self):
+        for path in ("/data/a.bin", "/data/tmp/a.txt", "/data/.hidden/a.txt"):
+            self.collector.dispatch(event("closed", path))
+        self.collector.dispatch(event("moved", "/data/a.txt", "/data/a.bin"))
+        self.assertEqual(self.collector.drain(), ({}, set()))
+
+    def test_directories(self):
+        self.collector.dispatch(event("created", "/data/new", is_directory=True))
+        self.collector.dispatch(
+            event("moved", "/elsewhere/dir", "/data/moved", is_directory=True)
+        )
+        self.collector.dispatch(event("modified", "/data/new", is_directory=True))
+        self.collector.dispatch(event("created", "/data/tmp/x", is_directory=True))
+        self.assertEqual(self.collector.drain(), ({}, {"/data/new", "/data/moved"}))
+
+    def test_directories_of_a_flat_root_are_ignored(self):
+        collector = _EventCollector(UploadRoot(ROOT))
+        collector.dispatch(event("created", "/data/new", is_directory=True))
+        collector.dispatch(event("closed", "/data/new/a.txt"))
+        self.assertEqual(collector.drain(), ({}, set()))
+
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.watcher = FileWatcher(
+            [UploadRoot(self.directory, include=("*.txt",), recursive=True)]
+        )
+        self.watcher.start()
+        self.addCleanup(self.watcher.stop)
+
+    def write(self, path, content=b"abc"):
+        with open(path, "wb") as file:
+            file.write(content)
+
+    def drain_until(self, path, complete=False, timeout=5.0):
+        events = {}
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if path in events and (events[path] or not complete):
+                break
+            time.sleep(0.05)
+            events.update(self.watcher.drain())
+        return events
+
+    def test_written_file_is_complete(self):
+        path = os.path.join(self.directory, "a.txt")
+        self.write(path)
+        events = self.drain_until(path, complete=True)
+        self.assertTrue(events.get(path))
+
+    def test_moved_in_directory_is_walked(self):
+        with tempfile.TemporaryDirectory() as outside:
+            os.mkdir(os.path.join(outside, "sub"))
+            self.write(os.path.join(outside, "sub", "a.txt"))
+            self.write(os.path.join(outside, "sub", "a.bin"))
+            os.rename(os.path.join(outside, "sub"), os.path.join(self.directory, "sub"))
+        path = os.path.join(self.directory, "sub", "a.txt")
+        events = self.drain_until(path)
+        self.assertIn(path, events)
+        self.assertNotIn(os.path.join(self.directory, "sub", "a.bin"), events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,256 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.packages import register_packages  # noqa: E402
+
+register_packages()
+
+from aea.mail.base_pb2 import Message as ProtobufMessage  # noqa: E402
+from google.protobuf.message import DecodeError  # noqa: E402
+from packages.eightballer.protocols.file_storage import (
+    file_storage_pb2,
+    wire,
+)  # noqa: E402
+from packages.eightballer.protocols.file_storage.message import (
+    FileStorageMessage,
+)  # noqa: E402
+from packages.eightballer.protocols.file_storage.serialization import (  # noqa: E402
+    FileStorageSerializer,
+)
+
+Performative = FileStorageMessage.Performative
+
+TEXT = "κλειδί/文件 😀.bin"
+LARGE_BYTES = b"\x00\xff" * (2 * 1024 * 1024)
+
+# int64 fields take values past the int32 range, chunk_count is an int32
+CONTENTS = {
+    Performative.FILE_UPLOAD: {
+        "content": b"bytes",
+        "filename": "a.txt",
+        "key": "key",
+        "fingerprint": "0" * 32,
+    },
+    Performative.FILE_UPLOAD_REF: {
+        "filename": "a.txt",
+        "key": "key",
+        "path": "/tmp/a.txt",
+        "offset": 1,
+        "length": 2,
+        "fingerprint": "0" * 32,
+    },
+    Performative.FILE_UPLOAD_BATCH: {
+        "keys": ("k1", "k2"),
+        "filenames": ("a.txt", "b.txt"),
+        "contents": (b"a", b"b"),
+        "paths": ("", "/tmp/b.txt"),
+        "fingerprints": ("1" * 32, "2" * 32),
+    },
+    Performative.FILE_DOWNLOAD: {"access_url": "https://url", "content": b"bytes"},
+    Performative.UPLOAD_RECEIPT: {
+        "access_url": "https://url",
+        "key": "key.txt",
+        "size": 3,
+        "etag": "etag",
+        "timings": {"put": 0.5, "presign": 0.25},
+    },
+    Performative.UPLOAD_BEGIN: {
+        "key": "key",
+        "filename": "a.txt",
+        "size": 3,
+        "fingerprint": "0" * 32,
+    },
+    Performative.UPLOAD_CHUNK: {
+        "key": "key",
+        "offset": 3,
+        "content": b"chunk",
+        "chunk_fingerprint": "0" * 32,
+    },
+    Performative.UPLOAD_COMMIT: {"key": "key", "chunk_count": 2},
+    Performative.UPLOAD_BATCH_RECEIPT: {
+        "keys": ("k1.txt", "k2.txt"),
+        "access_urls": ("https://1", ""),
+        "sizes": (1, 0),
+        "etags": ("etag", ""),
+        "errors": ("", "failed"),
+        "ranges": ("0-511", ""),
+        "timings": {"batch": 1.5},
+    },
+    Performative.REQUEST_URL: {"key": "key.txt"},
+    Performative.PRESIGNED_URL: {
+        "key": "key.txt",
+        "access_url": "https://url",
+        "expires_at": 1700000000.125,
+        "byte_range": "512-1023",
+    },
+    Performative.ERROR: {
+        "error_code": FileStorageMessage.ErrorCode.UPLOAD_FAILED,
+        "error_msg": "failed",
+        "error_data": {"key": b"key.txt"},
+    },
+    Performative.END: {},
+}
+
+
+def empty(value):
+    if isinstance(value, FileStorageMessage.ErrorCode):
+        return value
+    return type(value)()
+
+
+def large(value, name):
+    if isinstance(value, bytes):
+        return LARGE_BYTES
+    if isinstance(value, str):
+        return value * 10000
+    if isinstance(value, float):
+        return 4102444800.0625
+    if isinstance(value, int):
+        return 2 ** 31 - 1 if name == "chunk_count" else 2 ** 40 + 1
+    if isinstance(value, tuple):
+        # many elements, the lists of a batch keeping the same length
+        return (
+            tuple(
+                LARGE_BYTES[:65536]
+                if isinstance(element, bytes)
+                else large(element, name)
+                for element in value
+            )
+            * 100
+        )
+    if isinstance(value, dict):
+        return {
+            f"{key}{index}": item for index in range(100) for key, item in value.items()
+        }
+    return value
+
+
+def unicode(value):
+    if isinstance(value, str):
+        return TEXT + value
+    if isinstance(value, bytes):
+        return TEXT.encode("utf-8") + value
+    if isinstance(value, tuple):
+        return tuple(unicode(element) for element in value)
+    if isinstance(value, dict):
+        return {TEXT + key: unicode(item) for key, item in value.items()}
+    return value
+
+
+VARIANTS = {
+    "plain": lambda name, value: value,
+    "empty": lambda name, value: empty(value),
+    "large": lambda name, value: large(value, name),
+    "unicode": lambda name, value: unicode(value),
+}
+
+
+def make_message(performative, variant, message_id=1, reference=("", "")):
+    contents = {
+        name: VARIANTS[variant](name, value)
+        for name, value in CONTENTS[performative].items()
+    }
+    return FileStorageMessage(
+        performative=performative,
+        message_id=message_id,
+        dialogue_reference=reference,
+        target=message_id - 1,
+        **contents,
+    )
+
+
+def encode(msg, fast):
+    wire.ENABLED = fast
+    try:
+        return FileStorageSerializer.encode(msg)
+    finally:
+        wire.ENABLED = True
+
+
+def decode(data, fast):
+    wire.ENABLED = fast
+    try:
+        return FileStorageSerializer.decode(data)
+    finally:
+        wire.ENABLED = True
+
+
+def parse_pb2(data):
+    message_pb = ProtobufMessage()
+    message_pb.ParseFromString(data)
+    file_storage_pb = file_storage_pb2.FileStorageMessage()
+    file_storage_pb.ParseFromString(message_pb.dialogue_message.content)
+    # the fast path orders the fields differently, only the parsed content compares
+    message_pb.dialogue_message.content = b""
+    return message_pb, file_storage_pb
+
+
+class TestWire(unittest.TestCase):
+    def test_every_performative_is_covered(self):
+        self.assertEqual(set(CONTENTS), set(Performative))
+
+    def test_round_trip(self):
+        for performative in Performative:
+            for variant in VARIANTS:
+                if variant != "plain" and not CONTENTS[performative]:
+                    continue
+                with self.subTest(performative=performative, variant=variant):
+                    msg = make_message(performative, variant)
+                    self.assertTrue(msg._is_consistent())
+                    generic = encode(msg, fast=False)
+                    fast = encode(msg, fast=True)
+                    for data in (generic, fast):
+                        for fast_parse in (False, True):
+                            decoded = decode(data, fast_parse)
+                            self.assertEqual(decoded, msg)
+                            self.assertEqual(
+                                decoded.dialogue_reference, msg.dialogue_reference
+                            )
+                    # both encodings parse to the same generated protobuf messages
+                    self.assertEqual(parse_pb2(fast), parse_pb2(generic))
+
+    def test_bulk_performatives_take_the_fast_path(self):
+        for performative in wire.BULK_PERFORMATIVES:
+            msg = make_message(performative, "plain")
+            self.assertIsNotNone(wire.encode(msg))
+        msg = make_message(Performative.REQUEST_URL, "plain")
+        self.assertIsNone(wire.encode(msg))
+
+    def test_dialogue_fields(self):
+        reference = (TEXT, "responder" * 1000)
+        for message_id in (1, 2, 2 ** 31 - 1, -1):
+            msg = make_message(
+                Performative.UPLOAD_CHUNK, "unicode", message_id, reference
+            )
+            fast = encode(msg, fast=True)
+            self.assertEqual(parse_pb2(fast), parse_pb2(encode(msg, fast=False)))
+            decoded = decode(fast, fast=True)
+            self.assertEqual(decoded.message_id, message_id)
+            self.assertEqual(decoded.target, message_id - 1)
+            self.assertEqual(decoded.dialogue_reference, reference)
+
+    def test_truncated_input(self):
+        msg = make_message(Performative.UPLOAD_CHUNK, "unicode")
+        data = encode(msg, fast=True)
+        for length in range(1, len(data)):
+            for fast_parse in (False, True):
+                with self.subTest(length=length, fast_parse=fast_parse):
+                    with self.assertRaises(DecodeError):
+                        decode(data[:length], fast_parse)
+
+    def test_corrupt_input(self):
+        data = encode(make_message(Performative.FILE_UPLOAD, "plain"), fast=True)
+        with self.assertRaises(DecodeError):
+            # a varint which never ends
+            wire.parse(data[:1] + b"\xff" * 11, file_storage_pb2.FileStorageMessage())
+        with self.assertRaises(DecodeError):
+            wire.parse(
+                data[:1] + b"\xff\xff\xff\x0f", file_storage_pb2.FileStorageMessage()
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()